@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for the HTTP API: refresh coalescing, caching headers and filters
+"""
+
+import gzip
+import json
+import os
+import sys
+import threading
+import urllib.error
+import urllib.request
+from urllib.parse import quote
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wmoov_scraper.api import ApiState, Response, accepts_gzip, etag_matches, filter_movies, make_server
+from wmoov_scraper.models import Movie, Showtime
+
+
+def movie(movie_id, title, rating=None, genres=(), showtimes=()):
+    return Movie(title, rating, list(genres), None, [], 0, list(showtimes), movie_id=movie_id)
+
+
+def show(cinema, show_date, time="19:30"):
+    return Showtime(cinema, "1號院", time, show_date, "45", 100.0)
+
+
+MOVIES = [
+    movie("1", "Oppenheimer", 8.6, ["劇情"], [show("百老匯 MOViE MOViE", "2025-08-30"),
+                                              show("Cinema City 朗豪坊", "2025-08-31")]),
+    movie("2", "鬼滅之刃", 9.1, ["動畫", "動作"], [show("Cinema City 朗豪坊", "2025-08-30")]),
+    movie("3", "Untitled", None, [], []),
+]
+
+
+def titles(movies):
+    return [movie.title for movie in movies]
+
+
+def test_filter_movies():
+    assert titles(filter_movies(MOVIES, {})) == ["Oppenheimer", "鬼滅之刃", "Untitled"]
+    assert titles(filter_movies(MOVIES, {"title": ["oppen"]})) == ["Oppenheimer"]
+    assert titles(filter_movies(MOVIES, {"genre": ["動作"]})) == ["鬼滅之刃"]
+    assert titles(filter_movies(MOVIES, {"min_rating": ["9"]})) == ["鬼滅之刃"]
+    assert titles(filter_movies(MOVIES, {"min_rating": ["high"]})) == titles(MOVIES)
+
+
+def test_filter_by_showtime_narrows_the_showtimes():
+    found = filter_movies(MOVIES, {"cinema": ["Cinema City"], "date": ["2025-08-31"]})
+    assert titles(found) == ["Oppenheimer"]
+    assert [s.date for s in found[0].showtimes] == ["2025-08-31"]
+    # The published movie is left untouched
+    assert len(MOVIES[0].showtimes) == 2
+
+
+def test_gzip_negotiation():
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, gzip;q=0.5")
+    assert accepts_gzip("*")
+    assert not accepts_gzip("")
+    assert not accepts_gzip("identity")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("gzip;q=0, *")
+
+    large = Response({"items": ["x" * 40] * 40})
+    body, etag, encoding = large.negotiate("gzip")
+    assert encoding == "gzip" and gzip.decompress(body) == large.body
+    assert large.negotiate("identity") == (large.body, large.etag, None)
+    # Small bodies are never compressed
+    small = Response({"ok": True})
+    assert small.negotiate("gzip") == (small.body, small.etag, None)
+
+
+def test_each_encoding_has_its_own_etag():
+    response = Response({"items": ["x" * 40] * 40})
+    assert response.etag != response.gzip_etag
+    assert Response({"items": ["x" * 40] * 40}).etag == response.etag
+
+
+def test_etag_matches():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('"xyz", W/"abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches(None, '"abc"')
+    assert not etag_matches('"abc-gzip"', '"abc"')
+
+
+def test_publish_clears_the_filter_cache():
+    state = ApiState(lambda: [])
+    assert state.filtered("movies", {}) is None
+    state.publish(MOVIES)
+    query = {"genre": ["動畫"]}
+    first = state.filtered("movies", query)
+    assert state.filtered("movies", query) is first
+    assert json.loads(first.body)["version"] == 1
+
+    state.publish(MOVIES[:1])
+    second = state.filtered("movies", query)
+    assert second is not first
+    assert json.loads(second.body)["movies"] == []
+    assert len(state._filtered) == 1
+
+
+def test_refresh_requests_join_the_scrape_in_flight():
+    release = threading.Event()
+    calls = []
+
+    def scrape():
+        calls.append(1)
+        release.wait(5)
+        return MOVIES
+
+    refreshed = []
+    state = ApiState(scrape, on_refresh=refreshed.append)
+    assert state.request_refresh()
+    assert not state.request_refresh()
+    assert state.refreshing
+    release.set()
+    state._refresh_thread.join(5)
+
+    assert len(calls) == 1
+    assert state.current.version == 1
+    assert refreshed == [MOVIES]
+    # Once finished, the next request starts a new scrape
+    assert state.request_refresh()
+    state._refresh_thread.join(5)
+    assert len(calls) == 2
+
+
+def test_failed_refresh_keeps_the_published_result():
+    def scrape():
+        raise RuntimeError("Every detail page failed")
+
+    state = ApiState(scrape)
+    state.publish(MOVIES)
+    state.request_refresh()
+    state._refresh_thread.join(5)
+    assert state.current.version == 1
+    assert state.last_error == "Every detail page failed"
+
+
+@pytest.fixture
+def api():
+    state = ApiState(lambda: MOVIES)
+    state.publish(MOVIES * 5)
+    server = make_server(state, "127.0.0.1", 0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url, **headers):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as reply:
+            return reply.status, reply.headers, reply.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_conditional_requests_per_encoding(api):
+    status, headers, body = get(f"{api}/movies")
+    assert status == 200 and headers["Vary"] == "Accept-Encoding"
+    assert "Content-Encoding" not in headers
+    etag = headers["ETag"]
+
+    status, zipped_headers, zipped = get(f"{api}/movies", **{"Accept-Encoding": "gzip"})
+    assert zipped_headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(zipped) == body
+    assert zipped_headers["ETag"] != etag
+
+    assert get(f"{api}/movies", **{"If-None-Match": etag})[0] == 304
+    # The identity ETag does not validate the gzip representation
+    assert get(f"{api}/movies", **{"If-None-Match": etag, "Accept-Encoding": "gzip"})[0] == 200
+    assert get(f"{api}/movies", **{"If-None-Match": zipped_headers["ETag"], "Accept-Encoding": "gzip"})[0] == 304
+
+
+def test_endpoints(api):
+    status, _, body = get(f"{api}/movies/2")
+    assert status == 200 and json.loads(body)["title"] == "鬼滅之刃"
+    assert get(f"{api}/movies/404")[0] == 404
+    status, _, body = get(f"{api}/showtimes?cinema={quote('百老匯')}")
+    assert status == 200 and len(json.loads(body)["showtimes"]) == 5
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the page archive: deduplication, dictionary compression and re-parsing
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import wmoov_scraper.archive as archive
+from wmoov_scraper.archive import TRAIN_AFTER, PageArchive
+from wmoov_scraper.models import STATUS_COMPLETE, STATUS_FAILED
+from wmoov_scraper.scraper import WMOOVScraper
+from test_parsers import CINEMA_PAGE, DETAIL_PAGE, LISTING_PAGE
+
+
+def page(number):
+    """A detail page sharing the boilerplate real fetches do"""
+    return DETAIL_PAGE.replace("尚餘 45 個座位", f"尚餘 {number} 個座位")
+
+
+@pytest.fixture
+def zlib_archive(tmp_path, monkeypatch):
+    # Pin the fallback codec, whether or not zstandard is installed
+    monkeypatch.setattr(archive, "zstandard", None)
+    store = PageArchive(str(tmp_path / "pages"), run_id="run-1")
+    yield store
+    store.close()
+
+
+def test_identical_pages_are_stored_once(zlib_archive):
+    assert zlib_archive.add("https://wmoov.com/movie/details/1", "detail", DETAIL_PAGE, {"date": "2025-08-30"})
+    assert not zlib_archive.add("https://wmoov.com/movie/details/1", "detail", DETAIL_PAGE, {"date": "2025-08-31"})
+    assert zlib_archive.add("https://wmoov.com/movie/showing", "listing", LISTING_PAGE)
+
+    assert zlib_archive.snapshot()["stored"] == 2
+    assert zlib_archive.snapshot()["deduplicated"] == 1
+    # Both fetches are indexed, each with its own metadata
+    fetched = list(zlib_archive.pages(kind="detail"))
+    assert [p.meta["date"] for p in fetched] == ["2025-08-30", "2025-08-31"]
+    assert all(p.html == DETAIL_PAGE for p in fetched)
+    assert [p.kind for p in zlib_archive.pages(url="https://wmoov.com/movie/showing")] == ["listing"]
+
+
+def test_dictionary_is_trained_after_enough_pages(zlib_archive):
+    for number in range(TRAIN_AFTER - 1):
+        zlib_archive.add(f"https://wmoov.com/movie/details/{number}", "detail", page(number))
+    assert zlib_archive._dictionary is None
+    zlib_archive.add("https://wmoov.com/movie/details/last", "detail", page(TRAIN_AFTER))
+    assert zlib_archive._dictionary is not None
+
+
+def test_dictionary_round_trip(tmp_path, zlib_archive):
+    baseline = PageArchive(str(tmp_path / "baseline"))
+    baseline.add("https://wmoov.com/movie/details/new", "detail", page(999))
+    undictionaried = baseline.stored_bytes
+    baseline.close()
+
+    for number in range(TRAIN_AFTER):
+        zlib_archive.add(f"https://wmoov.com/movie/details/{number}", "detail", page(number))
+    before = zlib_archive.stored_bytes
+    zlib_archive.add("https://wmoov.com/movie/details/new", "detail", page(999))
+    # The shared boilerplate is already in the dictionary
+    assert zlib_archive.stored_bytes - before < undictionaried
+
+    # A fresh handle finds the dictionary in the index and decodes every page
+    reopened = PageArchive(zlib_archive.directory)
+    htmls = [p.html for p in reopened.pages(run_id="run-1")]
+    reopened.close()
+    assert htmls == [page(number) for number in range(TRAIN_AFTER)] + [page(999)]
+
+
+def test_runs_are_listed_oldest_first(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "zstandard", None)
+    for run_id in ("20250830-120000", "20250829-120000"):
+        store = PageArchive(str(tmp_path), run_id=run_id)
+        store.add("https://wmoov.com/movie/showing", "listing", LISTING_PAGE)
+        store.close()
+    store = PageArchive(str(tmp_path))
+    assert store.runs() == ["20250829-120000", "20250830-120000"]
+    assert [p.run_id for p in store.pages(run_id="20250830-120000")] == ["20250830-120000"]
+    store.close()
+
+
+def test_reparse_rebuilds_the_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("WMOOV_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(archive, "zstandard", None)
+    store = PageArchive(str(tmp_path / "pages"), run_id="run-1")
+    store.add("https://wmoov.com/movie/showing", "listing", LISTING_PAGE)
+    # A retried fetch archives the page again; the later copy wins
+    store.add("https://wmoov.com/movie/details/1234", "detail", page(3), {"date": "2025-08-30"})
+    store.add("https://wmoov.com/movie/details/1234", "detail", DETAIL_PAGE, {"date": "2025-08-30"})
+    store.add("https://wmoov.com/cinema/1", "cinema", CINEMA_PAGE,
+              {"date": "2025-08-31", "cinema": "百老匯 MOViE MOViE"})
+    store.close()
+
+    scraper = WMOOVScraper(archive_dir=str(tmp_path / "pages"))
+    try:
+        movies = asyncio.run(scraper.reparse_archive())
+    finally:
+        asyncio.run(scraper.parser.close())
+        scraper.archive.close()
+
+    assert [m.title for m in movies] == ["鬼滅之刃"]
+    demon_slayer = movies[0]
+    assert demon_slayer.scrape_status == STATUS_COMPLETE
+    assert demon_slayer.director == "外崎春雄"
+    assert sorted((s.date, s.time, s.available_seats) for s in demon_slayer.showtimes) == [
+        ("2025-08-30", "00:05", "未知"),
+        ("2025-08-30", "19:30", "45"),
+        ("2025-08-31", "14:15", "12"),
+    ]
+    # Movies no archived page covered are reported, not invented
+    assert f"東極島 ({STATUS_FAILED})" in scraper.metrics.incomplete_movies
+
+
+def test_reparse_needs_a_known_run(tmp_path, monkeypatch):
+    monkeypatch.setenv("WMOOV_CACHE_DIR", str(tmp_path / "cache"))
+    scraper = WMOOVScraper(archive_dir=str(tmp_path / "pages"))
+    try:
+        with pytest.raises(ValueError):
+            asyncio.run(scraper.reparse_archive("missing"))
+    finally:
+        asyncio.run(scraper.parser.close())
+        scraper.archive.close()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Tests for the binary snapshot format: round trips and rejecting damaged files
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wmoov_scraper.binsnap import BinarySnapshot, load_binary_snapshot, save_binary_snapshot
+from wmoov_scraper.models import Movie, Showtime, STATUS_PARTIAL
+from wmoov_scraper.snapshot import is_binary_snapshot, load_snapshot
+
+MOVIES = [
+    Movie(
+        "鬼滅之刃", 9.1, ["動畫", "動作"], "外崎春雄", ["花江夏樹"], 5321,
+        [
+            Showtime("百老匯 MOViE MOViE", "1號院", "19:30", "2025-08-30", "尚餘", 120.0, "/booking/1"),
+            Showtime("Cinema City 朗豪坊", "", "00:05", "2025-08-31", "未知", 95.0, None),
+        ],
+        url="/movie/details/1234", poster_url="https://wmoov.com/poster/1234.jpg",
+        movie_id="1234", variant_urls=["/movie/details/1235"],
+    ),
+    Movie("Untitled", None, [], None, [], 0, [], scrape_status=STATUS_PARTIAL, movie_id="t-1"),
+]
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = tmp_path / "result.wsnap"
+    save_binary_snapshot(MOVIES, str(path), ["2025-08-30", "2025-08-31"])
+    return path
+
+
+def test_round_trip(snapshot_path):
+    assert is_binary_snapshot(str(snapshot_path))
+    assert load_binary_snapshot(str(snapshot_path)) == MOVIES
+    assert load_snapshot(str(snapshot_path)) == MOVIES
+
+
+def test_snapshot_view(snapshot_path):
+    with BinarySnapshot(str(snapshot_path)) as snapshot:
+        assert (snapshot.movie_count, snapshot.showtime_count) == (2, 2)
+        assert snapshot.meta["dates"] == ["2025-08-30", "2025-08-31"]
+        assert list(snapshot.iter_showtimes()) == MOVIES[0].showtimes
+        assert snapshot.string(snapshot.string_id("1號院")) == "1號院"
+        assert snapshot.string_id("not stored") is None
+
+
+def test_empty_result_round_trips(tmp_path):
+    path = tmp_path / "empty.wsnap"
+    save_binary_snapshot([], str(path))
+    assert load_binary_snapshot(str(path)) == []
+
+
+@pytest.mark.parametrize("keep", [0.5, 0.9])
+def test_rejects_truncated_file(snapshot_path, keep):
+    data = snapshot_path.read_bytes()
+    snapshot_path.write_bytes(data[:int(len(data) * keep)])
+    with pytest.raises(ValueError, match="truncated"):
+        load_binary_snapshot(str(snapshot_path))
+
+
+def test_rejects_truncated_header(snapshot_path):
+    snapshot_path.write_bytes(snapshot_path.read_bytes()[:10])
+    with pytest.raises(ValueError, match="truncated"):
+        load_binary_snapshot(str(snapshot_path))
+
+
+def test_rejects_bad_magic(snapshot_path):
+    data = snapshot_path.read_bytes()
+    snapshot_path.write_bytes(b"NOTASNAP" + data[8:])
+    assert not is_binary_snapshot(str(snapshot_path))
+    with pytest.raises(ValueError, match="not a binary snapshot"):
+        load_binary_snapshot(str(snapshot_path))
+
+
+def test_rejects_empty_file(tmp_path):
+    path = tmp_path / "empty.wsnap"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError, match="empty"):
+        load_binary_snapshot(str(path))
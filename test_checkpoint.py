@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for checkpoint persistence and resuming after a crash
+"""
+
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wmoov_scraper.checkpoint import CheckpointStore
+from wmoov_scraper.models import Movie, Showtime
+
+DATES = [date(2025, 8, 30), date(2025, 8, 31)]
+
+
+def movie(movie_id, *times):
+    showtimes = [Showtime("百老匯 MOViE MOViE", "1號院", time, "2025-08-30", "10", 100.0) for time in times]
+    return Movie(f"電影 {movie_id}", 8.0, ["劇情"], None, [], 1, showtimes,
+                 url=f"/movie/details/{movie_id}", movie_id=movie_id)
+
+
+def test_empty_checkpoint(tmp_path):
+    assert CheckpointStore(DATES, str(tmp_path)).load() == (None, {})
+
+
+def test_listing_and_movies_reload(tmp_path):
+    store = CheckpointStore(DATES, str(tmp_path))
+    listing = [movie("1"), movie("2"), movie("3")]
+    store.save_listing(listing)
+    store.record_movie(movie("1", "10:00", "12:00"))
+    store.record_movie(movie("3"))
+
+    loaded, completed = CheckpointStore(DATES, str(tmp_path)).load()
+    assert loaded == listing
+    assert set(completed) == {"1", "3"}
+    assert completed["1"] == movie("1", "10:00", "12:00")
+
+
+def test_torn_last_line_is_dropped_and_later_entries_are_kept(tmp_path):
+    store = CheckpointStore(DATES, str(tmp_path))
+    store.record_movie(movie("1", "10:00"))
+    store.record_movie(movie("2", "12:00"))
+    data = store.completed_path.read_bytes()
+    # Cut the second entry off mid-write
+    store.completed_path.write_bytes(data[:len(data) - 20])
+
+    _, completed = store.load()
+    assert set(completed) == {"1"}
+
+    # The file was repaired, so an entry appended after resuming reads back
+    store.record_movie(movie("2", "12:00"))
+    _, completed = store.load()
+    assert set(completed) == {"1", "2"}
+
+
+def test_unreadable_entry_is_skipped(tmp_path):
+    store = CheckpointStore(DATES, str(tmp_path))
+    store.record_movie(movie("1"))
+    with open(store.completed_path, "a", encoding="utf-8") as f:
+        f.write('{"title": "missing fields"}\n')
+    store.record_movie(movie("2"))
+    assert set(store.load()[1]) == {"1", "2"}
+
+
+def test_windows_do_not_share_checkpoints(tmp_path):
+    CheckpointStore(DATES, str(tmp_path)).record_movie(movie("1"))
+    assert CheckpointStore(DATES[:1], str(tmp_path)).load() == (None, {})
+
+
+def test_reset_discards_progress(tmp_path):
+    store = CheckpointStore(DATES, str(tmp_path))
+    store.save_listing([movie("1")])
+    store.record_movie(movie("1"))
+    store.reset()
+    assert store.load() == (None, {})
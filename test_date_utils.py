@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tests for date helpers: weekend windows and the site's date picker labels
+"""
+
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wmoov_scraper.date_utils import find_date_option, format_date_label, get_weekend_dates
+
+
+def test_date_label_matches_the_site():
+    assert format_date_label(date(2025, 8, 30)) == "8月30日 星期六"
+    assert format_date_label(date(2025, 8, 31)) == "8月31日 星期日"
+    assert format_date_label(date(2025, 12, 1)) == "12月1日 星期一"
+
+
+def test_find_date_option():
+    labels = ["8月29日 星期五", "8月30日  星期六 (今日)", "8月31日 星期日"]
+    assert find_date_option(labels, date(2025, 8, 30)) == "8月30日  星期六 (今日)"
+    assert find_date_option(labels, date(2025, 8, 31)) == "8月31日 星期日"
+    assert find_date_option(labels, date(2025, 9, 1)) is None
+
+
+def test_find_date_option_does_not_match_a_longer_day():
+    # 2025-01-01 and 2023-11-01 are both Wednesdays
+    labels = ["11月1日 星期三", "1月11日 星期三"]
+    assert find_date_option(labels, date(2025, 1, 1)) is None
+
+
+def test_weekend_dates():
+    assert get_weekend_dates(date(2025, 8, 27)) == [date(2025, 8, 30), date(2025, 8, 31)]
+    assert get_weekend_dates(date(2025, 8, 30)) == [date(2025, 8, 30), date(2025, 8, 31)]
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for the snapshot diff: added, removed and changed showtime rows
+"""
+
+import io
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wmoov_scraper.diff import diff_snapshots, flatten, summarize_changes, write_changes
+from wmoov_scraper.models import Movie, Showtime
+
+
+def showtime(time, price=100.0, seats="10", cinema="百老匯 MOViE MOViE", hall="1號院"):
+    return Showtime(cinema, hall, time, "2025-08-30", seats, price, None)
+
+
+def movie(movie_id, *showtimes):
+    return Movie(f"Movie {movie_id}", None, [], None, [], 0, list(showtimes),
+                 url=f"/movie/details/{movie_id}", movie_id=movie_id)
+
+
+def test_flatten_sorts_rows_by_key_and_collapses_duplicates():
+    rows = flatten([movie("1", showtime("10:00"), showtime("12:00"), showtime("10:00", price=90.0))])
+    keys = [key for key, _, _ in rows]
+    assert keys == sorted(keys)
+    assert len(rows) == 2
+
+
+def test_identical_snapshots_have_no_changes():
+    old = [movie("1", showtime("10:00"), showtime("12:00")), movie("2", showtime("14:00"))]
+    new = [movie("2", showtime("14:00")), movie("1", showtime("12:00"), showtime("10:00"))]
+    assert list(diff_snapshots(old, new)) == []
+
+
+def test_added_removed_and_changed_rows():
+    old = [movie("1", showtime("10:00"), showtime("12:00", price=100.0)), movie("2", showtime("14:00"))]
+    new = [movie("1", showtime("12:00", price=120.0, seats="3")), movie("3", showtime("16:00"))]
+    changes = {(change["op"], change["movie_id"], change["time"]): change
+               for change in diff_snapshots(old, new)}
+
+    assert set(changes) == {
+        ("removed", "1", "10:00"),
+        ("removed", "2", "14:00"),
+        ("changed", "1", "12:00"),
+        ("added", "3", "16:00"),
+    }
+    assert changes[("changed", "1", "12:00")]["changes"] == {
+        "price": [100.0, 120.0],
+        "available_seats": ["10", "3"],
+    }
+    added = changes[("added", "3", "16:00")]
+    assert (added["price"], added["available_seats"], added["booking_url"]) == (100.0, "10", None)
+    assert "price" not in changes[("removed", "2", "14:00")]
+
+
+def test_rows_are_keyed_by_cinema_and_hall():
+    old = [movie("1", showtime("10:00", hall="1號院"))]
+    new = [movie("1", showtime("10:00", hall="2號院"))]
+    assert sorted(change["op"] for change in diff_snapshots(old, new)) == ["added", "removed"]
+
+
+def test_against_empty_snapshot():
+    new = [movie("1", showtime("10:00"), showtime("12:00"))]
+    assert summarize_changes(diff_snapshots([], new)) == {"added": 2}
+    assert summarize_changes(diff_snapshots(new, [])) == {"removed": 2}
+
+
+def test_write_changes_emits_json_lines():
+    stream = io.StringIO()
+    count = write_changes(diff_snapshots([], [movie("1", showtime("10:00"))]), stream)
+    lines = stream.getvalue().splitlines()
+    assert count == len(lines) == 1
+    assert json.loads(lines[0])["cinema"] == "百老匯 MOViE MOViE"
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-host AIMD governor
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wmoov_scraper.governor import HostGovernor, RateGovernor
+
+
+def governor(**options):
+    return HostGovernor("wmoov.com", **options)
+
+
+def test_success_increases_rate_and_window_additively():
+    host = governor(rate=2.0, concurrency=2.0)
+    host.record(0.5, status=200)
+    assert host.concurrency == 2.5
+    assert host.rate == 2.2
+    for _ in range(10):
+        before = host.concurrency
+        host.record(0.5, status=200)
+        # About one more slot per full window of successes, not per response
+        assert host.concurrency - before == pytest.approx(1.0 / before)
+    assert host.decreases == 0
+
+
+def test_increase_is_capped():
+    host = governor(rate=9.9, max_rate=10.0, concurrency=7.9, max_concurrency=8)
+    for _ in range(20):
+        host.record(0.1, status=200)
+    assert host.rate == 10.0
+    assert host.limit == 8
+
+
+def test_throttle_signals_halve_rate_and_window():
+    for outcome in ({"status": 429}, {"status": 503}, {"timed_out": True}):
+        host = governor(rate=4.0, concurrency=4.0)
+        host.record(1.0, **outcome)
+        assert (host.rate, host.concurrency, host.decreases) == (2.0, 2.0, 1)
+
+
+def test_slow_response_counts_as_throttle():
+    host = governor(rate=4.0, concurrency=4.0, slow_threshold=10.0)
+    host.record(12.0, status=200)
+    assert host.rate == 2.0
+    assert host.throttled == 0
+
+
+def test_decrease_has_a_floor():
+    host = governor(rate=1.0, min_rate=0.2, concurrency=2.0)
+    for _ in range(10):
+        host.record(1.0, status=429)
+    assert host.rate == 0.2
+    assert host.limit == 1
+    assert (host.throttled, host.decreases) == (10, 10)
+
+
+def test_latency_is_smoothed():
+    host = governor()
+    host.record(1.0, status=200)
+    host.record(2.0, status=200)
+    assert host.snapshot()["latency_ewma"] == 1.2
+
+
+def test_slot_limits_concurrency():
+    host = governor(concurrency=2.0)
+    peak = 0
+
+    async def request():
+        nonlocal peak
+        async with host.slot():
+            peak = max(peak, host.in_flight)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(request() for _ in range(6)))
+
+    asyncio.run(main())
+    assert peak == 2
+    assert host.in_flight == 0
+
+
+def test_registry_keeps_one_governor_per_host():
+    registry = RateGovernor(rate=3.0)
+    first = registry.for_url("https://wmoov.com/movie/details/1")
+    assert registry.for_url("https://wmoov.com/cinema/2") is first
+    assert registry.for_url("https://img.wmoov.com/poster.jpg") is not first
+    assert first.rate == 3.0
+    assert set(registry.snapshot()) == {"wmoov.com", "img.wmoov.com"}
+
+
+class HangingPage:
+    """A page whose navigation never finishes"""
+
+    async def goto(self, url):
+        await asyncio.sleep(3600)
+
+
+class FailingPage:
+    async def goto(self, url):
+        raise RuntimeError("net::ERR_CONNECTION_RESET")
+
+
+def scraper_governor(page, timeout=None):
+    """Navigate a scraper to a page and return the host governor that saw it"""
+    from wmoov_scraper.scraper import WMOOVScraper
+
+    scraper = WMOOVScraper(rate=1000.0)
+    url = f"{scraper.base_url}/movie/details/1"
+
+    async def main():
+        await asyncio.wait_for(scraper._goto(page, url), timeout=timeout)
+
+    with pytest.raises(Exception):
+        asyncio.run(main())
+    return scraper.governor.for_url(url)
+
+
+def test_load_cut_off_by_the_attempt_budget_backs_off():
+    host = scraper_governor(HangingPage(), timeout=0.05)
+    assert (host.timeouts, host.decreases) == (1, 1)
+
+
+def test_navigation_error_backs_off():
+    host = scraper_governor(FailingPage())
+    assert (host.timeouts, host.decreases) == (1, 1)
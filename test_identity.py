@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for movie identity: title normalization and listing card merging
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wmoov_scraper.identity import MovieIndex, normalize_title, stable_movie_id
+from wmoov_scraper.models import Movie
+
+
+def card(title, url=None, rating=None, popularity=0):
+    return Movie(title, rating, [], None, [], popularity, [], url=url)
+
+
+def test_normalize_title_strips_variant_tags():
+    assert normalize_title("奧本海默 IMAX") == normalize_title("奧本海默")
+    assert normalize_title("Dune: Part Two (IMAX)") == normalize_title("Dune: Part Two")
+    assert normalize_title("Avatar 3D") == normalize_title("Avatar")
+    assert normalize_title("鬼滅之刃 粵語版") == normalize_title("鬼滅之刃")
+    assert normalize_title("鬼滅之刃【4DX】") == normalize_title("鬼滅之刃")
+    assert normalize_title("Ｆｕｌｌ　Ｗｉｄｔｈ") == normalize_title("Full Width")
+
+
+def test_normalize_title_keeps_tags_inside_words():
+    assert normalize_title("3Days") != normalize_title("ays")
+    assert normalize_title("3Days") == "3days"
+    assert normalize_title("Imaxine") == "imaxine"
+    assert normalize_title("重映人生") == "重映人生"
+
+
+def test_normalize_title_of_only_tags_keeps_text():
+    assert normalize_title("IMAX") == "imax"
+
+
+def test_index_collapses_duplicate_cards():
+    index = MovieIndex()
+    first = index.add(card("Oppenheimer", "/movie/details/1", popularity=10))
+    again = index.add(card("Oppenheimer", "/movie/details/1", rating=8.5, popularity=30))
+    assert again is first
+    assert index.movies() == [first]
+    assert first.rating == 8.5
+    assert first.popularity == 30
+
+
+def test_index_folds_tagged_variants_with_their_urls():
+    index = MovieIndex()
+    film = index.add(card("Oppenheimer", "/movie/details/1"))
+    imax = index.add(card("Oppenheimer IMAX", "/movie/details/2"))
+    assert imax is film
+    assert film.variant_urls == ["/movie/details/2"]
+    assert index.get("2") is film
+    assert index.merged == 1
+
+
+def test_index_keeps_same_named_films_with_different_ids_apart():
+    index = MovieIndex()
+    index.add(card("Home", "/movie/details/1"))
+    index.add(card("Home", "/movie/details/2"))
+    assert [movie.movie_id for movie in index.movies()] == ["1", "2"]
+    assert index.merged == 0
+
+
+def test_index_merges_by_title_without_site_id():
+    index = MovieIndex()
+    film = index.add(card("Oppenheimer", "/movie/details/1"))
+    assert index.add(card("Oppenheimer")) is film
+    assert len(index.movies()) == 1
+
+
+def test_stable_movie_id_prefers_site_id():
+    assert stable_movie_id("Anything", "/movie/details/42/") == "42"
+    assert stable_movie_id("Oppenheimer IMAX") == stable_movie_id("Oppenheimer")
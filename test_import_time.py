@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Import-time guard for the CLI entry point
+
+Runs the CLI under `python -X importtime` and checks that --help and the
+cache-only diff command neither import the heavy scraping/rendering modules
+nor exceed an import-time budget.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Modules only the scraping and rendering paths may import
+HEAVY_MODULES = ("playwright", "bs4", "rich", "pytz", "dateutil")
+
+# Generous budget for everything imported on top of the interpreter start-up
+IMPORT_BUDGET_US = 150_000
+
+
+def run_with_importtime(*args):
+    """Run the CLI and return {module: (cumulative microseconds, nesting depth)}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "wmoov_scraper.main", *args],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = (int(cumulative_us), depth)
+    return result, modules
+
+
+def imported_heavy_modules(modules):
+    return sorted(
+        name for name in modules
+        if name.split(".")[0] in HEAVY_MODULES
+    )
+
+
+def cli_import_cost(modules):
+    """Cumulative import time of the package and what it pulled in"""
+    return sum(
+        cost for name, (cost, depth) in modules.items()
+        if depth == 0 and name.startswith("wmoov_scraper")
+    )
+
+
+def test_help_skips_heavy_imports():
+    result, modules = run_with_importtime("--help")
+    assert result.returncode == 0
+    assert imported_heavy_modules(modules) == []
+    assert cli_import_cost(modules) < IMPORT_BUDGET_US
+
+
+def test_diff_skips_heavy_imports(tmp_path):
+    snapshot = tmp_path / "snapshot.json"
+    snapshot.write_text(json.dumps({"movies": []}))
+
+    result, modules = run_with_importtime("diff", str(snapshot), str(snapshot))
+    assert result.returncode == 0
+    assert not any(name.split(".")[0] in ("playwright", "bs4") for name in modules)
+    assert cli_import_cost(modules) < IMPORT_BUDGET_US
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for logging setup: rate-limited repeated warnings and where they apply
+"""
+
+import atexit
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import wmoov_scraper.log_config as log_config
+from wmoov_scraper.log_config import RepeatedWarningFilter, configure_logging
+
+
+def warning(msg, *args, level=logging.WARNING):
+    return logging.makeLogRecord({"msg": msg, "args": args or None, "levelno": level})
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_suppressed(monkeypatch):
+    monkeypatch.setattr(log_config.time, "monotonic", Clock())
+    repeat_filter = RepeatedWarningFilter(burst=3, window=60.0)
+    passed = [repeat_filter.filter(warning("Failed for %s", "A")) for _ in range(5)]
+    assert passed == [True, True, True, False, False]
+
+
+def test_different_messages_and_arguments_are_counted_apart(monkeypatch):
+    monkeypatch.setattr(log_config.time, "monotonic", Clock())
+    repeat_filter = RepeatedWarningFilter(burst=1, window=60.0)
+    assert repeat_filter.filter(warning("Failed for %s", "A"))
+    assert repeat_filter.filter(warning("Failed for %s", "B"))
+    assert repeat_filter.filter(warning("Failed for C"))
+    assert not repeat_filter.filter(warning("Failed for %s", "A"))
+
+
+def test_window_reset_reports_the_suppressed_count(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(log_config.time, "monotonic", clock)
+    repeat_filter = RepeatedWarningFilter(burst=2, window=60.0)
+    for _ in range(5):
+        repeat_filter.filter(warning("Failed for %s", "A"))
+
+    clock.now += 61
+    record = warning("Failed for %s", "A")
+    assert repeat_filter.filter(record)
+    assert record.getMessage() == "Failed for A (3 similar warnings suppressed)"
+    # The count starts again after it has been reported
+    record = warning("Failed for %s", "A")
+    assert repeat_filter.filter(record)
+    assert record.getMessage() == "Failed for A"
+
+
+def test_other_levels_are_never_limited(monkeypatch):
+    monkeypatch.setattr(log_config.time, "monotonic", Clock())
+    repeat_filter = RepeatedWarningFilter(burst=1, window=60.0)
+    for level in (logging.INFO, logging.ERROR):
+        assert all(repeat_filter.filter(warning("Same", level=level)) for _ in range(5))
+
+
+def installed_filters(**options):
+    listener = configure_logging(**options)
+    try:
+        return [f for f in logging.getLogger().handlers[0].filters if isinstance(f, RepeatedWarningFilter)]
+    finally:
+        if listener:
+            listener.stop()
+            atexit.unregister(listener.stop)
+        logging.basicConfig(handlers=[logging.NullHandler()], force=True)
+
+
+def test_filter_only_installed_for_machine_logs():
+    assert installed_filters(fmt="rich") == []
+    assert len(installed_filters(fmt="json")) == 1
+    assert len(installed_filters(fmt="rich", use_queue=True)) == 1
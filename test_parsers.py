@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Differential tests for the HTML parser backends
+
+Every installed backend must turn the fixture pages into exactly the same
+movies and showtimes as BeautifulSoup with html.parser, the reference.
+Backends that are not installed are skipped.
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wmoov_scraper.html_backends import BACKENDS, available_backends
+from wmoov_scraper.models import Movie, Showtime
+from wmoov_scraper.parsing import ParsePool, parse_listing, parse_detail_table, parse_cinema_table, parse_metadata
+from wmoov_scraper.selector_resolver import DEFAULT_CANDIDATES
+
+REFERENCE = "html.parser"
+
+LISTING_PAGE = """<!DOCTYPE html>
+<html><head><title>WMOOV 正在上映</title>
+<script>var featured = "<h3>Not a movie</h3>";</script></head>
+<body>
+<!-- listing starts -->
+<div class="movie_list">
+  <div class="movie">
+    <h3><a href="/movie/details/1234">「鬼滅之刃」無限城篇 熱門 主打</a></h3>
+    <a href="/movie/rating/1234">9.1</a>
+    <p>片種: 動畫, 動作,奇幻</p>
+    <p>人氣: 5321</p>
+  </div>
+  <div class="movie">
+    <h3><a href="/movie/details/88">東極島&nbsp;</a></h3>
+    <a href="/movie/rating/88">&nbsp;6.2 </a>
+    <p>片種:劇情</p><span>人氣:  17</span>
+  </div>
+  <div class="movie">
+    <h3>即日上映</h3>
+  </div>
+  <div class="movie">
+    <h3><a href="/movie/details/901">Toy&amp;Story</a> <em>好評</em></h3>
+    <p>Trailer <a href="/trailer/901">watch</a></p>
+  </div>
+</div>
+</body></html>
+"""
+
+DETAIL_PAGE = """<!DOCTYPE html>
+<html><head>
+<meta property="og:image" content="https://wmoov.com/poster/1234.jpg">
+<style>td { color: red; }</style>
+</head><body>
+<div class="info">
+  <p>導演：外崎春雄</p>
+  <p>主演: 花江夏樹, 鬼頭明里、下野紘</p>
+  <iframe src="https://www.youtube.com/embed/abc"></iframe>
+</div>
+<table class="showtime">
+  <tr><th>戲院</th><th>時間</th><th>座位</th><th>票價</th><th>購票</th></tr>
+  <tr>
+    <td>百老匯 MOViE MOViE (1號院)</td>
+    <td> 7:30 PM </td>
+    <td>尚餘 45 個座位</td>
+    <td>$120</td>
+    <td><a href="/booking/1">購票</a></td>
+  </tr>
+  <tr>
+    <td>Cinema City<!-- flagship --> 朗豪坊</td>
+    <td>12:05 AM</td>
+    <td></td>
+    <td>HK$ 95.5</td>
+    <td>已滿</td>
+  </tr>
+  <tr><td colspan="5">暫無更多場次</td></tr>
+</table>
+</body></html>
+"""
+
+CINEMA_PAGE = """<html><body>
+<h1>百老匯 MOViE MOViE</h1>
+<div class="schedule-wrapper">
+<table class="schedule">
+  <thead><tr><th>電影</th><th>影院</th><th>時間</th><th>座位</th><th>票價</th><th>購票</th></tr></thead>
+  <tbody>
+  <tr>
+    <td><a href="/movie/details/1234">鬼滅之刃 <b>無限城篇</b></a></td>
+    <td>2號院</td><td>2:15 PM</td><td>12 剩餘</td><td>$130</td>
+    <td><a href="/booking/9?seat=1&amp;x=2">Book</a></td>
+  </tr>
+  <tr>
+    <td>Untitled screening</td>
+    <td>3號院</td><td>21:00</td><td> </td><td>免費</td><td></td>
+  </tr>
+  </tbody>
+</table>
+</div>
+</body></html>
+"""
+
+BACKEND_NAMES = [
+    pytest.param(
+        name,
+        marks=pytest.mark.skipif(name not in available_backends(), reason=f"{name} is not installed"),
+    )
+    for name in BACKENDS
+    if name != REFERENCE
+]
+
+
+def listing_movies(backend):
+    selector, cards = parse_listing(LISTING_PAGE, DEFAULT_CANDIDATES["card"], backend=backend)
+    return selector, [
+        Movie(title, rating, genres, None, [], popularity, [], url=href)
+        for title, rating, genres, popularity, href in cards
+    ]
+
+
+def detail_showtimes(backend):
+    selector, rows = parse_detail_table(
+        DETAIL_PAGE, DEFAULT_CANDIDATES["showtime_table"], "2025-08-30", backend=backend
+    )
+    return selector, [Showtime(*row) for row in rows]
+
+
+def cinema_showtimes(backend):
+    selector, rows = parse_cinema_table(
+        CINEMA_PAGE, DEFAULT_CANDIDATES["showtime_table"], "百老匯 MOViE MOViE", "2025-08-31", backend=backend
+    )
+    return selector, [(href, title, Showtime(*row)) for href, title, row in rows]
+
+
+def test_reference_output():
+    """Pin the reference output, so agreeing backends are also right"""
+    selector, movies = listing_movies(REFERENCE)
+    assert selector == ".movie_list h3"
+    assert [(m.title, m.rating, m.genres, m.popularity, m.url) for m in movies] == [
+        ("鬼滅之刃", 9.1, ["動畫", "動作", "奇幻"], 5321, "/movie/details/1234"),
+        ("東極島", 6.2, ["劇情"], 17, "/movie/details/88"),
+        ("Toy&Story", None, [], 0, "/movie/details/901"),
+    ]
+
+    selector, showtimes = detail_showtimes(REFERENCE)
+    assert selector == "table.showtime"
+    assert showtimes == [
+        Showtime("百老匯 MOViE MOViE", "1號院", "19:30", "2025-08-30", "45", 120.0, "/booking/1"),
+        Showtime("Cinema City 朗豪坊", "", "00:05", "2025-08-30", "未知", 95.0, None),
+    ]
+
+    selector, rows = cinema_showtimes(REFERENCE)
+    assert selector == "table.schedule"
+    assert rows == [
+        ("/movie/details/1234", "鬼滅之刃 無限城篇",
+         Showtime("百老匯 MOViE MOViE", "2號院", "14:15", "2025-08-31", "12", 130.0, "/booking/9?seat=1&x=2")),
+        (None, "Untitled screening",
+         Showtime("百老匯 MOViE MOViE", "3號院", "21:00", "2025-08-31", "未知", 0.0, None)),
+    ]
+
+    assert parse_metadata(DETAIL_PAGE, backend=REFERENCE) == (
+        "外崎春雄",
+        ["花江夏樹", "鬼頭明里", "下野紘"],
+        "https://wmoov.com/poster/1234.jpg",
+        "https://www.youtube.com/embed/abc",
+    )
+
+
+@pytest.mark.parametrize("backend", BACKEND_NAMES)
+def test_listing_matches_reference(backend):
+    assert listing_movies(backend) == listing_movies(REFERENCE)
+
+
+@pytest.mark.parametrize("backend", BACKEND_NAMES)
+def test_detail_table_matches_reference(backend):
+    assert detail_showtimes(backend) == detail_showtimes(REFERENCE)
+
+
+@pytest.mark.parametrize("backend", BACKEND_NAMES)
+def test_cinema_table_matches_reference(backend):
+    assert cinema_showtimes(backend) == cinema_showtimes(REFERENCE)
+
+
+@pytest.mark.parametrize("backend", BACKEND_NAMES)
+def test_metadata_matches_reference(backend):
+    assert parse_metadata(DETAIL_PAGE, backend=backend) == parse_metadata(DETAIL_PAGE, backend=REFERENCE)
+
+
+def test_parse_pool_matches_inline_parsing():
+    async def parse_in_workers():
+        pool = ParsePool(workers=1, backend=REFERENCE)
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        try:
+            result = await pool.parse("metadata", DETAIL_PAGE)
+        finally:
+            ticker = asyncio.ensure_future(tick())
+            await pool.close()
+            ticker.cancel()
+        # The event loop kept running while the workers shut down
+        return result, ticks, pool
+
+    result, ticks, pool = asyncio.run(parse_in_workers())
+    assert result == parse_metadata(DETAIL_PAGE, backend=REFERENCE)
+    assert ticks > 0
+    assert pool._executor is None
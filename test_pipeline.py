@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for the staged pipeline: backpressure, draining and failure accounting
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wmoov_scraper.pipeline import Pipeline, Stage
+
+
+def test_full_queue_holds_back_the_source():
+    async def scenario():
+        release = asyncio.Event()
+        handled = []
+
+        async def slow(item):
+            await release.wait()
+            handled.append(item)
+
+        stage = Stage("slow", slow, workers=1, maxsize=1)
+        submitted = []
+
+        async def source():
+            for item in range(5):
+                await stage.put(item)
+                submitted.append(item)
+
+        run = asyncio.ensure_future(Pipeline(stage).run(source))
+        for _ in range(10):
+            await asyncio.sleep(0)
+        # One item with the worker and one waiting in the queue; the third put blocks
+        blocked_at = list(submitted)
+        release.set()
+        await run
+        return blocked_at, handled, stage
+
+    blocked_at, handled, stage = asyncio.run(scenario())
+    assert blocked_at == [0, 1]
+    assert handled == [0, 1, 2, 3, 4]
+    assert stage.max_depth == 1
+
+
+def test_run_returns_after_every_stage_drains():
+    async def scenario():
+        parsed, stored = [], []
+
+        async def parse(item):
+            await asyncio.sleep(0.001)
+            parsed.append(item)
+            await store_stage.put(item * 10)
+
+        async def store(item):
+            await asyncio.sleep(0.002)
+            stored.append(item)
+
+        parse_stage = Stage("parse", parse, workers=3, maxsize=2)
+        store_stage = Stage("store", store, workers=2, maxsize=2)
+        pipeline = Pipeline(parse_stage, store_stage)
+
+        async def source():
+            for item in range(20):
+                await parse_stage.put(item)
+
+        await pipeline.run(source)
+        return parsed, stored, pipeline
+
+    parsed, stored, pipeline = asyncio.run(scenario())
+    assert sorted(parsed) == list(range(20))
+    assert sorted(stored) == [item * 10 for item in range(20)]
+    snapshot = pipeline.snapshot()
+    assert snapshot["parse"]["processed"] == 20 and snapshot["store"]["processed"] == 20
+    assert snapshot["store"]["workers"] == 2
+    assert 0 < snapshot["store"]["utilization"] <= 1
+
+
+def test_failed_items_are_counted_and_the_stage_keeps_going():
+    async def scenario():
+        handled = []
+
+        async def picky(item):
+            if item % 3 == 0:
+                raise ValueError(f"bad item {item}")
+            handled.append(item)
+
+        stage = Stage("picky", picky, workers=2)
+
+        async def source():
+            for item in range(9):
+                await stage.put(item)
+
+        await Pipeline(stage).run(source)
+        return handled, stage
+
+    handled, stage = asyncio.run(scenario())
+    assert sorted(handled) == [1, 2, 4, 5, 7, 8]
+    assert stage.failed == 3
+    assert stage.processed == 9
+
+
+def test_failing_source_stops_the_workers():
+    async def scenario():
+        stage = Stage("idle", lambda item: asyncio.sleep(0), workers=2)
+
+        async def source():
+            await stage.put(1)
+            raise RuntimeError("Listing failed")
+
+        before = len(asyncio.all_tasks())
+        with pytest.raises(RuntimeError):
+            await Pipeline(stage).run(source)
+        return before, len(asyncio.all_tasks())
+
+    before, after = asyncio.run(scenario())
+    assert after == before
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for detail page ordering: run history, scores and custom priorities
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wmoov_scraper.date_utils import HK_TIMEZONE
+from wmoov_scraper.models import Movie, Showtime
+from wmoov_scraper.priority import (
+    PriorityContext, RunHistory, default_priority, listing_priority, load_priority, prioritize,
+)
+
+NOW = HK_TIMEZONE.localize(datetime(2025, 8, 30, 12, 0))
+
+
+def movie(movie_id, popularity=0, rating=None, showtimes=()):
+    return Movie(f"Movie {movie_id}", rating, [], None, [], popularity, list(showtimes), movie_id=movie_id)
+
+
+def show(starts_at):
+    return Showtime("百老匯 MOViE MOViE", "1號院", starts_at.strftime("%H:%M"),
+                    starts_at.strftime("%Y-%m-%d"), "45", 100.0)
+
+
+def reverse_id(movie, context):
+    """Custom priority used through load_priority"""
+    return -int(movie.movie_id)
+
+
+@pytest.fixture
+def history(tmp_path):
+    return RunHistory(str(tmp_path / "history.json"))
+
+
+def context(history, max_popularity=100):
+    return PriorityContext(now=NOW, history=history, max_popularity=max_popularity)
+
+
+def test_history_round_trip(tmp_path, history):
+    history.record([movie("1", showtimes=[show(NOW + timedelta(hours=h)) for h in (5, 2)]), movie("2")])
+    history.save()
+
+    reloaded = RunHistory(history.history_path)
+    assert reloaded.seen("1") and reloaded.seen("2") and not reloaded.seen("3")
+    assert reloaded.next_show("1", NOW) == NOW + timedelta(hours=2)
+    assert reloaded.next_show("1", NOW + timedelta(hours=3)) == NOW + timedelta(hours=5)
+    assert reloaded.next_show("1", NOW + timedelta(hours=6)) is None
+    assert reloaded.next_show("2", NOW) is None
+
+
+def test_unreadable_history_starts_empty(tmp_path):
+    path = tmp_path / "history.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert RunHistory(str(path)).entries == {}
+
+
+def test_default_priority_terms(history):
+    history.record([movie("old")])
+    scores = {
+        name: default_priority(candidate, context(history))
+        for name, candidate in {
+            "popular": movie("a", popularity=100),
+            "rated": movie("b", rating=10.0),
+            "unseen": movie("c"),
+            "seen": movie("old"),
+        }.items()
+    }
+    # Each term adds its weight on top of the neutral "soon" score of 0.1
+    assert scores["seen"] == pytest.approx(0.1)
+    assert scores["unseen"] == pytest.approx(0.3)
+    assert scores["popular"] == pytest.approx(0.7)
+    assert scores["rated"] == pytest.approx(0.5)
+
+
+def test_sooner_shows_score_higher(history):
+    history.record([movie("soon", showtimes=[show(NOW + timedelta(hours=1))]),
+                    movie("later", showtimes=[show(NOW + timedelta(days=6))])])
+    soon = default_priority(movie("soon"), context(history))
+    later = default_priority(movie("later"), context(history))
+    assert soon > later
+
+
+def test_zero_popularity_listing(history):
+    assert default_priority(movie("a"), context(history, max_popularity=0)) == pytest.approx(0.3)
+
+
+def test_prioritize_orders_highest_first_and_keeps_ties_stable(history):
+    movies = [movie("1", popularity=10), movie("2", popularity=90), movie("3", popularity=10)]
+    ordered = prioritize(movies, default_priority, history, now=NOW)
+    assert [m.movie_id for m in ordered] == ["2", "1", "3"]
+    assert [m.movie_id for m in prioritize(movies, listing_priority, history, now=NOW)] == ["1", "2", "3"]
+
+
+def test_failing_priority_scores_zero(history):
+    def flaky(candidate, context):
+        if candidate.movie_id == "2":
+            raise KeyError("rating")
+        return 1.0
+
+    ordered = prioritize([movie("1"), movie("2"), movie("3")], flaky, history, now=NOW)
+    assert [m.movie_id for m in ordered] == ["1", "3", "2"]
+
+
+def test_load_priority():
+    assert load_priority(None) is default_priority
+    assert load_priority("default") is default_priority
+    assert load_priority("listing") is listing_priority
+    assert load_priority("test_priority:reverse_id") is reverse_id
+
+
+@pytest.mark.parametrize("spec, error", [
+    ("nonsense", ValueError),
+    ("test_priority:missing", ValueError),
+    ("test_priority:NOW", ValueError),
+    ("no_such_module_anywhere:score", ImportError),
+])
+def test_load_priority_rejects_bad_specs(spec, error):
+    with pytest.raises(error):
+        load_priority(spec)
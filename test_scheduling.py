@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for the run deadline and retry backoff
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wmoov_scraper.scheduling import RunDeadline, backoff_delay
+
+
+def deadline_with(remaining, movie_timeout=60.0, total=600.0):
+    """A deadline that has `remaining` seconds left"""
+    deadline = RunDeadline(total, movie_timeout)
+    deadline.started = time.monotonic() - (total - remaining)
+    return deadline
+
+
+def test_no_deadline_gives_the_movie_timeout():
+    deadline = RunDeadline(None, movie_timeout=45.0)
+    assert deadline.remaining() == float('inf')
+    assert not deadline.expired()
+    assert deadline.movie_budget(pending=100, parallelism=1) == 45.0
+
+
+def test_budget_is_capped_by_the_movie_timeout():
+    assert deadline_with(500.0).movie_budget(pending=2, parallelism=2) == 60.0
+
+
+def test_budget_is_shared_between_rounds_of_pending_movies():
+    budget = deadline_with(100.0).movie_budget(pending=20, parallelism=2)
+    assert 9.0 < budget <= 10.0
+
+
+def test_budget_near_expiry_keeps_a_minimum_slice():
+    # Ten rounds over 20s would be 2s each, too short to load a page
+    budget = deadline_with(20.0).movie_budget(pending=20, parallelism=2)
+    assert 4.9 < budget <= 5.0
+
+
+def test_budget_never_exceeds_what_is_left():
+    budget = deadline_with(3.0).movie_budget(pending=50, parallelism=1)
+    assert 2.9 < budget <= 3.0
+
+
+def test_expired_deadline_gives_no_budget():
+    deadline = deadline_with(-1.0)
+    assert deadline.expired()
+    assert deadline.movie_budget(pending=1, parallelism=8) == 0.0
+
+
+def test_backoff_grows_and_is_capped():
+    for attempt in range(8):
+        delays = [backoff_delay(attempt) for _ in range(50)]
+        assert all(0 <= delay <= min(10.0, 2 ** attempt) for delay in delays)
+    assert max(backoff_delay(6) for _ in range(200)) > 1.0
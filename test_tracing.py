@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for tail-based tracing: which pages keep a trace and the disk quota
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wmoov_scraper.tracing import TraceSampler
+
+
+class FakeTracing:
+    def __init__(self):
+        self.saved_to = None
+
+    async def start(self, **options):
+        pass
+
+    async def stop(self, path=None):
+        if path:
+            self.saved_to = path
+            with open(path, "wb") as f:
+                f.write(b"x" * 1024)
+
+
+class FakeContext:
+    def __init__(self):
+        self.tracing = FakeTracing()
+        self.closed = False
+
+    async def new_page(self):
+        return object()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+
+    async def new_context(self):
+        self.contexts.append(FakeContext())
+        return self.contexts[-1]
+
+
+def visit(sampler, browser, flag=False, fail=False):
+    async def scenario():
+        async with sampler.page(browser, "detail https://wmoov.com/movie/details/1") as page:
+            if flag:
+                sampler.flag(page)
+            if fail:
+                raise RuntimeError("Selector never appeared")
+    asyncio.run(scenario())
+
+
+def test_only_outliers_keep_their_trace(tmp_path):
+    sampler = TraceSampler(str(tmp_path), slow_threshold=60.0)
+    browser = FakeBrowser()
+    visit(sampler, browser)
+    visit(sampler, browser, flag=True)
+    with pytest.raises(RuntimeError):
+        visit(sampler, browser, fail=True)
+
+    assert (sampler.saved, sampler.discarded) == (2, 1)
+    assert [context.tracing.saved_to is not None for context in browser.contexts] == [False, True, True]
+    assert all(context.closed for context in browser.contexts)
+    assert sorted(name.split("_")[1] for name in os.listdir(tmp_path)) == ["failed", "failed"]
+
+
+def write_trace(directory, name, size, mtime):
+    path = directory / name
+    path.write_bytes(b"x" * size)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_quota_removes_the_oldest_traces(tmp_path):
+    sampler = TraceSampler(str(tmp_path), quota_mb=2 / 1024)
+    for age, name in enumerate(["new.zip", "middle.zip", "old.zip"]):
+        write_trace(tmp_path, name, 1024, 1_000_000 - age)
+    sampler._enforce_quota()
+    assert sorted(os.listdir(tmp_path)) == ["middle.zip", "new.zip"]
+
+
+def test_quota_keeps_the_newest_trace_even_when_it_is_too_large(tmp_path):
+    sampler = TraceSampler(str(tmp_path), quota_mb=1 / 1024)
+    write_trace(tmp_path, "old.zip", 512, 1_000_000)
+    write_trace(tmp_path, "huge.zip", 4096, 1_000_100)
+    sampler._enforce_quota()
+    assert os.listdir(tmp_path) == ["huge.zip"]
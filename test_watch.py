@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests for seat watching: seat counts, poll intervals and change detection
+"""
+
+import asyncio
+import os
+import sys
+from datetime import timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from wmoov_scraper.date_utils import get_current_datetime
+from wmoov_scraper.models import Movie, Showtime, STATUS_COMPLETE, STATUS_FAILED
+from wmoov_scraper.parsing import parse_seats
+from wmoov_scraper.watch import PollPolicy, SeatWatcher, parse_seat_count
+
+
+def show_at(starts_at, seats="100", hall="1號院"):
+    return Showtime("百老匯 MOViE MOViE", hall, starts_at.strftime("%H:%M"),
+                    starts_at.strftime("%Y-%m-%d"), seats, 100.0)
+
+
+@pytest.fixture
+def now():
+    # Whole minutes, as showtimes carry no seconds
+    return get_current_datetime().replace(second=0, microsecond=0)
+
+
+def test_seat_cells_keep_the_count():
+    assert parse_seats("尚餘 45 個座位") == "45"
+    assert parse_seats("12 剩餘") == "12"
+    assert parse_seats("已滿") == "已滿"
+    assert parse_seats("  ") == "未知"
+
+
+def test_parse_seat_count():
+    assert parse_seat_count(parse_seats("尚餘 45 個座位")) == 45
+    assert parse_seat_count("0") == 0
+    assert parse_seat_count("已滿") == 0
+    assert parse_seat_count("Sold out") == 0
+    assert parse_seat_count("未知") is None
+    assert parse_seat_count("") is None
+
+
+def test_started_show_is_not_polled(now):
+    assert PollPolicy().showtime_interval(show_at(now - timedelta(minutes=5)), now) is None
+
+
+def test_distant_and_sold_out_shows_back_off(now):
+    policy = PollPolicy(max_interval=3600.0, horizon=timedelta(hours=6))
+    assert policy.showtime_interval(show_at(now + timedelta(hours=8)), now) == 3600.0
+    assert policy.showtime_interval(show_at(now + timedelta(hours=1), seats="已滿"), now) == 3600.0
+
+
+def test_interval_tightens_as_the_show_approaches(now):
+    policy = PollPolicy(min_interval=60.0, base_interval=600.0)
+    assert policy.showtime_interval(show_at(now + timedelta(hours=3)), now) == 600.0
+    assert policy.showtime_interval(show_at(now + timedelta(minutes=30)), now) == 300.0
+    assert policy.showtime_interval(show_at(now + timedelta(minutes=3)), now) == 60.0
+
+
+def test_scarce_seats_halve_the_interval(now):
+    policy = PollPolicy(min_interval=60.0, base_interval=600.0, scarce_seats=20)
+    starts_at = now + timedelta(hours=3)
+    assert policy.showtime_interval(show_at(starts_at, seats=parse_seats("尚餘 45 個座位")), now) == 600.0
+    assert policy.showtime_interval(show_at(starts_at, seats=parse_seats("尚餘 8 個座位")), now) == 300.0
+
+
+def test_movie_interval_is_the_shortest_over_its_shows(now):
+    movie = Movie("A", None, [], None, [], 0, [
+        show_at(now - timedelta(hours=1)),
+        show_at(now + timedelta(hours=3)),
+        show_at(now + timedelta(hours=3), seats="5", hall="2號院"),
+    ])
+    assert PollPolicy().movie_interval(movie, now) == 300.0
+    assert PollPolicy().movie_interval(Movie("B", None, [], None, [], 0, []), now) is None
+
+
+class FakeScraper:
+    def __init__(self, results):
+        self.results = list(results)
+
+    async def refresh_showtimes(self, movie, dates):
+        showtimes, status = self.results.pop(0)
+        movie.scrape_status = status
+        return showtimes
+
+
+def poll(watcher, movie):
+    changes = []
+    watcher.on_change = lambda movie, found: changes.extend(found)
+    asyncio.run(watcher.poll(movie))
+    return changes
+
+
+def test_watcher_reports_seat_changes_and_new_shows(now):
+    kept = show_at(now + timedelta(hours=2), seats="40")
+    changed = show_at(now + timedelta(hours=3), seats="40", hall="2號院")
+    movie = Movie("A", None, [], None, [], 0, [kept, changed], movie_id="1")
+
+    refreshed_change = show_at(now + timedelta(hours=3), seats="12", hall="2號院")
+    added = show_at(now + timedelta(hours=4))
+    watcher = SeatWatcher(FakeScraper([([kept, refreshed_change, added], STATUS_COMPLETE)]))
+    changes = poll(watcher, movie)
+
+    assert changes == [(refreshed_change, changed), (added, None)]
+    assert movie.showtimes == [kept, refreshed_change, added]
+    assert "1" in watcher.next_poll
+
+
+def test_failed_poll_keeps_the_known_showtimes(now):
+    known = show_at(now + timedelta(hours=2), seats="40")
+    movie = Movie("A", None, [], None, [], 0, [known], movie_id="1")
+    watcher = SeatWatcher(FakeScraper([([], STATUS_FAILED)]))
+    assert poll(watcher, movie) == []
+    assert movie.showtimes == [known]
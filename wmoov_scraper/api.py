@@ -0,0 +1,281 @@
+import gzip
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .models import Movie
+
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 512
+FILTERED_CACHE_SIZE = 256
+
+
+class Response:
+    """
+    Serialized JSON body with its gzip form and ETags, built once
+    The two encodings are different representations, so each has its own
+    strong ETag.
+    """
+
+    def __init__(self, payload: Any):
+        self.body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.gzipped = gzip.compress(self.body) if len(self.body) >= GZIP_MIN_BYTES else None
+        digest = hashlib.sha1(self.body).hexdigest()[:20]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+
+    def negotiate(self, accept_encoding: str) -> Tuple[bytes, str, Optional[str]]:
+        """(body, ETag, Content-Encoding) for a request's Accept-Encoding header"""
+        if self.gzipped is not None and accepts_gzip(accept_encoding):
+            return self.gzipped, self.gzip_etag, "gzip"
+        return self.body, self.etag, None
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q=0"""
+    qualities = {}
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.partition(";")
+        name, _, value = params.partition("=")
+        try:
+            quality = float(value) if name.strip().lower() == "q" else 1.0
+        except ValueError:
+            quality = 1.0
+        qualities[coding.strip().lower()] = quality
+    # An explicit gzip entry wins over the wildcard
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header names this ETag, weakly compared as the RFC asks"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+class Published:
+    """Immutable view of one scrape result"""
+
+    def __init__(self, movies: List[Movie], version: int):
+        self.movies = movies
+        self.version = version
+        self.published_at = datetime.now().isoformat()
+        self.by_id = {movie.movie_id: movie for movie in movies}
+        self.movies_response = Response(self.payload("movies", movies))
+        self.showtimes_response = Response(self.payload("showtimes", movies))
+
+    def payload(self, kind: str, movies: List[Movie]) -> Dict[str, Any]:
+        """JSON payload for the movies or showtimes endpoint"""
+        if kind == "movies":
+            items = [movie.to_dict() for movie in movies]
+        else:
+            items = [
+                {"movie_id": movie.movie_id, "title": movie.title, **showtime.to_dict()}
+                for movie in movies
+                for showtime in movie.showtimes
+            ]
+        return {"version": self.version, "published_at": self.published_at, kind: items}
+
+
+class ApiState:
+    """
+    Latest scrape result plus coalesced refreshes
+    Readers only ever see a fully built Published object; a refresh swaps it in
+    atomically. Concurrent refresh requests join the scrape already in flight.
+    """
+
+    def __init__(self, scrape: Callable[[], List[Movie]], on_refresh: Optional[Callable[[List[Movie]], None]] = None):
+        self.scrape = scrape
+        self.on_refresh = on_refresh
+        self.current: Optional[Published] = None
+        self.version = 0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._filtered: "OrderedDict[Tuple, Response]" = OrderedDict()
+
+    def publish(self, movies: List[Movie]):
+        with self._lock:
+            self.version += 1
+            version = self.version
+        # Serialize outside the lock so readers are never blocked by it
+        published = Published(movies, version)
+        with self._lock:
+            self.current = published
+            self._filtered.clear()
+        logger.info(f"Published version {version} with {len(movies)} movies")
+
+    @property
+    def refreshing(self) -> bool:
+        thread = self._refresh_thread
+        return thread is not None and thread.is_alive()
+
+    def request_refresh(self) -> bool:
+        """Start a background scrape; returns False when joining one already running"""
+        with self._lock:
+            if self.refreshing:
+                return False
+            self._refresh_thread = threading.Thread(target=self._run_refresh, name="wmoov-refresh", daemon=True)
+            self._refresh_thread.start()
+            return True
+
+    def _run_refresh(self):
+        try:
+            movies = self.scrape()
+            self.publish(movies)
+            self.last_error = None
+            if self.on_refresh:
+                self.on_refresh(movies)
+        except Exception as e:
+            logger.error(f"Background refresh failed: {e}")
+            self.last_error = str(e)
+
+    def filtered(self, kind: str, query: Dict[str, List[str]]) -> Optional[Response]:
+        """Response for a filtered query, cached per published version"""
+        published = self.current
+        if published is None:
+            return None
+        if not query:
+            return published.movies_response if kind == "movies" else published.showtimes_response
+
+        key = (published.version, kind, tuple(sorted((k, tuple(v)) for k, v in query.items())))
+        with self._lock:
+            cached = self._filtered.get(key)
+            if cached is not None:
+                self._filtered.move_to_end(key)
+                return cached
+
+        response = Response(published.payload(kind, filter_movies(published.movies, query)))
+        with self._lock:
+            if published.version == self.version:
+                self._filtered[key] = response
+                while len(self._filtered) > FILTERED_CACHE_SIZE:
+                    self._filtered.popitem(last=False)
+        return response
+
+
+def filter_movies(movies: List[Movie], query: Dict[str, List[str]]) -> List[Movie]:
+    """Apply title/genre/min_rating/cinema/date query filters"""
+    def first(name: str) -> Optional[str]:
+        values = query.get(name)
+        return values[0] if values else None
+
+    title = first("title")
+    genre = first("genre")
+    cinema = first("cinema")
+    show_date = first("date")
+    try:
+        min_rating = float(first("min_rating")) if first("min_rating") else None
+    except ValueError:
+        min_rating = None
+
+    result = []
+    for movie in movies:
+        if title and title.lower() not in movie.title.lower():
+            continue
+        if genre and genre not in movie.genres:
+            continue
+        if min_rating is not None and (movie.rating is None or movie.rating < min_rating):
+            continue
+        showtimes = [
+            s for s in movie.showtimes
+            if (not cinema or cinema in s.cinema) and (not show_date or s.date == show_date)
+        ]
+        if (cinema or show_date) and not showtimes:
+            continue
+        if cinema or show_date:
+            movie = Movie.from_dict({**movie.to_dict(), "showtimes": [s.to_dict() for s in showtimes]})
+        result.append(movie)
+    return result
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """Read-only JSON endpoints over the shared ApiState"""
+    state: ApiState = None  # set by serve()
+    server_version = "wmoov-scraper"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        parts = [p for p in url.path.split("/") if p]
+
+        if parts == ["health"]:
+            published = self.state.current
+            self._send(Response({
+                "version": published.version if published else 0,
+                "published_at": published.published_at if published else None,
+                "refreshing": self.state.refreshing,
+                "last_error": self.state.last_error,
+            }))
+        elif parts in (["movies"], ["showtimes"]):
+            response = self.state.filtered(parts[0], query)
+            if response is None:
+                self._send_error(503, "No scrape result yet")
+            else:
+                self._send(response)
+        elif len(parts) == 2 and parts[0] == "movies":
+            published = self.state.current
+            movie = published.by_id.get(parts[1]) if published else None
+            if movie is None:
+                self._send_error(404, "Unknown movie")
+            else:
+                self._send(Response(movie.to_dict()))
+        else:
+            self._send_error(404, "Not found")
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != "/refresh":
+            self._send_error(404, "Not found")
+            return
+        started = self.state.request_refresh()
+        self._send(Response({"started": started, "coalesced": not started}), status=202)
+
+    def _send(self, response: Response, status: int = 200):
+        body, etag, encoding = response.negotiate(self.headers.get("Accept-Encoding", ""))
+        if status == 200 and etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, message: str):
+        self._send(Response({"error": message}), status=status)
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+def make_server(state: ApiState, host: str = "127.0.0.1", port: int = 8080) -> ThreadingHTTPServer:
+    """HTTP server bound to the state; port 0 picks a free port"""
+    handler = type("BoundApiHandler", (ApiHandler,), {"state": state})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def serve(state: ApiState, host: str = "127.0.0.1", port: int = 8080):
+    """Serve the API until interrupted"""
+    server = make_server(state, host, port)
+    logger.info(f"Serving WMOOV API on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import zlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install wmoov-weekend-scraper[archive]
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Pages stored before a shared dictionary is trained, and how many samples it uses
+TRAIN_AFTER = 32
+TRAIN_SAMPLES = 256
+ZSTD_DICT_SIZE = 112 * 1024
+ZSTD_LEVEL = 9
+# zlib can only look back 32 KiB, so a longer preset dictionary is wasted
+ZLIB_DICT_SIZE = 32 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dictionaries (
+    id INTEGER PRIMARY KEY,
+    codec TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    sha256 TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    dictionary_id INTEGER REFERENCES dictionaries(id),
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fetches (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    sha256 TEXT NOT NULL REFERENCES blobs(sha256),
+    meta TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS fetches_by_url ON fetches (url, fetched_at);
+CREATE INDEX IF NOT EXISTS fetches_by_run ON fetches (run_id, kind);
+"""
+
+
+@dataclass
+class ArchivedPage:
+    """One archived fetch with its decompressed HTML"""
+    run_id: str
+    url: str
+    kind: str
+    fetched_at: str
+    meta: Dict[str, Any]
+    html: str
+
+
+class PageArchive:
+    """
+    Content-addressed store of raw fetched pages
+    Pages are keyed by SHA-256, so refetching an unchanged page only adds an
+    index row. New content is compressed with a dictionary trained on earlier
+    pages (zstd when installed, otherwise a zlib preset dictionary), which
+    captures the boilerplate that consecutive fetches share. The index lives
+    in SQLite next to the blobs.
+    """
+
+    def __init__(self, directory: str, run_id: Optional[str] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.run_id = run_id or datetime.now().strftime('%Y%m%d-%H%M%S')
+        self.codec = "zstd" if zstandard else "zlib"
+        self.stored = 0
+        self.deduplicated = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+        # Writes come from worker threads; one connection behind a lock
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(self.directory / "index.sqlite", check_same_thread=False)
+        self._db.executescript(SCHEMA)
+        self._dictionary_cache: Dict[int, bytes] = {}
+        self._dictionary = self._latest_dictionary()
+
+    def _latest_dictionary(self) -> Optional[tuple]:
+        row = self._db.execute(
+            "SELECT id, data FROM dictionaries WHERE codec = ? ORDER BY id DESC LIMIT 1", (self.codec,)
+        ).fetchone()
+        return (row[0], bytes(row[1])) if row else None
+
+    def _dictionary_data(self, dictionary_id: int) -> bytes:
+        data = self._dictionary_cache.get(dictionary_id)
+        if data is None:
+            with self._lock:
+                row = self._db.execute("SELECT data FROM dictionaries WHERE id = ?", (dictionary_id,)).fetchone()
+            data = self._dictionary_cache[dictionary_id] = bytes(row[0])
+        return data
+
+    def add(self, url: str, kind: str, html: str, meta: Optional[Dict[str, Any]] = None) -> bool:
+        """Archive one fetched page; returns False if its content was already stored"""
+        raw = html.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        with self._lock:
+            exists = self._db.execute("SELECT 1 FROM blobs WHERE sha256 = ?", (digest,)).fetchone()
+            if exists:
+                self.deduplicated += 1
+            else:
+                dictionary_id, data = self._compress(raw)
+                self._db.execute(
+                    "INSERT INTO blobs (sha256, codec, dictionary_id, size, data) VALUES (?, ?, ?, ?, ?)",
+                    (digest, self.codec, dictionary_id, len(raw), data)
+                )
+                self.stored += 1
+                self.raw_bytes += len(raw)
+                self.stored_bytes += len(data)
+            self._db.execute(
+                "INSERT INTO fetches (run_id, url, kind, fetched_at, sha256, meta) VALUES (?, ?, ?, ?, ?, ?)",
+                (self.run_id, url, kind, datetime.now().isoformat(), digest,
+                 json.dumps(meta or {}, ensure_ascii=False))
+            )
+            self._db.commit()
+            if not exists and self._dictionary is None and self.stored % TRAIN_AFTER == 0:
+                self._train()
+        return not exists
+
+    def _compress(self, raw: bytes) -> tuple:
+        dictionary_id, dictionary = self._dictionary or (None, None)
+        if self.codec == "zstd":
+            dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dict_data)
+            return dictionary_id, compressor.compress(raw)
+        compressor = zlib.compressobj(9, zdict=dictionary) if dictionary else zlib.compressobj(9)
+        return dictionary_id, compressor.compress(raw) + compressor.flush()
+
+    def _decompress(self, codec: str, dictionary_id: Optional[int], data: bytes) -> bytes:
+        dictionary = self._dictionary_data(dictionary_id) if dictionary_id is not None else None
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("This archive holds zstd pages; install zstandard to read it")
+            dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            return zstandard.ZstdDecompressor(dict_data=dict_data).decompress(data)
+        decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        return decompressor.decompress(data) + decompressor.flush()
+
+    def train_dictionary(self):
+        """Train a new shared dictionary from recently stored pages"""
+        with self._lock:
+            self._train()
+
+    def _train(self):
+        rows = self._db.execute(
+            "SELECT codec, dictionary_id, data FROM blobs ORDER BY rowid DESC LIMIT ?", (TRAIN_SAMPLES,)
+        ).fetchall()
+        samples = [self._decompress(codec, dictionary_id, bytes(data)) for codec, dictionary_id, data in rows]
+        if self.codec == "zstd":
+            try:
+                dictionary = zstandard.train_dictionary(ZSTD_DICT_SIZE, samples).as_bytes()
+            except zstandard.ZstdError as e:
+                logger.warning(f"Could not train archive dictionary: {e}")
+                return
+        else:
+            # A preset dictionary is just representative content, most useful at the end
+            dictionary = b"".join(reversed(samples))[-ZLIB_DICT_SIZE:]
+        cursor = self._db.execute(
+            "INSERT INTO dictionaries (codec, created_at, data) VALUES (?, ?, ?)",
+            (self.codec, datetime.now().isoformat(), dictionary)
+        )
+        self._db.commit()
+        self._dictionary = (cursor.lastrowid, dictionary)
+        logger.info(f"Trained {len(dictionary)} byte {self.codec} dictionary from {len(samples)} pages")
+
+    def runs(self) -> List[str]:
+        """Archived run IDs, oldest first"""
+        with self._lock:
+            rows = self._db.execute("SELECT DISTINCT run_id FROM fetches ORDER BY run_id").fetchall()
+        return [row[0] for row in rows]
+
+    def pages(self, run_id: Optional[str] = None, kind: Optional[str] = None,
+              url: Optional[str] = None, since: Optional[str] = None) -> Iterator[ArchivedPage]:
+        """Archived fetches in fetch order, filtered by run, kind, URL or start time"""
+        clauses, params = [], []
+        for column, value in (("run_id", run_id), ("kind", kind), ("url", url)):
+            if value is not None:
+                clauses.append(f"f.{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("f.fetched_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT f.run_id, f.url, f.kind, f.fetched_at, f.meta, b.codec, b.dictionary_id, b.data "
+                f"FROM fetches f JOIN blobs b ON b.sha256 = f.sha256 {where} ORDER BY f.id",
+                params
+            ).fetchall()
+        for run, page_url, page_kind, fetched_at, meta, codec, dictionary_id, data in rows:
+            html = self._decompress(codec, dictionary_id, bytes(data)).decode("utf-8")
+            yield ArchivedPage(run, page_url, page_kind, fetched_at, json.loads(meta), html)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "codec": self.codec,
+            "stored": self.stored,
+            "deduplicated": self.deduplicated,
+            "ratio": round(self.raw_bytes / self.stored_bytes, 1) if self.stored_bytes else None,
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,216 @@
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .governor import RateGovernor
+from .models import Movie
+from .paths import load_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/webp": ".webp",
+    "image/gif": ".gif",
+}
+
+
+def make_thumbnail(source: str, target: str, size: int):
+    """Write a JPEG thumbnail no larger than size x size (runs in a worker process)"""
+    from PIL import Image
+
+    with Image.open(source) as image:
+        image.thumbnail((size, size))
+        tmp_path = f"{target}.tmp"
+        image.convert("RGB").save(tmp_path, "JPEG", quality=85)
+    os.replace(tmp_path, target)
+
+
+class AssetStore:
+    """
+    Content-addressed image store
+    Files live under objects/ named by SHA-256, so the same image used by
+    several movies or fetched in several runs is stored once. index.json keeps
+    the validators (ETag, Last-Modified) per URL for conditional requests.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.objects = self.directory / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / "index.json"
+        self.manifest_path = self.directory / "manifest.json"
+        self.index: Dict[str, Dict[str, Any]] = self._load(self.index_path)
+        self.manifest: Dict[str, Dict[str, Any]] = self._load(self.manifest_path)
+
+    @staticmethod
+    def _load(path: Path) -> Dict[str, Dict[str, Any]]:
+        return load_json(path, {})
+
+    def object_path(self, digest: str, extension: str) -> Path:
+        return self.objects / digest[:2] / f"{digest}{extension}"
+
+    def put(self, body: bytes, content_type: str) -> tuple:
+        """Store an image, returning (digest, path, whether it was already stored)"""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.object_path(digest, EXTENSIONS.get(content_type.split(";")[0].strip(), ".bin"))
+        if path.exists():
+            return digest, path, True
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Two workers may store the same new image at once; each writes its own temporary file
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, path)
+        return digest, path, False
+
+    def save(self):
+        write_json_atomic(self.index_path, self.index)
+        write_json_atomic(self.manifest_path, self.manifest)
+
+
+class AssetFetcher:
+    """
+    Downloads posters over a shared Playwright request context
+    Every request goes through the same per-host governor as page loads, so
+    poster hosts get the same rate limit and AIMD backoff. The pipeline's
+    asset stage bounds how many downloads are queued. Known URLs are
+    revalidated with If-None-Match / If-Modified-Since, so unchanged posters
+    cost a 304. Files are written in a worker thread, and thumbnails are
+    optional and made in worker processes.
+    """
+
+    def __init__(self, request_context, store: AssetStore, governor: RateGovernor,
+                 thumbnail_size: Optional[int] = None, thumbnail_workers: Optional[int] = None,
+                 timeout: float = 30.0):
+        self.request = request_context
+        self.store = store
+        self.governor = governor
+        self.timeout = timeout
+        self.thumbnail_size = thumbnail_size
+        if thumbnail_size and importlib.util.find_spec("PIL") is None:
+            logger.warning("Pillow is not installed; skipping thumbnails (pip install wmoov-weekend-scraper[thumbnails])")
+            self.thumbnail_size = None
+        self._thumbnail_workers = thumbnail_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.downloaded = 0
+        self.not_modified = 0
+        self.deduplicated = 0
+        self.thumbnails = 0
+        self.failed = 0
+
+    async def fetch_poster(self, movie: Movie):
+        """Bring the movie's poster (and thumbnail) up to date in the store"""
+        if not movie.poster_url:
+            return
+        try:
+            entry = await self._fetch_once(movie.poster_url)
+            thumbnail = await self._thumbnail(entry) if self.thumbnail_size else None
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"Failed to fetch poster for {movie.title}: {e!r}")
+            return
+        self.store.manifest[movie.movie_id] = {
+            "title": movie.title,
+            "poster_url": movie.poster_url,
+            "sha256": entry["sha256"],
+            "path": entry["path"],
+            "thumbnail": thumbnail,
+        }
+
+    async def _fetch_once(self, url: str) -> Dict[str, Any]:
+        """Fetch a URL, joining a download of the same URL that is already running"""
+        pending = self._in_flight.get(url)
+        if pending is None:
+            pending = self._in_flight[url] = asyncio.ensure_future(self._fetch(url))
+            pending.add_done_callback(lambda _: self._in_flight.pop(url, None))
+        return await asyncio.shield(pending)
+
+    async def _fetch(self, url: str) -> Dict[str, Any]:
+        known = self.store.index.get(url)
+        headers = {}
+        if known and (self.store.directory / known["path"]).exists():
+            if known.get("etag"):
+                headers["If-None-Match"] = known["etag"]
+            if known.get("last_modified"):
+                headers["If-Modified-Since"] = known["last_modified"]
+
+        host = self.governor.for_url(url)
+        async with host.slot():
+            await host.throttle()
+            started = time.monotonic()
+            try:
+                response = await self.request.get(url, headers=headers, timeout=self.timeout * 1000)
+                body = await response.body() if response.ok else b""
+            except Exception:
+                # Timeouts and dropped connections are both a sign to back off
+                host.record(time.monotonic() - started, timed_out=True)
+                raise
+            host.record(time.monotonic() - started, status=response.status)
+
+        if response.status == 304 and headers:
+            self.not_modified += 1
+            return known
+        if not response.ok:
+            raise RuntimeError(f"HTTP {response.status} for {url}")
+
+        digest, path, existed = await asyncio.to_thread(
+            self.store.put, body, response.headers.get("content-type", "")
+        )
+        if existed:
+            self.deduplicated += 1
+        else:
+            self.downloaded += 1
+        entry = {
+            "sha256": digest,
+            "path": str(path.relative_to(self.store.directory)),
+            "etag": response.headers.get("etag"),
+            "last_modified": response.headers.get("last-modified"),
+            "fetched_at": time.time(),
+        }
+        self.store.index[url] = entry
+        return entry
+
+    async def _thumbnail(self, entry: Dict[str, Any]) -> str:
+        relative = f"thumbnails/{self.thumbnail_size}/{entry['sha256']}.jpg"
+        target = self.store.directory / relative
+        if not target.exists():
+            await asyncio.to_thread(target.parent.mkdir, parents=True, exist_ok=True)
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._thumbnail_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor, make_thumbnail,
+                str(self.store.directory / entry["path"]), str(target), self.thumbnail_size
+            )
+            self.thumbnails += 1
+        return relative
+
+    async def close(self):
+        """Persist the index and manifest and release the client and workers"""
+        await asyncio.to_thread(self.store.save)
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            # A thumbnail still resizing holds shutdown up; wait for it off the event loop
+            await asyncio.to_thread(executor.shutdown, wait=True)
+        await self.request.dispose()
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "downloaded": self.downloaded,
+            "not_modified": self.not_modified,
+            "deduplicated": self.deduplicated,
+            "thumbnails": self.thumbnails,
+            "failed": self.failed,
+        }
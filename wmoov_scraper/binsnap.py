@@ -0,0 +1,275 @@
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from .models import Movie, Showtime
+
+MAGIC = b"WMOOVSNP"
+VERSION = 1
+NONE = 0xFFFFFFFF  # String ID standing for None
+
+# magic, version, flags, string count, movie count, showtime count, metadata string ID
+HEADER = struct.Struct("<8sHHIIII4x")
+
+# Fixed-width columns in file order; "d" is float64 (NaN for None), "I" is uint32
+MOVIE_COLUMNS = (
+    ("rating", "d"),
+    ("title", "I"),
+    ("movie_id", "I"),
+    ("url", "I"),
+    ("status", "I"),
+    ("extra", "I"),            # JSON string with the list and optional fields
+    ("popularity", "I"),
+    ("showtime_start", "I"),
+    ("showtime_count", "I"),
+)
+SHOWTIME_COLUMNS = (
+    ("price", "d"),
+    ("movie", "I"),            # Row index into the movie columns
+    ("cinema", "I"),
+    ("hall", "I"),
+    ("time", "I"),
+    ("date", "I"),
+    ("seats", "I"),
+    ("booking_url", "I"),
+)
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class _StringTable:
+    """Interns strings so each distinct title, cinema or hall is stored once"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.encoded: List[bytes] = []
+
+    def intern(self, text: Optional[str]) -> int:
+        if text is None:
+            return NONE
+        string_id = self.ids.get(text)
+        if string_id is None:
+            string_id = self.ids[text] = len(self.encoded)
+            self.encoded.append(text.encode("utf-8"))
+        return string_id
+
+
+def save_binary_snapshot(movies: List[Movie], path: str, dates: Optional[List[str]] = None):
+    """
+    Write a scrape result in the columnar binary format
+    Layout (little-endian, every section 8-byte aligned): header, string
+    offsets, UTF-8 string blob, movie columns, showtime columns.
+    """
+    strings = _StringTable()
+    meta = strings.intern(json.dumps({"scraped_at": datetime.now().isoformat(), "dates": dates or []}))
+    movie_columns = {name: array(code) for name, code in MOVIE_COLUMNS}
+    showtime_columns = {name: array(code) for name, code in SHOWTIME_COLUMNS}
+
+    for index, movie in enumerate(movies):
+        extra = {
+            "genres": movie.genres,
+            "director": movie.director,
+            "cast": movie.cast,
+            "poster_url": movie.poster_url,
+            "trailer_url": movie.trailer_url,
+            "variant_urls": movie.variant_urls,
+        }
+        movie_columns["rating"].append(math.nan if movie.rating is None else movie.rating)
+        movie_columns["title"].append(strings.intern(movie.title))
+        movie_columns["movie_id"].append(strings.intern(movie.movie_id))
+        movie_columns["url"].append(strings.intern(movie.url))
+        movie_columns["status"].append(strings.intern(movie.scrape_status))
+        movie_columns["extra"].append(strings.intern(json.dumps(extra, ensure_ascii=False, separators=(",", ":"))))
+        movie_columns["popularity"].append(movie.popularity)
+        movie_columns["showtime_start"].append(len(showtime_columns["movie"]))
+        movie_columns["showtime_count"].append(len(movie.showtimes))
+
+        for showtime in movie.showtimes:
+            showtime_columns["price"].append(showtime.price)
+            showtime_columns["movie"].append(index)
+            showtime_columns["cinema"].append(strings.intern(showtime.cinema))
+            showtime_columns["hall"].append(strings.intern(showtime.hall))
+            showtime_columns["time"].append(strings.intern(showtime.time))
+            showtime_columns["date"].append(strings.intern(showtime.date))
+            showtime_columns["seats"].append(strings.intern(showtime.available_seats))
+            showtime_columns["booking_url"].append(strings.intern(showtime.booking_url))
+
+    offsets = array("I", [0])
+    for encoded in strings.encoded:
+        offsets.append(offsets[-1] + len(encoded))
+
+    sections = [offsets, b"".join(strings.encoded), *movie_columns.values(), *showtime_columns.values()]
+
+    target = Path(path)
+    if target.parent != Path(""):
+        target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target.with_name(target.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(strings.encoded), len(movies),
+                            len(showtime_columns["movie"]), meta))
+        for section in sections:
+            if isinstance(section, array):
+                if sys.byteorder != "little":
+                    section.byteswap()
+                section = section.tobytes()
+            f.write(section)
+            f.write(b"\0" * (_align(f.tell()) - f.tell()))
+    os.replace(tmp_path, target)
+
+
+class BinarySnapshot:
+    """
+    Memory-mapped view of a binary snapshot
+    Columns are zero-copy memoryviews over the mapped file and strings are
+    decoded on first use, so opening a snapshot costs a header read. Movies and
+    showtimes are only materialized when asked for.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is empty, not a binary snapshot")
+        self._view = memoryview(self._map)
+        self._views: List[memoryview] = []
+        self._strings: Dict[int, str] = {}
+        self._string_ids: Optional[Dict[str, int]] = None
+
+        try:
+            self._read_layout()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_layout(self):
+        if len(self._view) < HEADER.size:
+            raise ValueError(f"{self.path} is truncated")
+        magic, version, _, string_count, movie_count, showtime_count, meta = HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a binary snapshot")
+        if version != VERSION:
+            raise ValueError(f"{self.path} has unsupported snapshot version {version}")
+        self.movie_count = movie_count
+        self.showtime_count = showtime_count
+        self._meta_id = meta
+
+        position = HEADER.size
+        self._offsets, position = self._column(position, "I", string_count + 1)
+        self._blob_start = position
+        position = _align(position + self._offsets[-1])
+        self.movie_columns: Dict[str, Any] = {}
+        for name, code in MOVIE_COLUMNS:
+            self.movie_columns[name], position = self._column(position, code, movie_count)
+        self.showtime_columns: Dict[str, Any] = {}
+        for name, code in SHOWTIME_COLUMNS:
+            self.showtime_columns[name], position = self._column(position, code, showtime_count)
+
+    def _column(self, position: int, code: str, count: int):
+        """A typed view of `count` items at `position`, and the next aligned position"""
+        size = struct.calcsize(code) * count
+        if position + size > len(self._view):
+            raise ValueError(f"{self.path} is truncated")
+        raw = self._view[position:position + size]
+        if sys.byteorder == "little":
+            column = raw.cast(code)
+            self._views.extend((raw, column))
+        else:
+            # Big-endian hosts pay for a copy
+            column = array(code, raw.tobytes())
+            column.byteswap()
+            raw.release()
+        return column, _align(position + size)
+
+    def string(self, string_id: int) -> Optional[str]:
+        """Decode one entry of the string table"""
+        if string_id == NONE:
+            return None
+        text = self._strings.get(string_id)
+        if text is None:
+            start = self._blob_start + self._offsets[string_id]
+            end = self._blob_start + self._offsets[string_id + 1]
+            text = self._strings[string_id] = self._map[start:end].decode("utf-8")
+        return text
+
+    def string_id(self, text: str) -> Optional[int]:
+        """ID of a string for comparing against columns, or None if absent"""
+        if self._string_ids is None:
+            self._string_ids = {self.string(i): i for i in range(len(self._offsets) - 1)}
+        return self._string_ids.get(text)
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """scraped_at and dates recorded when the snapshot was written"""
+        return json.loads(self.string(self._meta_id))
+
+    def showtime(self, row: int) -> Showtime:
+        columns = self.showtime_columns
+        return Showtime(
+            cinema=self.string(columns["cinema"][row]),
+            hall=self.string(columns["hall"][row]),
+            time=self.string(columns["time"][row]),
+            date=self.string(columns["date"][row]),
+            available_seats=self.string(columns["seats"][row]),
+            price=columns["price"][row],
+            booking_url=self.string(columns["booking_url"][row]),
+        )
+
+    def movie(self, row: int) -> Movie:
+        columns = self.movie_columns
+        rating = columns["rating"][row]
+        extra = json.loads(self.string(columns["extra"][row]))
+        start = columns["showtime_start"][row]
+        return Movie(
+            title=self.string(columns["title"][row]),
+            rating=None if math.isnan(rating) else rating,
+            genres=extra["genres"],
+            director=extra["director"],
+            cast=extra["cast"],
+            popularity=columns["popularity"][row],
+            showtimes=[self.showtime(i) for i in range(start, start + columns["showtime_count"][row])],
+            url=self.string(columns["url"][row]),
+            poster_url=extra["poster_url"],
+            trailer_url=extra["trailer_url"],
+            scrape_status=self.string(columns["status"][row]),
+            movie_id=self.string(columns["movie_id"][row]),
+            variant_urls=extra["variant_urls"],
+        )
+
+    def movies(self) -> List[Movie]:
+        return [self.movie(row) for row in range(self.movie_count)]
+
+    def iter_showtimes(self) -> Iterator[Showtime]:
+        for row in range(self.showtime_count):
+            yield self.showtime(row)
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views.clear()
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "BinarySnapshot":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def load_binary_snapshot(path: str) -> List[Movie]:
+    """Read every movie back from a binary snapshot"""
+    with BinarySnapshot(path) as snapshot:
+        return snapshot.movies()
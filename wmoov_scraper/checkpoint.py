@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+import logging
+from datetime import date
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+from .models import Movie
+from .paths import get_cache_dir, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """
+    Persists scrape progress for one date window
+    The listing is written once as JSON; every finished movie is appended to a
+    JSON-lines file and fsynced, so an interrupted run loses at most the movies
+    that were still in flight.
+    """
+
+    def __init__(self, dates: List[date], directory: Optional[str] = None):
+        root = Path(directory) if directory else get_cache_dir() / "checkpoints"
+        run_key = "_".join(d.strftime('%Y-%m-%d') for d in dates)
+        self.path = root / run_key
+        self.listing_path = self.path / "listing.json"
+        self.completed_path = self.path / "completed.jsonl"
+
+    def reset(self):
+        """Discard any previous checkpoint for this date window"""
+        if self.path.exists():
+            shutil.rmtree(self.path)
+
+    def save_listing(self, movies: List[Movie]):
+        """Write the listing atomically"""
+        write_json_atomic(self.listing_path, [m.to_dict() for m in movies], indent=None)
+
+    def record_movie(self, movie: Movie):
+        """Append a finished movie with its showtimes"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.completed_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(movie.to_dict(), ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self) -> Tuple[Optional[List[Movie]], Dict[str, Movie]]:
+        """Load the listing and finished movies keyed by movie ID"""
+        listing = None
+        completed: Dict[str, Movie] = {}
+
+        if self.listing_path.exists():
+            with open(self.listing_path, encoding="utf-8") as f:
+                listing = [Movie.from_dict(m) for m in json.load(f)]
+
+        if self.completed_path.exists():
+            with open(self.completed_path, encoding="utf-8") as f:
+                lines = f.read().split("\n")
+            # A crash mid-write leaves a torn last line; drop it so new entries start clean
+            if lines[-1]:
+                logger.warning("Dropping torn entry at the end of the checkpoint")
+                with open(self.completed_path, "w", encoding="utf-8") as f:
+                    f.write("".join(line + "\n" for line in lines[:-1]))
+            for line in lines[:-1]:
+                try:
+                    movie = Movie.from_dict(json.loads(line))
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Skipping unreadable checkpoint entry: {e}")
+                    continue
+                completed[movie.movie_id] = movie
+
+        if listing is not None:
+            logger.info(f"Resuming from checkpoint: {len(completed)}/{len(listing)} movies done")
+        return listing, completed
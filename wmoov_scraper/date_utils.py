@@ -1,11 +1,49 @@
+import re
 from datetime import datetime, date, timedelta
 from dateutil.relativedelta import relativedelta
 import pytz
 
 
+HK_TIMEZONE = pytz.timezone('Asia/Hong_Kong')
+# Monday first, matching date.weekday()
+WEEKDAY_NAMES = "一二三四五六日"
+
+
 def get_current_date():
     """Get current date in Hong Kong timezone"""
-    return datetime.now(pytz.timezone('Asia/Hong_Kong')).date()
+    return datetime.now(HK_TIMEZONE).date()
+
+
+def get_current_datetime():
+    """Get current time in Hong Kong timezone"""
+    return datetime.now(HK_TIMEZONE)
+
+
+def parse_showtime_datetime(date_str, time_str):
+    """
+    Combine a showtime's "YYYY-MM-DD" date and "HH:MM" time
+    Returns None when the time could not be normalised while scraping
+    """
+    try:
+        naive = datetime.strptime(f"{date_str} {time_str}", "%Y-%m-%d %H:%M")
+    except ValueError:
+        return None
+    return HK_TIMEZONE.localize(naive)
+
+
+def format_date_label(target_date):
+    """The site's label for a date in its date pickers, e.g. "8月30日 星期六" """
+    return f"{target_date.month}月{target_date.day}日 星期{WEEKDAY_NAMES[target_date.weekday()]}"
+
+
+def find_date_option(labels, target_date):
+    """The picker option label offering target_date, or None if it is not offered"""
+    # Not preceded by a digit, so 1月1日 does not match inside 11月1日
+    wanted = re.compile(r"(?<!\d)" + re.escape(format_date_label(target_date)))
+    for label in labels:
+        if wanted.search(" ".join(label.split())):
+            return label
+    return None
 
 
 def get_weekend_dates(current_date):
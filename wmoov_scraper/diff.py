@@ -0,0 +1,96 @@
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Iterator, List, TextIO, Tuple
+
+from .models import Movie, Showtime
+from .identity import stable_movie_id
+
+# Showtime fields compared between snapshots
+TRACKED_FIELDS = ("price", "available_seats", "booking_url")
+
+Row = Tuple[bytes, Movie, Showtime]
+
+
+def row_key(movie_id: str, showtime: Showtime) -> bytes:
+    """Fixed-size hash of (movie, cinema, hall, date, time)"""
+    raw = "\x1f".join((movie_id, showtime.cinema, showtime.hall, showtime.date, showtime.time))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=12).digest()
+
+
+def flatten(movies: Iterable[Movie]) -> List[Row]:
+    """Showtime rows sorted by their hashed key, with duplicate keys collapsed"""
+    rows = {}
+    for movie in movies:
+        movie_id = movie.movie_id or stable_movie_id(movie.title, movie.url)
+        for showtime in movie.showtimes:
+            rows[row_key(movie_id, showtime)] = (movie, showtime)
+    return [(key, movie, showtime) for key, (movie, showtime) in sorted(rows.items())]
+
+
+def _describe(op: str, movie: Movie, showtime: Showtime) -> Dict[str, Any]:
+    return {
+        "op": op,
+        "movie_id": movie.movie_id or stable_movie_id(movie.title, movie.url),
+        "title": movie.title,
+        "cinema": showtime.cinema,
+        "hall": showtime.hall,
+        "date": showtime.date,
+        "time": showtime.time,
+    }
+
+
+def diff_snapshots(old: Iterable[Movie], new: Iterable[Movie]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield changes between two snapshots
+    Both sides are flattened to rows sorted by hashed key and walked with a
+    single merge pass, so the comparison itself is linear in the row count.
+    """
+    old_rows = flatten(old)
+    new_rows = flatten(new)
+    i = j = 0
+
+    while i < len(old_rows) or j < len(new_rows):
+        old_key = old_rows[i][0] if i < len(old_rows) else None
+        new_key = new_rows[j][0] if j < len(new_rows) else None
+
+        if new_key is None or (old_key is not None and old_key < new_key):
+            _, movie, showtime = old_rows[i]
+            yield _describe("removed", movie, showtime)
+            i += 1
+        elif old_key is None or new_key < old_key:
+            _, movie, showtime = new_rows[j]
+            change = _describe("added", movie, showtime)
+            change.update({field: getattr(showtime, field) for field in TRACKED_FIELDS})
+            yield change
+            j += 1
+        else:
+            _, _, old_showtime = old_rows[i]
+            _, movie, showtime = new_rows[j]
+            fields = {
+                field: [getattr(old_showtime, field), getattr(showtime, field)]
+                for field in TRACKED_FIELDS
+                if getattr(old_showtime, field) != getattr(showtime, field)
+            }
+            if fields:
+                change = _describe("changed", movie, showtime)
+                change["changes"] = fields
+                yield change
+            i += 1
+            j += 1
+
+
+def write_changes(changes: Iterable[Dict[str, Any]], stream: TextIO) -> int:
+    """Write changes as JSON lines, returning how many were written"""
+    count = 0
+    for change in changes:
+        stream.write(json.dumps(change, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def summarize_changes(changes: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+    """Count changes by operation"""
+    summary: Dict[str, int] = {}
+    for change in changes:
+        summary[change["op"]] = summary.get(change["op"], 0) + 1
+    return summary
@@ -0,0 +1,159 @@
+import asyncio
+import time
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket limiting the request rate to a host"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and consume it"""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostGovernor:
+    """
+    Per-host rate and concurrency control
+    Rate is enforced by a token bucket, concurrency by an AIMD window:
+    every successful response grows the window additively, every throttle
+    signal (HTTP 429/5xx, timeout, slow response) halves it.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        rate: float = 2.0,
+        max_rate: float = 10.0,
+        min_rate: float = 0.2,
+        concurrency: float = 2.0,
+        max_concurrency: int = 8,
+        slow_threshold: float = 10.0,
+    ):
+        self.host = host
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.max_concurrency = max_concurrency
+        self.slow_threshold = slow_threshold
+        self.bucket = TokenBucket(rate)
+        self.concurrency = min(concurrency, max_concurrency)
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+
+        # Counters for run metrics
+        self.requests = 0
+        self.throttled = 0
+        self.timeouts = 0
+        self.decreases = 0
+        self.latency_ewma: Optional[float] = None
+
+    @property
+    def limit(self) -> int:
+        return max(1, int(self.concurrency))
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold one unit of the concurrency window"""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+
+    async def throttle(self):
+        """Wait for a request token"""
+        await self.bucket.acquire()
+
+    def record(self, latency: float, status: Optional[int] = None, timed_out: bool = False):
+        """Feed one request outcome into the AIMD controller"""
+        self.requests += 1
+        if latency >= 0:
+            if self.latency_ewma is None:
+                self.latency_ewma = latency
+            else:
+                self.latency_ewma = 0.8 * self.latency_ewma + 0.2 * latency
+
+        throttled = status is not None and (status == 429 or status >= 500)
+        if timed_out:
+            self.timeouts += 1
+        if throttled:
+            self.throttled += 1
+
+        if timed_out or throttled or latency > self.slow_threshold:
+            self._decrease()
+        else:
+            self._increase()
+
+    def _increase(self):
+        # Additive increase: about +1 slot and +0.5 req/s per full window
+        self.concurrency = min(self.max_concurrency, self.concurrency + 1.0 / self.concurrency)
+        self.bucket.rate = min(self.max_rate, self.bucket.rate + 0.5 / self.concurrency)
+        self.bucket.capacity = max(1.0, self.bucket.rate)
+
+    def _decrease(self):
+        # Multiplicative decrease
+        self.decreases += 1
+        self.concurrency = max(1.0, self.concurrency / 2)
+        self.bucket.rate = max(self.min_rate, self.bucket.rate / 2)
+        self.bucket.capacity = max(1.0, self.bucket.rate)
+        logger.debug(
+            f"Backing off {self.host}: concurrency={self.concurrency:.1f}, rate={self.bucket.rate:.2f}/s"
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "rate": round(self.rate, 2),
+            "concurrency": self.limit,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "timeouts": self.timeouts,
+            "decreases": self.decreases,
+            "latency_ewma": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+        }
+
+
+class RateGovernor:
+    """Registry of per-host governors"""
+
+    def __init__(self, **host_defaults):
+        self.host_defaults = host_defaults
+        self.hosts: Dict[str, HostGovernor] = {}
+
+    def for_url(self, url: str) -> HostGovernor:
+        host = urlparse(url).netloc or url
+        if host not in self.hosts:
+            self.hosts[host] = HostGovernor(host, **self.host_defaults)
+        return self.hosts[host]
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {host: governor.snapshot() for host, governor in self.hosts.items()}
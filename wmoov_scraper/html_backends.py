@@ -0,0 +1,186 @@
+import importlib.util
+from typing import Any, Dict, List, Optional
+
+# Elements whose content is not page text; BeautifulSoup leaves it out of get_text()
+NON_TEXT_TAGS = frozenset(("script", "style", "template"))
+
+
+class HtmlBackend:
+    """
+    The few tree operations the page parsers need
+    Backends work on their library's own nodes rather than wrapping them, so
+    a fast parser is not slowed down by an object per element. Text follows
+    BeautifulSoup's get_text(separator, strip=True): every text node
+    stripped, empty ones dropped, script and style content left out. That
+    makes every backend produce the same rows.
+    """
+
+    name = ""
+    modules: tuple = ()
+
+    @classmethod
+    def available(cls) -> bool:
+        return all(importlib.util.find_spec(module) is not None for module in cls.modules)
+
+    def parse(self, html: str) -> Any:
+        raise NotImplementedError
+
+    def select(self, node: Any, selector: str) -> List[Any]:
+        raise NotImplementedError
+
+    def parent(self, node: Any) -> Optional[Any]:
+        raise NotImplementedError
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def text(self, node: Any, separator: str = " ") -> str:
+        raise NotImplementedError
+
+    def select_one(self, node: Any, selector: str) -> Optional[Any]:
+        found = self.select(node, selector)
+        return found[0] if found else None
+
+
+class SoupBackend(HtmlBackend):
+    """BeautifulSoup with the standard library's html.parser; always available"""
+
+    name = "html.parser"
+    modules = ("bs4",)
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self._soup = BeautifulSoup
+
+    def parse(self, html: str) -> Any:
+        return self._soup(html, "html.parser")
+
+    def select(self, node: Any, selector: str) -> List[Any]:
+        return node.select(selector)
+
+    def select_one(self, node: Any, selector: str) -> Optional[Any]:
+        return node.select_one(selector)
+
+    def parent(self, node: Any) -> Optional[Any]:
+        return node.parent
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        return node.get(name)
+
+    def text(self, node: Any, separator: str = " ") -> str:
+        return node.get_text(separator, strip=True)
+
+
+class LxmlBackend(HtmlBackend):
+    """libxml2's HTML parser, with CSS compiled to XPath by cssselect"""
+
+    name = "lxml"
+    modules = ("lxml", "cssselect")
+
+    def __init__(self):
+        import lxml.html
+        from lxml.cssselect import CSSSelector
+        self._fromstring = lxml.html.document_fromstring
+        self._compile = CSSSelector
+        self._selectors: Dict[str, Any] = {}
+
+    def parse(self, html: str) -> Any:
+        return self._fromstring(html)
+
+    def select(self, node: Any, selector: str) -> List[Any]:
+        compiled = self._selectors.get(selector)
+        if compiled is None:
+            compiled = self._selectors[selector] = self._compile(selector)
+        return compiled(node)
+
+    def parent(self, node: Any) -> Optional[Any]:
+        return node.getparent()
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        return node.get(name)
+
+    def text(self, node: Any, separator: str = " ") -> str:
+        parts: List[str] = []
+        self._collect(node, parts)
+        return separator.join(parts)
+
+    def _collect(self, node: Any, parts: List[str]):
+        # Comments and processing instructions have a non-string tag; the caller keeps their tail
+        if not isinstance(node.tag, str) or node.tag in NON_TEXT_TAGS:
+            return
+        _append_stripped(parts, node.text)
+        for child in node:
+            self._collect(child, parts)
+            _append_stripped(parts, child.tail)
+
+
+class LexborBackend(HtmlBackend):
+    """selectolax's bindings to the lexbor HTML5 engine; the fastest"""
+
+    name = "selectolax"
+    modules = ("selectolax",)
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def parse(self, html: str) -> Any:
+        return self._parser(html).root
+
+    def select(self, node: Any, selector: str) -> List[Any]:
+        return node.css(selector)
+
+    def select_one(self, node: Any, selector: str) -> Optional[Any]:
+        return node.css_first(selector)
+
+    def parent(self, node: Any) -> Optional[Any]:
+        return node.parent
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        return node.attributes.get(name)
+
+    def text(self, node: Any, separator: str = " ") -> str:
+        parts: List[str] = []
+        self._collect(node, parts)
+        return separator.join(parts)
+
+    def _collect(self, node: Any, parts: List[str]):
+        for child in node.iter(include_text=True):
+            tag = child.tag
+            if tag == "-text":
+                _append_stripped(parts, child.text_content)
+            elif not tag.startswith("-") and tag not in NON_TEXT_TAGS:
+                self._collect(child, parts)
+
+
+def _append_stripped(parts: List[str], text: Optional[str]):
+    if text:
+        text = text.strip()
+        if text:
+            parts.append(text)
+
+
+# Fastest first; "auto" picks the first one installed
+BACKENDS = {backend.name: backend for backend in (LexborBackend, LxmlBackend, SoupBackend)}
+_instances: Dict[str, HtmlBackend] = {}
+
+
+def available_backends() -> List[str]:
+    return [name for name, backend in BACKENDS.items() if backend.available()]
+
+
+def get_backend(name: Optional[str] = None) -> HtmlBackend:
+    """A backend by name, or the fastest installed one for None or "auto" """
+    if not name or name == "auto":
+        available = available_backends()
+        if not available:
+            raise RuntimeError("No HTML parser installed; install beautifulsoup4")
+        name = available[0]
+    backend = _instances.get(name)
+    if backend is None:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown HTML parser {name!r}; choose from {', '.join(BACKENDS)}")
+        if not BACKENDS[name].available():
+            raise ValueError(f"HTML parser {name} is not installed")
+        backend = _instances[name] = BACKENDS[name]()
+    return backend
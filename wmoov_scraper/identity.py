@@ -0,0 +1,125 @@
+import hashlib
+import re
+import unicodedata
+import logging
+from typing import Dict, List, Optional
+
+from .models import Movie
+
+logger = logging.getLogger(__name__)
+
+# Format and language tags that mark a variant of the same film. Each tag must
+# stand on its own: Latin tags may not touch other Latin letters or digits
+# ("Imaxine"), and 2D/3D and the CJK tags must be separated by whitespace,
+# brackets or the ends of the title ("3Days", "重映人生").
+VARIANT_PATTERN = re.compile(
+    r'(?<![A-Za-z0-9])(?:IMAX|4DX|MX4D|D-BOX|SCREENX|DOLBY|ATMOS)(?![A-Za-z0-9])|'
+    r'(?:^|(?<=[\s(（\[【]))'
+    r'(?:[23]D|粵語版|國語版|英語版|日語版|韓語版|原裝版|數碼版|重映|復刻版|特別版|導演版)'
+    r'(?=$|[\s)）\]】])',
+    re.IGNORECASE
+)
+BRACKETED_PATTERN = re.compile(r'[(（\[【][^)）\]】]*[)）\]】]')
+NON_WORD_PATTERN = re.compile(r'[\W_]+')
+
+
+def normalize_title(title: str) -> str:
+    """Reduce a title to a key shared by all its variants"""
+    text = unicodedata.normalize('NFKC', title)
+    stripped = VARIANT_PATTERN.sub(' ', BRACKETED_PATTERN.sub(' ', text))
+    key = NON_WORD_PATTERN.sub('', stripped).lower()
+    # Titles made only of tags keep their full text rather than collapsing to ""
+    return key or NON_WORD_PATTERN.sub('', text).lower()
+
+
+def is_variant_title(title: str) -> bool:
+    """Whether the title carries a recognised format or language tag"""
+    return VARIANT_PATTERN.search(unicodedata.normalize('NFKC', title)) is not None
+
+
+def site_movie_id(url: Optional[str]) -> Optional[str]:
+    """Site movie ID from a /movie/details/<id> link"""
+    if url and url.startswith('/movie/details/'):
+        return url.rstrip('/').split('/')[-1] or None
+    return None
+
+
+def stable_movie_id(title: str, url: Optional[str] = None) -> str:
+    """
+    Deterministic movie ID
+    The site ID is preferred; otherwise a digest of the normalized title is used,
+    which stays the same across processes unlike the built-in hash().
+    """
+    site_id = site_movie_id(url)
+    if site_id:
+        return site_id
+    digest = hashlib.sha1(normalize_title(title).encode('utf-8')).hexdigest()
+    return f"t{digest[:12]}"
+
+
+class MovieIndex:
+    """
+    Merges listing cards that describe the same film
+    Cards with the same movie ID are exact duplicates and collapse into one.
+    Cards whose titles normalize to the same key (IMAX, dubbed or re-release
+    variants) are folded into the first card seen, keeping their detail URLs
+    in variant_urls so their showtimes are still fetched. Two cards with
+    different site IDs are only folded together when one of the titles
+    carries a variant tag; otherwise they are different films that happen
+    to share a name.
+    """
+
+    def __init__(self):
+        self._by_id: Dict[str, Movie] = {}
+        self._by_title: Dict[str, Movie] = {}
+        self._order: List[Movie] = []
+        self.merged = 0
+
+    def add(self, movie: Movie) -> Movie:
+        """Add a card and return the canonical movie it belongs to"""
+        if not movie.movie_id:
+            movie.movie_id = stable_movie_id(movie.title, movie.url)
+
+        canonical = self._by_id.get(movie.movie_id)
+        if canonical is None:
+            candidate = self._by_title.get(normalize_title(movie.title))
+            if candidate is not None and self._same_film(candidate, movie):
+                canonical = candidate
+
+        if canonical is None:
+            self._by_id[movie.movie_id] = movie
+            self._by_title.setdefault(normalize_title(movie.title), movie)
+            self._order.append(movie)
+            return movie
+
+        self.merged += 1
+        self._merge(canonical, movie)
+        self._by_id.setdefault(movie.movie_id, canonical)
+        return canonical
+
+    @staticmethod
+    def _same_film(canonical: Movie, card: Movie) -> bool:
+        """Whether a card with a matching title key is a variant rather than another film"""
+        if not site_movie_id(canonical.url) or not site_movie_id(card.url):
+            return True
+        return is_variant_title(canonical.title) or is_variant_title(card.title)
+
+    def _merge(self, canonical: Movie, duplicate: Movie):
+        known_urls = {canonical.url, *canonical.variant_urls}
+        if duplicate.url and duplicate.url not in known_urls:
+            canonical.variant_urls.append(duplicate.url)
+        if canonical.url is None and canonical.variant_urls:
+            canonical.url = canonical.variant_urls.pop(0)
+        if canonical.rating is None:
+            canonical.rating = duplicate.rating
+        canonical.popularity = max(canonical.popularity, duplicate.popularity)
+        for genre in duplicate.genres:
+            if genre not in canonical.genres:
+                canonical.genres.append(genre)
+
+    def get(self, movie_id: str) -> Optional[Movie]:
+        return self._by_id.get(movie_id)
+
+    def movies(self) -> List[Movie]:
+        """Canonical movies in listing order"""
+        return list(self._order)
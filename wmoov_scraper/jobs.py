@@ -0,0 +1,86 @@
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Union
+
+from .models import Movie
+from .api import filter_movies
+from .date_utils import get_current_date, get_weekend_dates
+
+logger = logging.getLogger(__name__)
+
+FILTER_KEYS = ("title", "genre", "min_rating", "cinema")
+
+
+@dataclass
+class JobSpec:
+    """One scrape configuration from a batch job file"""
+    name: str
+    dates: List[date]
+    filters: Dict[str, List[str]] = field(default_factory=dict)
+    output: Optional[str] = None
+    diff_against: Optional[str] = None
+    changes_out: Optional[str] = None
+
+
+def resolve_dates(spec: Union[str, List[str], None], today: date) -> List[date]:
+    """Dates for "weekend" (default), "week" (today plus six days) or a list of ISO dates"""
+    if spec is None or spec == "weekend":
+        return get_weekend_dates(today)
+    if spec == "week":
+        return [today + timedelta(days=offset) for offset in range(7)]
+    if isinstance(spec, list):
+        return sorted(date.fromisoformat(value) for value in spec)
+    raise ValueError(f"Unknown dates {spec!r}; use \"weekend\", \"week\" or a list of YYYY-MM-DD dates")
+
+
+def parse_job(entry: Dict[str, Any], index: int, today: date) -> JobSpec:
+    filters = entry.get("filters", {})
+    unknown = set(filters) - set(FILTER_KEYS)
+    if unknown:
+        raise ValueError(f"Job {index + 1} has unknown filters: {', '.join(sorted(unknown))}")
+    return JobSpec(
+        name=entry.get("name") or f"job-{index + 1}",
+        dates=resolve_dates(entry.get("dates"), today),
+        # Same shape as HTTP API query parameters, so the API's filtering applies unchanged
+        filters={key: [str(value)] for key, value in filters.items()},
+        output=entry.get("output"),
+        diff_against=entry.get("diff_against"),
+        changes_out=entry.get("changes_out"),
+    )
+
+
+def load_jobs(path: str, today: Optional[date] = None) -> List[JobSpec]:
+    """
+    Read a batch job file
+    Either a list of jobs or {"jobs": [...]}; each job may set name, dates,
+    filters (title, genre, min_rating, cinema), output, diff_against and
+    changes_out.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    entries = data.get("jobs", []) if isinstance(data, dict) else data
+    if not entries:
+        raise ValueError(f"No jobs in {path}")
+    today = today or get_current_date()
+    return [parse_job(entry, i, today) for i, entry in enumerate(entries)]
+
+
+def union_dates(jobs: List[JobSpec]) -> List[date]:
+    """Every date any job needs, so each detail page is visited once for all of them"""
+    return sorted({show_date for job in jobs for show_date in job.dates})
+
+
+def select_for_job(movies: List[Movie], job: JobSpec) -> List[Movie]:
+    """The job's view of a shared scrape: its dates, then its filters"""
+    wanted = {show_date.strftime('%Y-%m-%d') for show_date in job.dates}
+    selected = []
+    for movie in movies:
+        showtimes = [s for s in movie.showtimes if s.date in wanted]
+        if not showtimes:
+            continue
+        if len(showtimes) != len(movie.showtimes):
+            movie = Movie.from_dict({**movie.to_dict(), "showtimes": [s.to_dict() for s in showtimes]})
+        selected.append(movie)
+    return filter_movies(selected, job.filters)
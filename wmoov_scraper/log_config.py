@@ -0,0 +1,105 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+STANDARD_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record, including any `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in STANDARD_RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RepeatedWarningFilter(logging.Filter):
+    """
+    Rate-limits repeats of the same warning
+    Warnings are told apart by their message and arguments, so one call site
+    logging about different movies is not throttled. At most `burst` copies
+    of a warning pass within `window` seconds; the next one let through
+    afterwards reports how many were dropped.
+    """
+
+    def __init__(self, burst: int = 5, window: float = 60.0):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._seen: Dict[Tuple[str, str], tuple] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno != logging.WARNING:
+            return True
+
+        now = time.monotonic()
+        key = (str(record.msg), repr(record.args))
+        window_start, count, suppressed = self._seen.get(key, (now, 0, 0))
+        if now - window_start > self.window:
+            window_start, count = now, 0
+
+        if count >= self.burst:
+            self._seen[key] = (window_start, count, suppressed + 1)
+            return False
+
+        if suppressed:
+            record.msg = f"{record.getMessage()} ({suppressed} similar warnings suppressed)"
+            record.args = None
+        self._seen[key] = (window_start, count + 1, 0)
+        return True
+
+
+def configure_logging(verbose: bool = False, fmt: str = "rich", use_queue: bool = False) -> Optional[QueueListener]:
+    """
+    Configure root logging
+    With use_queue the event loop thread only enqueues records; formatting and
+    output happen on a background listener thread. Repeated warnings are only
+    rate-limited in the queued and JSON modes, where logs are meant for
+    machines; the interactive console shows every one.
+    """
+    if fmt == "json":
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(JsonLinesFormatter())
+    else:
+        from rich.console import Console
+        from rich.logging import RichHandler
+        handler = RichHandler(console=Console(stderr=True), rich_tracebacks=True)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+
+    listener = None
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        front = QueueHandler(log_queue)
+        # QueueHandler bakes the formatted message into the record; keep it bare
+        front.setFormatter(logging.Formatter("%(message)s"))
+        listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+    else:
+        front = handler
+    if use_queue or fmt == "json":
+        front.addFilter(RepeatedWarningFilter())
+
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        handlers=[front],
+        force=True
+    )
+    return listener
@@ -0,0 +1,139 @@
+import os
+import sys
+import time
+import heapq
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 0.05
+DEFAULT_SLOW_THRESHOLD = 0.1
+# Slow callbacks kept with their stacks for the summary; the count covers all of them
+KEPT_STALLS = 20
+STACK_DEPTH = 12
+LOOPS = ("asyncio", "uvloop")
+
+
+def run_with_loop(coro: Coroutine, loop: str = "asyncio"):
+    """asyncio.run on the chosen event loop implementation"""
+    if loop == "uvloop":
+        import uvloop
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    return asyncio.run(coro)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, round(fraction * len(values)) - 1))]
+
+
+class LoopMonitor:
+    """
+    Event loop responsiveness monitor
+    A heartbeat task sleeps for a fixed interval and records how late it
+    wakes up; that lag is how long every other coroutine, Playwright calls
+    included, was kept waiting. A watchdog thread notices a heartbeat that is
+    overdue by more than the slow threshold and captures the loop thread's
+    stack while the blocking callback is still running, so a stall is
+    reported with the code that caused it rather than whatever ran after.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, slow_threshold: float = DEFAULT_SLOW_THRESHOLD):
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.lags: List[float] = []
+        self.stalls = 0
+        self.loop_name = "asyncio"
+        self._slowest: List[tuple] = []
+        self._beat = 0.0
+        # (beat it belongs to, stack) captured by the watchdog
+        self._captured: tuple = (None, None)
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start monitoring the running loop"""
+        loop = asyncio.get_running_loop()
+        self.loop_name = type(loop).__module__.split(".")[0]
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.ensure_future(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="wmoov-loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._beat = time.monotonic()
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.lags.append(lag)
+            if lag >= self.slow_threshold:
+                self._record_stall(lag)
+
+    def _watch(self):
+        while not self._stop.wait(self.slow_threshold / 2):
+            beat = self._beat
+            if self._captured[0] == beat or time.monotonic() - beat < self.interval + self.slow_threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = []
+            while frame is not None and len(stack) < STACK_DEPTH:
+                code = frame.f_code
+                stack.append(f"{getattr(code, 'co_qualname', code.co_name)} "
+                             f"({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            self._captured = (beat, stack)
+
+    def _record_stall(self, lag: float):
+        beat, stack = self._captured
+        # Without a capture for this beat the watchdog missed it; report the lag anyway
+        stack = stack if beat == self._beat else []
+        self.stalls += 1
+        entry = (lag, self.stalls, stack)
+        if len(self._slowest) < KEPT_STALLS:
+            heapq.heappush(self._slowest, entry)
+        else:
+            heapq.heappushpop(self._slowest, entry)
+        where = stack[0] if stack else "an unknown callback"
+        logger.warning(
+            f"Event loop blocked for {lag * 1000:.0f} ms in {where}"
+            + "".join(f"\n    at {frame}" for frame in stack[1:])
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        lags = sorted(self.lags)
+        return {
+            "loop": self.loop_name,
+            "samples": len(lags),
+            "p50_ms": round(percentile(lags, 0.50) * 1000, 1),
+            "p95_ms": round(percentile(lags, 0.95) * 1000, 1),
+            "p99_ms": round(percentile(lags, 0.99) * 1000, 1),
+            "max_ms": round(lags[-1] * 1000, 1) if lags else 0.0,
+            "slow_threshold_ms": round(self.slow_threshold * 1000),
+            "stalls": self.stalls,
+            "slowest": [
+                {"lag_ms": round(lag * 1000, 1), "stack": stack}
+                for lag, _, stack in sorted(self._slowest, reverse=True)
+            ],
+        }
@@ -1,33 +1,92 @@
-import asyncio
 import logging
 import sys
-from typing import Optional
+from contextlib import nullcontext
+from typing import List, Optional, TextIO
 
-from rich.console import Console
-from rich.logging import RichHandler
+# Rich, Playwright and BeautifulSoup are heavy to import, so they are loaded on
+# the code paths that use them. --help and cache-only commands such as diff
+# never pay for them; test_import_time.py guards this.
+from .models import Movie
+from .snapshot import load_snapshot, save_snapshot
+from .diff import diff_snapshots, write_changes, summarize_changes
 
-from .scraper import WMOOVScraper
-from .processor import DataProcessor
-from .date_utils import get_current_date, get_weekend_dates
-
-# Configure logging with Rich
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(message)s",
-    handlers=[RichHandler(console=Console(stderr=True), rich_tracebacks=True)]
-)
 logger = logging.getLogger(__name__)
 
-console = Console()
+
+class LazyConsole:
+    """Rich console that is only created when something is printed"""
+    
+    def __init__(self, **options):
+        self._options = options
+        self._console = None
+    
+    def __getattr__(self, name):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console(**self._options)
+        return getattr(self._console, name)
+
+
+console = LazyConsole()
+err_console = LazyConsole(stderr=True)
+
+
+def emit_changes(old_movies: List[Movie], new_movies: List[Movie], changes_out: Optional[str] = None,
+                 stream: TextIO = sys.stdout):
+    """Diff two results and write the change stream as JSON lines to a file or stream"""
+    changes = list(diff_snapshots(old_movies, new_movies))
+    if changes_out:
+        with open(changes_out, "w", encoding="utf-8") as f:
+            write_changes(changes, f)
+        err_console.print(f"📝 Wrote {len(changes)} changes to {changes_out}")
+    else:
+        write_changes(changes, stream)
+    
+    summary = summarize_changes(changes)
+    if summary:
+        err_console.print("🔀 Changes: " + ", ".join(f"{count} {op}" for op, count in summary.items()))
+    else:
+        err_console.print("🔀 No changes")
+
+
+def write_outputs(movies: List[Movie], dates, output: Optional[str] = None,
+                  diff_against: Optional[str] = None, changes_out: Optional[str] = None):
+    """Write a snapshot and change stream for one result"""
+    if diff_against:
+        # Stdout carries the result tables here, so an unredirected change stream goes to stderr
+        emit_changes(load_snapshot(diff_against), movies, changes_out, stream=sys.stderr)
+    if output:
+        save_snapshot(movies, output, [d.strftime('%Y-%m-%d') for d in dates])
+        console.print(f"💾 Saved snapshot to {output}")
 
 
 class WeekendMovieApp:
-    def __init__(self, headless: bool = True):
+    def __init__(
+        self,
+        headless: bool = True,
+        output: Optional[str] = None,
+        diff_against: Optional[str] = None,
+        changes_out: Optional[str] = None,
+        live: bool = False,
+        **scraper_options
+    ):
         self.headless = headless
-        self.scraper = WMOOVScraper(headless=headless)
+        self.output = output
+        self.diff_against = diff_against
+        self.changes_out = changes_out
+        self.live = live
+        self.scraper_options = scraper_options
+        self.scraper = self._new_scraper()
+    
+    def _new_scraper(self):
+        from .scraper import WMOOVScraper
+        return WMOOVScraper(headless=self.headless, **self.scraper_options)
         
     async def run(self) -> bool:
         """Main application entry point"""
+        from .processor import DataProcessor, LiveMovieView
+        from .date_utils import get_current_date, get_weekend_dates
+        
         try:
             console.print("🚀 Starting WMOOV Weekend Movie Scraper...", style="bold blue")
             
@@ -43,15 +102,24 @@ class WeekendMovieApp:
             
             # Scrape movies
             console.print("\n🔍 Scraping movies with weekend showtimes...")
-            movies = await self.scraper.scrape_weekend_movies()
+            if self.live:
+                with LiveMovieView() as view:
+                    self.scraper.on_listing = view.set_total
+                    self.scraper.on_movie = view.add_movie
+                    movies = await self.scraper.scrape_weekend_movies()
+            else:
+                movies = await self.scraper.scrape_weekend_movies()
+            self._write_outputs(movies, weekend_dates)
             
             if not movies:
                 console.print("[yellow]⚠️  No movies found with weekend showtimes.[/yellow]")
+                DataProcessor.display_run_metrics(self.scraper.metrics)
                 return True
             
             # Display results
             console.print(f"\n✅ Found {len(movies)} movies with weekend showtimes!")
-            DataProcessor.display_movies_table(movies)
+            DataProcessor.display_movies_table(movies, dates=weekend_dates)
+            DataProcessor.display_run_metrics(self.scraper.metrics)
             
             return True
             
@@ -63,8 +131,156 @@ class WeekendMovieApp:
             
         finally:
             # Cleanup
+            self.scraper.metrics.finish()
             await self.scraper.close()
             console.print("\n👋 Scraper finished.")
+    
+    async def _scrape_once(self, dates) -> List[Movie]:
+        """
+        Scrape one result with a scraper of its own
+        Each call runs on a new event loop, and the governor's locks, the page
+        archive connection and the run metrics all belong to the loop and run
+        that created them, so nothing is carried over between refreshes.
+        """
+        from .models import STATUS_COMPLETE, STATUS_PARTIAL
+        
+        scraper = self._new_scraper()
+        await scraper.initialize()
+        try:
+            movies = await scraper.scrape_weekend_movies(dates)
+        finally:
+            scraper.metrics.finish()
+            await scraper.close()
+        
+        statuses = scraper.metrics.movie_status
+        if statuses and not statuses.get(STATUS_COMPLETE) and not statuses.get(STATUS_PARTIAL):
+            raise RuntimeError(f"Every detail page failed ({sum(statuses.values())} movies)")
+        return movies
+    
+    async def reparse(self, run_id: Optional[str] = None) -> bool:
+        """Rebuild the result from archived pages instead of the live site"""
+        from datetime import date
+        from .processor import DataProcessor
+        
+        try:
+            console.print("♻️  Re-parsing archived pages...", style="bold blue")
+            movies = await self.scraper.reparse_archive(run_id)
+            dates = sorted({date.fromisoformat(s.date) for movie in movies for s in movie.showtimes})
+            self._write_outputs(movies, dates)
+            
+            if not movies:
+                DataProcessor.display_no_data()
+            else:
+                DataProcessor.display_movies_table(movies, dates=dates)
+            DataProcessor.display_run_metrics(self.scraper.metrics)
+            return True
+            
+        except Exception as e:
+            error_msg = f"Failed to re-parse archive: {str(e)}"
+            logger.error(error_msg)
+            DataProcessor.display_error(error_msg)
+            return False
+            
+        finally:
+            self.scraper.metrics.finish()
+            await self.scraper.close()
+    
+    def serve_api(self, host: str, port: int, snapshot: Optional[str] = None, loop: str = "asyncio") -> bool:
+        """Serve the latest result over HTTP, refreshing on request"""
+        from .api import ApiState, serve
+        from .date_utils import get_current_date, get_weekend_dates
+        from .loop_monitor import run_with_loop
+        
+        # Refreshes never overlap, so the window of the last scrape is the one to save
+        window = {}
+        
+        def scrape() -> List[Movie]:
+            window["dates"] = get_weekend_dates(get_current_date())
+            return run_with_loop(self._scrape_once(window["dates"]), loop)
+        
+        def on_refresh(movies: List[Movie]):
+            if self.output:
+                save_snapshot(movies, self.output, [d.strftime('%Y-%m-%d') for d in window["dates"]])
+        
+        state = ApiState(scrape, on_refresh=on_refresh)
+        if snapshot:
+            state.publish(load_snapshot(snapshot))
+        else:
+            state.request_refresh()
+        
+        console.print(f"🌐 Serving WMOOV API on http://{host}:{port} (POST /refresh to rescrape)", style="bold blue")
+        serve(state, host, port)
+        return True
+    
+    def _write_outputs(self, movies: List[Movie], weekend_dates):
+        """Write the snapshot and change stream requested on the command line"""
+        write_outputs(movies, weekend_dates, self.output, self.diff_against, self.changes_out)
+    
+    async def run_batch(self, job_file: str) -> bool:
+        """Run every job in a job file from one shared browser session and scrape"""
+        from .jobs import load_jobs, union_dates, select_for_job
+        from .processor import DataProcessor
+        
+        try:
+            jobs = load_jobs(job_file)
+            dates = union_dates(jobs)
+            console.print(
+                f"🚀 Running {len(jobs)} jobs over {len(dates)} dates in one browser session...",
+                style="bold blue"
+            )
+            
+            # One listing fetch and one visit per detail page cover every job's dates
+            await self.scraper.initialize()
+            movies = await self.scraper.scrape_weekend_movies(dates)
+            
+            for job in jobs:
+                selected = select_for_job(movies, job)
+                showtimes = sum(len(movie.showtimes) for movie in selected)
+                console.print(f"\n📦 {job.name}: {len(selected)} movies, {showtimes} showtimes")
+                write_outputs(selected, job.dates, job.output, job.diff_against, job.changes_out)
+                if not job.output and not job.diff_against:
+                    DataProcessor.display_movies_table(selected, dates=job.dates)
+            
+            DataProcessor.display_run_metrics(self.scraper.metrics)
+            return True
+            
+        except Exception as e:
+            error_msg = f"Batch run failed: {str(e)}"
+            logger.error(error_msg)
+            DataProcessor.display_error(error_msg)
+            return False
+            
+        finally:
+            self.scraper.metrics.finish()
+            await self.scraper.close()
+            console.print("\n👋 Batch finished.")
+    
+    async def watch(self, polls_per_minute: float = 6.0, duration: Optional[float] = None) -> bool:
+        """Keep polling seat availability for shows in the next few hours"""
+        from .processor import DataProcessor
+        from .watch import SeatWatcher
+        
+        try:
+            console.print("👀 Starting WMOOV seat watch...", style="bold blue")
+            await self.scraper.initialize()
+            
+            watcher = SeatWatcher(
+                self.scraper,
+                polls_per_minute=polls_per_minute,
+                on_change=DataProcessor.display_seat_changes
+            )
+            await watcher.run(duration)
+            return True
+            
+        except Exception as e:
+            error_msg = f"Seat watch failed: {str(e)}"
+            logger.error(error_msg)
+            DataProcessor.display_error(error_msg)
+            return False
+            
+        finally:
+            await self.scraper.close()
+            console.print("\n👋 Watch finished.")
 
 
 def main():
@@ -79,9 +295,34 @@ Examples:
   %(prog)s                    # Run with headless browser
   %(prog)s --no-headless     # Show browser window
   %(prog)s --verbose         # Enable detailed logging
+  %(prog)s --resume          # Continue an interrupted run
+  %(prog)s watch             # Poll seats for shows in the next few hours
+  %(prog)s --output new.json --diff-against old.json
+  %(prog)s diff old.json new.json
+  %(prog)s api --port 8080   # Serve the latest result as JSON
+  %(prog)s --archive-dir pages   # Keep every fetched page
+  %(prog)s reparse --archive-dir pages
+  %(prog)s batch jobs.json   # Several configurations, one browser session
+  %(prog)s --profile=slow-run --cprofile   # Flame graph and pstats of the run
+  %(prog)s --loop-monitor --loop uvloop    # Event loop lag on uvloop
         """
     )
     
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["scrape", "watch", "diff", "api", "reparse", "batch"],
+        default="scrape",
+        help="scrape the weekend once (default), watch seat availability, diff two snapshots, "
+             "serve an HTTP API, re-parse archived pages, or run a batch job file"
+    )
+    
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="diff: OLD and NEW snapshot files; batch: the job file"
+    )
+    
     parser.add_argument(
         "--no-headless", 
         action="store_false", 
@@ -95,20 +336,368 @@ Examples:
         help="Enable verbose logging"
     )
     
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=4,
+        help="Upper bound for concurrent detail pages per host (default: 4)"
+    )
+    
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=2.0,
+        help="Initial request rate per host in requests/second (default: 2.0)"
+    )
+    
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        help="Run-level time budget in seconds, shared out between movies"
+    )
+    
+    parser.add_argument(
+        "--movie-timeout",
+        type=float,
+        default=60.0,
+        help="Upper bound for a single detail page attempt in seconds (default: 60)"
+    )
+    
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=2,
+        help="Retries per movie with jittered backoff (default: 2)"
+    )
+    
+    parser.add_argument(
+        "--hedge-after",
+        type=float,
+        default=None,
+        help="Start a second attempt for detail pages slower than this many seconds"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the last checkpoint for the same date window"
+    )
+    
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_false",
+        dest="checkpoint",
+        help="Do not persist progress while scraping"
+    )
+    
+    parser.add_argument(
+        "--checkpoint-dir",
+        default=None,
+        help="Directory for checkpoints (default: ~/.cache/wmoov_scraper/checkpoints)"
+    )
+    
+    parser.add_argument(
+        "--strategy",
+        choices=["movie", "cinema"],
+        default="movie",
+        help="Crawl movie detail pages or cinema schedule pages (default: movie)"
+    )
+    
+    parser.add_argument(
+        "--poll-budget",
+        type=float,
+        default=6.0,
+        help="watch: detail page polls per minute across all movies (default: 6)"
+    )
+    
+    parser.add_argument(
+        "--watch-duration",
+        type=float,
+        default=None,
+        help="watch: stop after this many seconds (default: until interrupted)"
+    )
+    
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="Show movies, progress and throughput live while scraping"
+    )
+    
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Write the result as a snapshot to this path (JSON, or binary for .wsnap)"
+    )
+    
+    parser.add_argument(
+        "--diff-against",
+        default=None,
+        help="Compare the result with a previous snapshot and emit a change stream"
+    )
+    
+    parser.add_argument(
+        "--changes-out",
+        default=None,
+        help="Write the change stream as JSON lines here; without it the stream goes to stderr "
+             "when scraping, and to stdout for the diff command"
+    )
+    
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="api: address to bind (default: 127.0.0.1)"
+    )
+    
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8080,
+        help="api: port to listen on (default: 8080)"
+    )
+    
+    parser.add_argument(
+        "--snapshot",
+        default=None,
+        help="api: serve this snapshot instead of scraping at startup"
+    )
+    
+    parser.add_argument(
+        "--log-format",
+        choices=["rich", "json"],
+        default="rich",
+        help="Log output format; json writes one structured record per line (default: rich)"
+    )
+    
+    parser.add_argument(
+        "--log-queue",
+        action="store_true",
+        help="Hand log records to a background thread instead of writing them in the event loop"
+    )
+    
+    parser.add_argument(
+        "--trace-dir",
+        default=None,
+        help="Record Playwright traces for detail pages and keep those of slow or failed pages here"
+    )
+    
+    parser.add_argument(
+        "--trace-slow",
+        type=float,
+        default=15.0,
+        help="Keep traces of detail pages slower than this many seconds (default: 15)"
+    )
+    
+    parser.add_argument(
+        "--trace-quota-mb",
+        type=float,
+        default=200.0,
+        help="Disk quota for saved traces; oldest are removed first (default: 200)"
+    )
+    
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Processes parsing page HTML; 0 parses on the event loop (default: one per core)"
+    )
+    
+    parser.add_argument(
+        "--html-parser",
+        choices=["auto", "selectolax", "lxml", "html.parser"],
+        default="auto",
+        help="HTML parsing backend; auto uses the fastest installed (default: auto)"
+    )
+    
+    parser.add_argument(
+        "--metadata-ttl-days",
+        type=float,
+        default=30.0,
+        help="Reuse cached director, cast and artwork for this many days (default: 30)"
+    )
+    
+    parser.add_argument(
+        "--assets-dir",
+        default=None,
+        help="Download posters into this content-addressed store after each movie is scraped"
+    )
+    
+    parser.add_argument(
+        "--asset-concurrency",
+        type=int,
+        default=8,
+        help="Concurrent poster downloads (default: 8)"
+    )
+    
+    parser.add_argument(
+        "--thumbnail-size",
+        type=int,
+        default=None,
+        help="Also write poster thumbnails of at most this many pixels per side (needs Pillow)"
+    )
+    
+    parser.add_argument(
+        "--archive-dir",
+        default=None,
+        help="Archive every fetched page here (deduplicated and compressed); reparse reads from it"
+    )
+    
+    parser.add_argument(
+        "--priority",
+        default=None,
+        metavar="NAME|MODULE:FUNCTION",
+        help="Order detail pages by this priority: default (popularity, rating, new movies, soonest "
+             "shows), listing (site order) or a function(movie, context) returning a score"
+    )
+    
+    parser.add_argument(
+        "--loop-monitor",
+        action="store_true",
+        help="Measure event loop lag and report callbacks that block it, with their stacks"
+    )
+    
+    parser.add_argument(
+        "--slow-callback-ms",
+        type=float,
+        default=100.0,
+        help="--loop-monitor: report callbacks blocking the loop for longer than this (default: 100)"
+    )
+    
+    parser.add_argument(
+        "--loop",
+        choices=["asyncio", "uvloop"],
+        default="asyncio",
+        help="Event loop implementation; uvloop needs the uvloop extra (default: asyncio)"
+    )
+    
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="wmoov-profile",
+        default=None,
+        metavar="PREFIX",
+        help="Sample the whole run and write PREFIX.folded for flame graphs (default prefix: wmoov-profile)"
+    )
+    
+    parser.add_argument(
+        "--profile-interval",
+        type=float,
+        default=5.0,
+        help="Milliseconds between profiler samples (default: 5)"
+    )
+    
+    parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help="With --profile, also run cProfile and write PREFIX.pstats"
+    )
+    
+    parser.add_argument(
+        "--run",
+        default=None,
+        help="reparse: archived run ID to re-parse (default: the latest)"
+    )
+    
     args = parser.parse_args()
     
-    # Set log level
-    if args.verbose:
-        logging.getLogger().setLevel(logging.DEBUG)
+    if args.command == "reparse" and not args.archive_dir:
+        parser.error("reparse needs --archive-dir")
+    if args.command == "batch" and len(args.paths) != 1:
+        parser.error("batch needs one job file")
+    
+    if args.command == "diff":
+        if len(args.paths) != 2:
+            parser.error("diff needs OLD and NEW snapshot paths")
+        try:
+            emit_changes(load_snapshot(args.paths[0]), load_snapshot(args.paths[1]), args.changes_out)
+        except (OSError, ValueError) as e:
+            from .processor import DataProcessor
+            DataProcessor.display_error(f"Failed to diff snapshots: {e}")
+            sys.exit(1)
+        sys.exit(0)
+    
+    if args.html_parser != "auto":
+        from .html_backends import available_backends
+        if args.html_parser not in available_backends():
+            parser.error(f"HTML parser {args.html_parser} is not installed (see the fast and lxml extras)")
+    if args.loop == "uvloop":
+        import importlib.util
+        if importlib.util.find_spec("uvloop") is None:
+            parser.error("uvloop is not installed (pip install wmoov-weekend-scraper[uvloop])")
+    
+    from .log_config import configure_logging
+    configure_logging(args.verbose, fmt=args.log_format, use_queue=args.log_queue)
+    from .priority import load_priority
+    try:
+        priority = load_priority(args.priority)
+    except (ImportError, ValueError) as e:
+        parser.error(f"--priority: {e}")
+    from functools import partial
+    from .loop_monitor import run_with_loop
+    run = partial(run_with_loop, loop=args.loop)
     
     # Run the application
-    app = WeekendMovieApp(headless=args.headless)
+    watching = args.command == "watch"
+    reparsing = args.command == "reparse"
+    app = WeekendMovieApp(
+        headless=args.headless,
+        output=args.output,
+        diff_against=args.diff_against,
+        changes_out=args.changes_out,
+        live=args.live,
+        max_concurrency=args.max_concurrency,
+        rate=args.rate,
+        run_timeout=None if watching else args.deadline,
+        movie_timeout=args.movie_timeout,
+        retries=args.retries,
+        hedge_after=args.hedge_after,
+        checkpoint_enabled=args.checkpoint and not watching and not reparsing,
+        checkpoint_dir=args.checkpoint_dir,
+        resume=args.resume,
+        strategy=args.strategy,
+        trace_dir=args.trace_dir,
+        trace_slow=args.trace_slow,
+        trace_quota_mb=args.trace_quota_mb,
+        parse_workers=args.parse_workers,
+        html_parser=args.html_parser,
+        archive_dir=args.archive_dir,
+        metadata_ttl=args.metadata_ttl_days * 24 * 3600,
+        assets_dir=args.assets_dir,
+        asset_concurrency=args.asset_concurrency,
+        thumbnail_size=args.thumbnail_size,
+        loop_monitor=args.loop_monitor,
+        slow_callback=args.slow_callback_ms / 1000,
+        priority=priority
+    )
+    
+    profiler = None
+    if args.profile:
+        from .profiling import RunProfiler
+        profiler = RunProfiler(args.profile, args.profile_interval / 1000, use_cprofile=args.cprofile)
     
     try:
-        success = asyncio.run(app.run())
+        with profiler or nullcontext():
+            if args.command == "api":
+                success = app.serve_api(args.host, args.port, args.snapshot, loop=args.loop)
+            elif watching:
+                success = run(app.watch(args.poll_budget, args.watch_duration))
+            elif reparsing:
+                success = run(app.reparse(args.run))
+            elif args.command == "batch":
+                success = run(app.run_batch(args.paths[0]))
+            else:
+                success = run(app.run())
+        if profiler:
+            from .processor import DataProcessor
+            DataProcessor.display_profile(profiler.report)
         sys.exit(0 if success else 1)
     except KeyboardInterrupt:
         console.print("\n[yellow]⚠️  Scraper interrupted by user.[/yellow]")
+        if args.checkpoint and not watching and not reparsing:
+            console.print("[yellow]💾 Progress was checkpointed; rerun with --resume to continue.[/yellow]")
+        if profiler and profiler.report:
+            from .processor import DataProcessor
+            DataProcessor.display_profile(profiler.report)
         sys.exit(1)
     except Exception as e:
         console.print(f"[bold red]💥 Unexpected error: {e}[/bold red]")
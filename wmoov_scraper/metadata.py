@@ -0,0 +1,68 @@
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .models import Movie
+from .paths import get_cache_dir, load_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Director, cast and artwork rarely change once a film is listed
+DEFAULT_TTL = 30 * 24 * 3600
+METADATA_FIELDS = ("director", "cast", "poster_url", "trailer_url")
+
+
+class MetadataCache:
+    """
+    Long-lived movie metadata keyed by movie ID
+    Kept apart from showtimes, which go stale within minutes, so a known film
+    gets its director, cast and artwork from the cache and its detail page
+    visits only read the showtime tables.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, ttl: float = DEFAULT_TTL):
+        self.cache_path = Path(cache_path) if cache_path else get_cache_dir() / "metadata.json"
+        self.ttl = ttl
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+        self.hits = 0
+        self.extracted = 0
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        return load_json(self.cache_path, {})
+
+    def save(self):
+        """Persist the cache if any entry changed"""
+        if not self._dirty:
+            return
+        write_json_atomic(self.cache_path, self.entries)
+        self._dirty = False
+
+    def fresh(self, movie_id: str) -> bool:
+        entry = self.entries.get(movie_id)
+        return entry is not None and time.time() - entry.get("fetched_at", 0) < self.ttl
+
+    def apply(self, movie: Movie) -> bool:
+        """Fill the movie's metadata from a fresh cache entry"""
+        if not self.fresh(movie.movie_id):
+            return False
+        entry = self.entries[movie.movie_id]
+        for name in METADATA_FIELDS:
+            setattr(movie, name, entry.get(name))
+        movie.cast = movie.cast or []
+        self.hits += 1
+        return True
+
+    def store(self, movie: Movie):
+        """Remember metadata just extracted for the movie"""
+        self.entries[movie.movie_id] = {
+            "fetched_at": time.time(),
+            "title": movie.title,
+            **{name: getattr(movie, name) for name in METADATA_FIELDS},
+        }
+        self.extracted += 1
+        self._dirty = True
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"cached": self.hits, "extracted": self.extracted}
@@ -0,0 +1,68 @@
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, List
+
+from .models import STATUS_COMPLETE
+
+
+@dataclass
+class RunMetrics:
+    """Counters collected during a scrape run"""
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: float = 0.0
+    page_loads: int = 0
+    page_loads_by_kind: Dict[str, int] = field(default_factory=dict)
+    strategy: str = "movie"
+    estimated_page_loads: Dict[str, int] = field(default_factory=dict)
+    governor: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    retries: int = 0
+    hedged: int = 0
+    movie_status: Dict[str, int] = field(default_factory=dict)
+    incomplete_movies: List[str] = field(default_factory=list)
+    traces_saved: int = 0
+    selectors: Dict[str, int] = field(default_factory=dict)
+    parse: Dict[str, Any] = field(default_factory=dict)
+    archive: Dict[str, Any] = field(default_factory=dict)
+    metadata: Dict[str, int] = field(default_factory=dict)
+    pipeline: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    assets: Dict[str, int] = field(default_factory=dict)
+    loop: Dict[str, Any] = field(default_factory=dict)
+
+    def record_page_load(self, kind: str):
+        self.page_loads += 1
+        self.page_loads_by_kind[kind] = self.page_loads_by_kind.get(kind, 0) + 1
+
+    def record_movie(self, title: str, status: str):
+        self.movie_status[status] = self.movie_status.get(status, 0) + 1
+        if status != STATUS_COMPLETE:
+            self.incomplete_movies.append(f"{title} ({status})")
+
+    def finish(self):
+        self.finished_at = time.monotonic()
+
+    @property
+    def duration(self) -> float:
+        end = self.finished_at or time.monotonic()
+        return end - self.started_at
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "duration": round(self.duration, 2),
+            "page_loads": self.page_loads,
+            "page_loads_by_kind": self.page_loads_by_kind,
+            "strategy": self.strategy,
+            "estimated_page_loads": self.estimated_page_loads,
+            "governor": self.governor,
+            "retries": self.retries,
+            "hedged": self.hedged,
+            "movie_status": self.movie_status,
+            "incomplete_movies": self.incomplete_movies,
+            "traces_saved": self.traces_saved,
+            "selectors": self.selectors,
+            "parse": self.parse,
+            "archive": self.archive,
+            "metadata": self.metadata,
+            "pipeline": self.pipeline,
+            "assets": self.assets,
+            "loop": self.loop,
+        }
@@ -1,7 +1,12 @@
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, asdict, field
+from typing import List, Optional, Dict, Any
 from datetime import datetime
 
+# Outcome of the detail scrape for a movie
+STATUS_COMPLETE = "complete"
+STATUS_PARTIAL = "partial"
+STATUS_FAILED = "failed"
+
 
 @dataclass
 class Showtime:
@@ -13,6 +18,13 @@ class Showtime:
     price: float
     booking_url: Optional[str] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Showtime":
+        return cls(**data)
+
 
 @dataclass
 class Movie:
@@ -25,4 +37,16 @@ class Movie:
     showtimes: List[Showtime]
     url: Optional[str] = None
     poster_url: Optional[str] = None
-    trailer_url: Optional[str] = None
\ No newline at end of file
+    trailer_url: Optional[str] = None
+    scrape_status: str = STATUS_COMPLETE
+    movie_id: Optional[str] = None
+    variant_urls: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Movie":
+        data = dict(data)
+        data["showtimes"] = [Showtime.from_dict(s) for s in data.get("showtimes", [])]
+        return cls(**data)
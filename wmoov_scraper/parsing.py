@@ -0,0 +1,368 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .html_backends import HtmlBackend, get_backend
+
+logger = logging.getLogger(__name__)
+
+# (cinema, hall, time, date, available_seats, price, booking_url), in Showtime field order
+ShowtimeRow = Tuple[str, str, str, str, str, float, Optional[str]]
+# (site movie href, title, showtime row) from a cinema schedule table
+CinemaRow = Tuple[Optional[str], str, ShowtimeRow]
+# (title, rating, genres, popularity, href) from a listing card
+CardRow = Tuple[str, Optional[float], List[str], int, Optional[str]]
+# (director, cast, poster_url, trailer_url) from a movie detail page
+MetadataRow = Tuple[Optional[str], List[str], Optional[str], Optional[str]]
+
+SKIPPED_TITLES = ['即日上映', '即將上映', '戲院', '預告']
+
+
+def parse_time(time_text: str) -> str:
+    """Normalise 12-hour times such as 7:30 PM to 24-hour 19:30"""
+    time_match = re.search(r'(\d{1,2}):(\d{2})\s*(AM|PM)', time_text)
+    if not time_match:
+        return time_text.strip()
+    hour, minute, period = time_match.groups()
+    hour = int(hour)
+    if period == 'PM' and hour != 12:
+        hour += 12
+    elif period == 'AM' and hour == 12:
+        hour = 0
+    return f"{hour:02d}:{minute}"
+
+
+def parse_price(price_text: str) -> float:
+    """Parse ticket price from text"""
+    price_match = re.search(r'\$?(\d+)', price_text)
+    return float(price_match.group(1)) if price_match else 0.0
+
+
+def parse_seats(seats_text: str) -> str:
+    """Seats left from a cell such as "尚餘 45 個座位"; cells without a count (e.g. "已滿") are kept whole"""
+    count_match = re.search(r'\d+', seats_text)
+    if count_match:
+        return count_match.group()
+    return seats_text.strip() or "未知"
+
+
+def extract_genres(text: str) -> List[str]:
+    """Extract genres from the text after "片種:" """
+    match = re.search(r'片種:\s*(.*)', text)
+    if not match:
+        return []
+    return [genre.strip() for genre in match.group(1).split(',') if genre.strip()]
+
+
+def extract_popularity(text: str) -> int:
+    """Extract popularity count from text"""
+    match = re.search(r'人氣:\s*(\d+)', text)
+    return int(match.group(1)) if match else 0
+
+
+def clean_title(title_text: str) -> str:
+    """Movie name from a card heading such as "「鬼滅之刃」無限城篇 熱門 主打 好評" """
+    title = title_text.strip()
+    movie_match = re.match(r'「([^」]+)」', title)
+    if movie_match:
+        return movie_match.group(1)
+    parts = title.split()
+    return parts[0] if parts else ""
+
+
+def _select(backend: HtmlBackend, root, candidates: Sequence[str]) -> Tuple[Optional[str], list]:
+    """Elements for the first candidate selector that matches anything"""
+    for selector in candidates:
+        elements = backend.select(root, selector)
+        if elements:
+            return selector, elements
+    return None, []
+
+
+def _link_href(backend: HtmlBackend, node) -> Optional[str]:
+    """href of the first link inside node"""
+    link = backend.select_one(node, "a[href]")
+    return backend.attr(link, "href") if link is not None else None
+
+
+def parse_listing(html: str, candidates: Sequence[str],
+                  backend: Optional[str] = None) -> Tuple[Optional[str], List[CardRow]]:
+    """Movie cards on the showing page, with the card selector that matched"""
+    b = get_backend(backend)
+    selector, headings = _select(b, b.parse(html), candidates)
+
+    cards = []
+    for heading in headings:
+        title = clean_title(b.text(heading))
+        # Skip if title is too short or not a movie
+        if not title or len(title) < 2 or title in SKIPPED_TITLES:
+            continue
+
+        parent = b.parent(heading)
+        if parent is None:
+            continue
+        parent_text = b.text(parent, "\n")
+
+        rating = None
+        for rating_link in b.select(parent, "a"):
+            rating_text = b.text(rating_link)
+            if rating_text and rating_text.replace('.', '', 1).isdigit():
+                rating = float(rating_text)
+                break
+
+        cards.append((
+            title,
+            rating,
+            extract_genres(parent_text),
+            extract_popularity(parent_text),
+            _link_href(b, heading),
+        ))
+    return selector, cards
+
+
+def parse_detail_table(html: str, candidates: Sequence[str], show_date: str,
+                       backend: Optional[str] = None) -> Tuple[Optional[str], List[ShowtimeRow]]:
+    """Showtime rows from a movie detail page for one selected date"""
+    b = get_backend(backend)
+    selector, tables = _select(b, b.parse(html), candidates)
+    if not tables:
+        return selector, []
+
+    rows = []
+    for row in b.select(tables[0], "tr")[1:]:  # Skip header row
+        cells = b.select(row, "td")
+        if len(cells) < 5:
+            continue
+        # Hall is usually in parentheses after the cinema name
+        cinema_text = b.text(cells[0])
+        hall_match = re.search(r'\(([^)]+)\)', cinema_text)
+        rows.append((
+            re.sub(r'\s*\([^)]+\)', '', cinema_text).strip(),
+            hall_match.group(1) if hall_match else "",
+            parse_time(b.text(cells[1])),
+            show_date,
+            parse_seats(b.text(cells[2])),
+            parse_price(b.text(cells[3])),
+            _link_href(b, cells[4]),
+        ))
+    return selector, rows
+
+
+def parse_cinema_table(html: str, candidates: Sequence[str], cinema: str, show_date: str,
+                       backend: Optional[str] = None) -> Tuple[Optional[str], List[CinemaRow]]:
+    """(movie href, title, showtime row) from a cinema schedule page for one date"""
+    b = get_backend(backend)
+    selector, tables = _select(b, b.parse(html), candidates)
+    if not tables:
+        return selector, []
+
+    rows = []
+    for row in b.select(tables[0], "tr")[1:]:  # Skip header row
+        cells = b.select(row, "td")
+        if len(cells) < 6:
+            continue
+        # Columns: movie, hall, time, seats, price, booking
+        rows.append((
+            _link_href(b, cells[0]),
+            b.text(cells[0]),
+            (
+                cinema,
+                b.text(cells[1]),
+                parse_time(b.text(cells[2])),
+                show_date,
+                parse_seats(b.text(cells[3])),
+                parse_price(b.text(cells[4])),
+                _link_href(b, cells[5]),
+            ),
+        ))
+    return selector, rows
+
+
+def _labelled_text(text: str, labels: Sequence[str]) -> Optional[str]:
+    """Text following the first of `labels` (e.g. "導演:") up to the end of its line"""
+    for label in labels:
+        match = re.search(rf'{label}\s*[:：]\s*([^\n]+)', text)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def parse_metadata(html: str, backend: Optional[str] = None) -> MetadataRow:
+    """Director, cast, poster and trailer from a movie detail page"""
+    b = get_backend(backend)
+    root = b.parse(html)
+    text = b.text(root, "\n")
+
+    director = _labelled_text(text, ("導演", "Director"))
+    cast_text = _labelled_text(text, ("主演", "演員", "Cast"))
+    cast = [name.strip() for name in re.split(r'[,，、/]', cast_text)] if cast_text else []
+
+    poster = b.select_one(root, 'meta[property="og:image"]')
+    poster_url = b.attr(poster, "content") if poster is not None else None
+    if not poster_url:
+        image = b.select_one(root, 'img[class*="poster"], img[src*="poster"]')
+        poster_url = b.attr(image, "src") if image is not None else None
+
+    trailer_url = None
+    for element in b.select(root, 'iframe[src], a[href], video source[src]'):
+        link = b.attr(element, "src") or b.attr(element, "href")
+        if re.search(r'youtube\.com|youtu\.be|trailer|\.mp4', link, re.IGNORECASE):
+            trailer_url = link
+            break
+
+    return director or None, [name for name in cast if name], poster_url, trailer_url
+
+
+PARSERS: Dict[str, Callable[..., Any]] = {
+    "listing": parse_listing,
+    "detail": parse_detail_table,
+    "cinema": parse_cinema_table,
+    "metadata": parse_metadata,
+}
+
+
+def parse_batch(jobs: List[Tuple[str, tuple]], backend: Optional[str] = None) -> Tuple[List[Tuple[bool, Any]], float]:
+    """
+    Run a batch of parse jobs in a worker process
+    Each job yields (ok, result or error message), so one malformed page does
+    not fail the rest of its batch. Also returns the CPU time spent.
+    """
+    started = time.process_time()
+    results = []
+    for kind, args in jobs:
+        try:
+            results.append((True, PARSERS[kind](*args, backend=backend)))
+        except Exception as e:
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results, time.process_time() - started
+
+
+class ParseError(Exception):
+    """Raised when a page could not be parsed"""
+
+
+class ParsePool:
+    """
+    Parses fetched HTML in worker processes, off the event loop
+    Small pages are batched (up to batch_pages pages or batch_bytes of HTML, or
+    whatever arrived within `linger` seconds) so one IPC round trip carries
+    several pages; a page at least batch_bytes large is sent on its own. With
+    workers=0 pages are parsed inline on the calling thread. The HTML backend
+    is resolved here, once, and workers are told its name.
+    """
+
+    def __init__(self, workers: Optional[int] = None, backend: Optional[str] = None, batch_pages: int = 8,
+                 batch_bytes: int = 512 * 1024, linger: float = 0.005):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.backend = get_backend(backend).name
+        self.batch_pages = batch_pages
+        self.batch_bytes = batch_bytes
+        self.linger = linger
+        self.pages = 0
+        self.batches = 0
+        self.cpu_seconds = 0.0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._batch: List[Tuple[Tuple[str, tuple], asyncio.Future]] = []
+        self._batch_size = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned workers do not inherit the browser driver's threads and pipes
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def parse(self, kind: str, html: str, *args) -> Any:
+        """Parse one page with the named parser, returning its result"""
+        self.pages += 1
+        job = (kind, (html, *args))
+        if self.workers <= 0:
+            [(ok, result)], cpu = parse_batch([job], self.backend)
+            self.batches += 1
+            self.cpu_seconds += cpu
+            return self._unwrap(ok, result)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if len(html) >= self.batch_bytes:
+            self._submit([(job, future)])
+        else:
+            self._batch.append((job, future))
+            self._batch_size += len(html)
+            if len(self._batch) >= self.batch_pages or self._batch_size >= self.batch_bytes:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.linger, self._flush)
+        ok, result = await future
+        return self._unwrap(ok, result)
+
+    @staticmethod
+    def _unwrap(ok: bool, result: Any) -> Any:
+        if not ok:
+            raise ParseError(result)
+        return result
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._batch, self._batch_size = self._batch, [], 0
+        if batch:
+            self._submit(batch)
+
+    def _submit(self, batch: List[Tuple[Tuple[str, tuple], asyncio.Future]]):
+        self.batches += 1
+        loop = asyncio.get_running_loop()
+        try:
+            pending = loop.run_in_executor(self._pool(), parse_batch, [job for job, _ in batch], self.backend)
+        except Exception as e:
+            # Runs from a timer callback when flushing, so waiters must hear about it here
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        def deliver(done: asyncio.Future):
+            if done.cancelled():
+                error = asyncio.CancelledError()
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+                return
+            if done.exception() is not None:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(done.exception())
+                return
+            results, cpu = done.result()
+            self.cpu_seconds += cpu
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+        pending.add_done_callback(deliver)
+
+    async def close(self):
+        """Shut the worker processes down"""
+        self._flush()
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            # Joining the workers blocks until they exit; wait for it off the event loop
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "backend": self.backend,
+            "pages": self.pages,
+            "batches": self.batches,
+            "cpu_seconds": round(self.cpu_seconds, 2),
+        }
@@ -0,0 +1,40 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+
+def get_cache_dir() -> Path:
+    """Directory for checkpoints and caches, overridable with WMOOV_CACHE_DIR"""
+    override = os.environ.get("WMOOV_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "wmoov_scraper"
+
+
+def write_json_atomic(path: Path, data: Any, indent: Optional[int] = 2):
+    """
+    Write JSON through a temporary file and a rename
+    Readers see the old file or the new one, never half of either. The data is
+    fsynced before the rename, as checkpoint entries are, so a crash cannot
+    leave an empty file in place of the old one. The temporary file is named
+    per thread, so concurrent writers do not collide.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_json(path: Path, default: Any = None) -> Any:
+    """JSON read from path, or default when the file is missing or unreadable"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
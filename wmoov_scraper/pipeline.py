@@ -0,0 +1,91 @@
+import asyncio
+import time
+import logging
+from typing import Any, Awaitable, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """
+    A pool of workers draining one bounded queue
+    Putting into a full queue waits, so a slow stage holds back the stages
+    feeding it instead of letting work pile up in memory.
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], Awaitable[None]], workers: int = 1, maxsize: int = 0):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.processed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.max_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+
+    async def put(self, item: Any):
+        depth = self.queue.qsize()
+        self.max_depth = max(self.max_depth, depth)
+        self._depth_total += depth
+        self._depth_samples += 1
+        await self.queue.put(item)
+
+    async def _work(self):
+        while True:
+            item = await self.queue.get()
+            started = time.monotonic()
+            try:
+                await self.handler(item)
+            except Exception as e:
+                self.failed += 1
+                logger.warning(f"{self.name} stage failed on an item: {e!r}")
+            finally:
+                self.busy_seconds += time.monotonic() - started
+                self.processed += 1
+                self.queue.task_done()
+
+    def snapshot(self, elapsed: float) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": self.failed,
+            "max_depth": self.max_depth,
+            "mean_depth": round(self._depth_total / self._depth_samples, 1) if self._depth_samples else 0.0,
+            # Share of worker time spent handling items; a saturated stage is the bottleneck
+            "utilization": round(self.busy_seconds / (self.workers * elapsed), 2) if elapsed > 0 else 0.0,
+        }
+
+
+class Pipeline:
+    """
+    Stages joined by bounded queues
+    The source coroutine feeds the first stage while later stages already
+    run. Stages are drained in order, so by the time a stage's queue is empty
+    everything it produced has been handed downstream.
+    """
+
+    def __init__(self, *stages: Stage):
+        self.stages: List[Stage] = list(stages)
+        self.elapsed = 0.0
+
+    async def run(self, source: Callable[[], Awaitable[None]]):
+        started = time.monotonic()
+        workers = [
+            asyncio.ensure_future(stage._work())
+            for stage in self.stages
+            for _ in range(stage.workers)
+        ]
+        try:
+            await source()
+            for stage in self.stages:
+                await stage.queue.join()
+        finally:
+            self.elapsed = time.monotonic() - started
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {stage.name: stage.snapshot(self.elapsed) for stage in self.stages}
@@ -0,0 +1,129 @@
+import time
+import logging
+import importlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .models import Movie
+from .paths import get_cache_dir, load_json, write_json_atomic
+from .date_utils import get_current_datetime, parse_showtime_datetime
+
+logger = logging.getLogger(__name__)
+
+# Upcoming show times remembered per movie; only the soonest ones matter
+KEPT_SHOWS = 20
+# Weights of the default score; each term is scaled to 0..1 first
+POPULARITY_WEIGHT = 0.4
+RATING_WEIGHT = 0.2
+NEW_WEIGHT = 0.2
+SOON_WEIGHT = 0.2
+
+
+class RunHistory:
+    """
+    What earlier runs saw, keyed by movie ID
+    Remembers each movie's upcoming show times so the next run can tell which
+    movies are new and which screen soonest before any detail page loads.
+    """
+
+    def __init__(self, history_path: Optional[str] = None):
+        self.history_path = Path(history_path) if history_path else get_cache_dir() / "history.json"
+        self.entries: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        return load_json(self.history_path, {})
+
+    def seen(self, movie_id: str) -> bool:
+        return movie_id in self.entries
+
+    def next_show(self, movie_id: str, now: datetime) -> Optional[datetime]:
+        """The earliest remembered show time that has not started yet"""
+        for stamp in self.entries.get(movie_id, {}).get("shows", []):
+            show = datetime.fromisoformat(stamp)
+            if show >= now:
+                return show
+        return None
+
+    def record(self, movies: List[Movie]):
+        """Remember this run's movies and their show times"""
+        for movie in movies:
+            shows = {parse_showtime_datetime(showtime.date, showtime.time) for showtime in movie.showtimes}
+            shows.discard(None)
+            entry = self.entries.setdefault(movie.movie_id, {"title": movie.title})
+            entry["seen_at"] = time.time()
+            if shows:
+                entry["shows"] = [show.isoformat() for show in sorted(shows)[:KEPT_SHOWS]]
+
+    def save(self):
+        write_json_atomic(self.history_path, self.entries)
+
+
+@dataclass
+class PriorityContext:
+    """Listing-wide facts a priority function may need"""
+    now: datetime
+    history: RunHistory
+    max_popularity: int
+
+
+PriorityFunction = Callable[[Movie, PriorityContext], float]
+
+
+def default_priority(movie: Movie, context: PriorityContext) -> float:
+    """Popular, well rated, new and soon-screening movies first"""
+    popularity = movie.popularity / context.max_popularity if context.max_popularity else 0.0
+    rating = (movie.rating or 0.0) / 10
+    new = 0.0 if context.history.seen(movie.movie_id) else 1.0
+    next_show = context.history.next_show(movie.movie_id, context.now)
+    if next_show is not None:
+        # A show within the day scores near 1, one a week out about 1/8
+        soon = 1 / (1 + (next_show - context.now).total_seconds() / 86400)
+    else:
+        soon = 0.5
+    return POPULARITY_WEIGHT * popularity + RATING_WEIGHT * rating + NEW_WEIGHT * new + SOON_WEIGHT * soon
+
+
+def listing_priority(movie: Movie, context: PriorityContext) -> float:
+    """Keep the site's listing order"""
+    return 0.0
+
+
+BUILTIN_PRIORITIES: Dict[str, PriorityFunction] = {
+    "default": default_priority,
+    "listing": listing_priority,
+}
+
+
+def load_priority(spec: Optional[str]) -> PriorityFunction:
+    """A built-in priority by name, or any function given as module:function"""
+    if not spec:
+        return default_priority
+    if spec in BUILTIN_PRIORITIES:
+        return BUILTIN_PRIORITIES[spec]
+    module_name, _, function_name = spec.partition(":")
+    if not function_name:
+        raise ValueError(f"Unknown priority {spec!r}; use {', '.join(BUILTIN_PRIORITIES)} or module:function")
+    function = getattr(importlib.import_module(module_name), function_name, None)
+    if not callable(function):
+        raise ValueError(f"{spec} is not a function")
+    return function
+
+
+def prioritize(movies: List[Movie], priority: PriorityFunction, history: RunHistory,
+               now: Optional[datetime] = None) -> List[Movie]:
+    """Movies ordered by priority, highest first; ties keep listing order"""
+    context = PriorityContext(
+        now=now or get_current_datetime(),
+        history=history,
+        max_popularity=max((movie.popularity for movie in movies), default=0),
+    )
+    scores = {}
+    for movie in movies:
+        try:
+            scores[movie.movie_id] = float(priority(movie, context))
+        except Exception as e:
+            logger.warning(f"Priority function failed for {movie.title}: {e!r}")
+            scores[movie.movie_id] = 0.0
+    return sorted(movies, key=lambda movie: -scores[movie.movie_id])
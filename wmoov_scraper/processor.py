@@ -1,22 +1,95 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import logging
-from datetime import datetime
-from rich.console import Console
+import time
+from collections import deque
+from datetime import date, datetime
+from rich.console import Console, Group
+from rich.live import Live
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
 from rich.table import Table
 from rich.panel import Panel
+from rich.text import Text
 
-from .models import Movie, Showtime
+from .models import Movie, Showtime, STATUS_COMPLETE
+from .metrics import RunMetrics
 from .date_utils import get_current_date, get_weekend_dates
 
 logger = logging.getLogger(__name__)
 
+# One console for all output, so live displays and plain prints share a terminal
+console = Console()
+
+# Detail panels printed in full before the rest are collapsed into one table
+DETAIL_PANELS = 20
+# Rows kept on screen by the live view; older ones scroll out of the window
+LIVE_WINDOW = 15
+
+
+class LiveMovieView:
+    """
+    Live display that grows as movies finish scraping
+    Each movie is formatted once when it arrives, and only the newest
+    LIVE_WINDOW rows are redrawn, so a refresh costs the same for ten movies
+    or a full week's crawl.
+    """
+    
+    def __init__(self, window: int = LIVE_WINDOW):
+        self.rows = deque(maxlen=window)
+        self.movies = 0
+        self.showtimes = 0
+        self.incomplete = 0
+        self.started = time.monotonic()
+        self.progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[bold blue]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            TimeElapsedColumn(),
+            console=console
+        )
+        self.task = self.progress.add_task("Scraping movies", total=None)
+        self.live = Live(console=console, refresh_per_second=4, get_renderable=self._render)
+    
+    def set_total(self, total: int):
+        """Number of movies the listing produced"""
+        self.progress.update(self.task, total=total)
+    
+    def add_movie(self, movie: Movie):
+        """Record one finished movie"""
+        self.rows.append(DataProcessor._movie_row(movie))
+        self.movies += 1
+        self.showtimes += len(movie.showtimes)
+        if movie.scrape_status != STATUS_COMPLETE:
+            self.incomplete += 1
+        self.progress.advance(self.task)
+    
+    def _render(self):
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        stats = Text(
+            f"🎭 {self.movies} movies, ⏰ {self.showtimes} showtimes "
+            f"({self.movies / elapsed:.2f} movies/s, {self.showtimes / elapsed:.1f} showtimes/s)"
+        )
+        if self.incomplete:
+            stats.append(f", ⚠️  {self.incomplete} incomplete", style="yellow")
+        
+        table = DataProcessor._movies_table(title=f"🎬 Latest {len(self.rows)} movies")
+        for row in list(self.rows):
+            table.add_row(*row)
+        return Group(self.progress, stats, table)
+    
+    def __enter__(self) -> "LiveMovieView":
+        self.live.start()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.live.stop()
+
 
 class DataProcessor:
     @staticmethod
-    def format_for_display(movies: List[Movie]) -> Dict[str, Any]:
-        """Format movie data for display"""
-        current_date = get_current_date()
-        weekend_dates = get_weekend_dates(current_date)
+    def format_for_display(movies: List[Movie], dates: Optional[List[date]] = None) -> Dict[str, Any]:
+        """Format movie data for display; dates default to the coming weekend"""
+        weekend_dates = dates or get_weekend_dates(get_current_date())
         
         return {
             "scraped_at": datetime.now().isoformat(),
@@ -26,73 +99,84 @@ class DataProcessor:
         }
     
     @staticmethod
-    def display_movies_table(movies: List[Movie]):
-        """Display movies in a formatted table"""
-        if not movies:
-            console = Console()
-            console.print("[yellow]No movies found with weekend showtimes.[/yellow]")
-            return
-        
-        console = Console()
-        
-        # Create main table
-        table = Table(title="🎬 Weekend Movies - WMOOV", show_header=True, header_style="bold magenta")
+    def _movies_table(title: str = "🎬 Weekend Movies - WMOOV") -> Table:
+        table = Table(title=title, show_header=True, header_style="bold magenta")
         table.add_column("Movie Title", style="cyan", width=30)
         table.add_column("Rating", style="green", width=8)
         table.add_column("Genres", style="yellow", width=20)
         table.add_column("Cinemas", style="blue", width=25)
         table.add_column("Showtimes", style="magenta", width=30)
         table.add_column("Price Range", style="red", width=12)
+        return table
+    
+    @staticmethod
+    def _movie_row(movie: Movie) -> Tuple[str, ...]:
+        """Table cells for one movie"""
+        # Format rating
+        rating_str = f"{movie.rating}" if movie.rating else "N/A"
+        
+        # Format genres
+        genres_str = ", ".join(movie.genres[:3])  # Show first 3 genres
+        if len(movie.genres) > 3:
+            genres_str += "..."
+        
+        # Format cinemas and showtimes
+        cinema_showtimes = {}
+        for showtime in movie.showtimes:
+            if showtime.cinema not in cinema_showtimes:
+                cinema_showtimes[showtime.cinema] = []
+            cinema_showtimes[showtime.cinema].append(showtime.time)
+        
+        cinemas_str = ", ".join(list(cinema_showtimes.keys())[:3])  # Show first 3 cinemas
+        if len(cinema_showtimes) > 3:
+            cinemas_str += "..."
+        
+        # Format showtimes
+        all_showtimes = []
+        for cinema, times in cinema_showtimes.items():
+            all_showtimes.extend([f"{cinema}: {t}" for t in times[:2]])  # Show 2 times per cinema
+        if len(all_showtimes) > 6:  # Limit total showtimes displayed
+            all_showtimes = all_showtimes[:6] + ["..."]
+        
+        showtimes_str = "\n".join(all_showtimes[:4])  # Show first 4 in table
+        
+        # Calculate price range
+        prices = [s.price for s in movie.showtimes]
+        min_price = min(prices) if prices else 0
+        max_price = max(prices) if prices else 0
+        price_str = f"${min_price}-{max_price}" if min_price != max_price else f"${min_price}"
+        
+        title = movie.title if movie.scrape_status == STATUS_COMPLETE else f"{movie.title} ⚠️"
+        
+        return (
+            title[:29],  # Truncate if too long
+            rating_str,
+            genres_str[:19],  # Truncate if too long
+            cinemas_str[:24],  # Truncate if too long
+            showtimes_str[:29],  # Truncate if too long
+            price_str
+        )
+    
+    @staticmethod
+    def display_movies_table(movies: List[Movie], detail_panels: Optional[int] = DETAIL_PANELS,
+                             dates: Optional[List[date]] = None):
+        """Display movies in a formatted table, summarised over the scraped dates (default: this weekend)"""
+        if not movies:
+            console.print("[yellow]No movies found with weekend showtimes.[/yellow]")
+            return
         
+        table = DataProcessor._movies_table()
         for movie in movies:
-            # Format rating
-            rating_str = f"{movie.rating}" if movie.rating else "N/A"
-            
-            # Format genres
-            genres_str = ", ".join(movie.genres[:3])  # Show first 3 genres
-            if len(movie.genres) > 3:
-                genres_str += "..."
-            
-            # Format cinemas and showtimes
-            cinema_showtimes = {}
-            for showtime in movie.showtimes:
-                if showtime.cinema not in cinema_showtimes:
-                    cinema_showtimes[showtime.cinema] = []
-                cinema_showtimes[showtime.cinema].append(showtime.time)
-            
-            cinemas_str = ", ".join(list(cinema_showtimes.keys())[:3])  # Show first 3 cinemas
-            if len(cinema_showtimes) > 3:
-                cinemas_str += "..."
-            
-            # Format showtimes
-            all_showtimes = []
-            for cinema, times in cinema_showtimes.items():
-                all_showtimes.extend([f"{cinema}: {t}" for t in times[:2]])  # Show 2 times per cinema
-            if len(all_showtimes) > 6:  # Limit total showtimes displayed
-                all_showtimes = all_showtimes[:6] + ["..."]
-            
-            showtimes_str = "\n".join(all_showtimes[:4])  # Show first 4 in table
-            
-            # Calculate price range
-            prices = [s.price for s in movie.showtimes]
-            min_price = min(prices) if prices else 0
-            max_price = max(prices) if prices else 0
-            price_str = f"${min_price}-{max_price}" if min_price != max_price else f"${min_price}"
-            
-            table.add_row(
-                movie.title[:29],  # Truncate if too long
-                rating_str,
-                genres_str[:19],  # Truncate if too long
-                cinemas_str[:24],  # Truncate if too long
-                showtimes_str[:29],  # Truncate if too long
-                price_str
-            )
+            table.add_row(*DataProcessor._movie_row(movie))
         
         console.print(table)
         
         # Print summary information
-        weekend_dates = get_weekend_dates(get_current_date())
-        summary_text = f"📅 Weekend: {weekend_dates[0].strftime('%Y-%m-%d')} to {weekend_dates[1].strftime('%Y-%m-%d')}\n"
+        dates = sorted(dates or get_weekend_dates(get_current_date()))
+        if len(dates) == 1:
+            summary_text = f"📅 Date: {dates[0].strftime('%Y-%m-%d')}\n"
+        else:
+            summary_text = f"📅 Dates: {dates[0].strftime('%Y-%m-%d')} to {dates[-1].strftime('%Y-%m-%d')}\n"
         summary_text += f"🎭 Total Movies: {len(movies)}\n"
         summary_text += f"⏰ Total Showtimes: {sum(len(m.showtimes) for m in movies)}\n"
         summary_text += f"🕒 Scraped: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
@@ -100,17 +184,37 @@ class DataProcessor:
         summary_panel = Panel(summary_text, title="📊 Summary", border_style="blue")
         console.print(summary_panel)
         
-        # Print detailed showtimes for each movie
+        # Print detailed showtimes for each movie, collapsing the rest after a page of panels
+        with_showtimes = [movie for movie in movies if movie.showtimes]
+        shown = with_showtimes if detail_panels is None else with_showtimes[:detail_panels]
+        for movie in shown:
+            movie_panel = DataProcessor._create_movie_detail_panel(movie)
+            console.print(movie_panel)
+        collapsed = with_showtimes[len(shown):]
+        if collapsed:
+            console.print(DataProcessor._collapsed_details(collapsed))
+    
+    @staticmethod
+    def _collapsed_details(movies: List[Movie]) -> Table:
+        """One line per movie instead of a full detail panel"""
+        table = Table(title=f"📋 {len(movies)} more movies", show_header=True, header_style="bold cyan")
+        table.add_column("Movie Title", style="cyan")
+        table.add_column("Showtimes", style="magenta", justify="right")
+        table.add_column("Cinemas", style="blue", justify="right")
+        table.add_column("First Show", style="white")
         for movie in movies:
-            if movie.showtimes:
-                movie_panel = DataProcessor._create_movie_detail_panel(movie)
-                console.print(movie_panel)
+            first = min(movie.showtimes, key=lambda s: (s.date, s.time))
+            table.add_row(
+                movie.title,
+                str(len(movie.showtimes)),
+                str(len({s.cinema for s in movie.showtimes})),
+                f"{first.date} {first.time} {first.cinema}"
+            )
+        return table
     
     @staticmethod
     def _create_movie_detail_panel(movie: Movie) -> Panel:
         """Create detailed panel for individual movie"""
-        from rich.text import Text
-        
         # Format showtimes by cinema
         cinema_info = {}
         for showtime in movie.showtimes:
@@ -136,14 +240,107 @@ class DataProcessor:
         
         return Panel(details, title=f"📋 {movie.title}", border_style="cyan")
     
+    @staticmethod
+    def display_run_metrics(metrics: RunMetrics):
+        """Display run metrics such as page loads and governor state"""
+        metrics_text = f"⏱️  Duration: {metrics.duration:.1f}s\n"
+        kinds = ", ".join(f"{count} {kind}" for kind, count in metrics.page_loads_by_kind.items())
+        metrics_text += f"📄 Page loads: {metrics.page_loads} ({kinds}) using {metrics.strategy} strategy"
+        for strategy, estimate in metrics.estimated_page_loads.items():
+            metrics_text += f"\n   {strategy} strategy would need ~{estimate} page loads"
+        for host, state in metrics.governor.items():
+            metrics_text += (
+                f"\n🚦 {host}: {state['rate']} req/s, concurrency {state['concurrency']}"
+                f" ({state['throttled']} throttled, {state['timeouts']} timeouts)"
+            )
+        if metrics.movie_status:
+            statuses = ", ".join(f"{count} {status}" for status, count in metrics.movie_status.items())
+            metrics_text += f"\n🎞️  Detail pages: {statuses} ({metrics.retries} retries, {metrics.hedged} hedged)"
+        for name, stage in metrics.pipeline.items():
+            metrics_text += (
+                f"\n🧵 {name} stage: {stage['processed']} items on {stage['workers']} workers, "
+                f"{stage['utilization']:.0%} busy, queue depth {stage['mean_depth']} avg / {stage['max_depth']} max"
+            )
+        if metrics.selectors:
+            metrics_text += (
+                f"\n🎯 Selector lookups: {metrics.selectors['probes']} queries, "
+                f"{metrics.selectors['hits']} cached hits"
+            )
+        if metrics.parse.get("pages"):
+            metrics_text += (
+                f"\n🧩 Parsed {metrics.parse['pages']} pages in {metrics.parse['batches']} batches "
+                f"on {metrics.parse['workers'] or 'no'} workers with {metrics.parse['backend']} "
+                f"({metrics.parse['cpu_seconds']}s CPU)"
+            )
+        if metrics.metadata.get("cached") or metrics.metadata.get("extracted"):
+            metrics_text += (
+                f"\n🏷️  Movie metadata: {metrics.metadata['cached']} from cache, "
+                f"{metrics.metadata['extracted']} extracted"
+            )
+        if metrics.assets:
+            metrics_text += (
+                f"\n🖼️  Posters: {metrics.assets['downloaded']} downloaded, "
+                f"{metrics.assets['not_modified']} unchanged, {metrics.assets['deduplicated']} duplicates, "
+                f"{metrics.assets['thumbnails']} thumbnails, {metrics.assets['failed']} failed"
+            )
+        if metrics.archive:
+            ratio = f", {metrics.archive['ratio']}x {metrics.archive['codec']}" if metrics.archive['ratio'] else ""
+            metrics_text += (
+                f"\n🗄️  Archived {metrics.archive['stored']} new pages "
+                f"({metrics.archive['deduplicated']} duplicates skipped{ratio})"
+            )
+        if metrics.loop:
+            loop = metrics.loop
+            metrics_text += (
+                f"\n🔁 Event loop ({loop['loop']}): lag p50 {loop['p50_ms']} ms, p95 {loop['p95_ms']} ms, "
+                f"p99 {loop['p99_ms']} ms, max {loop['max_ms']} ms; "
+                f"{loop['stalls']} stalls over {loop['slow_threshold_ms']} ms"
+            )
+            for stall in loop['slowest'][:3]:
+                where = stall['stack'][0] if stall['stack'] else "unknown callback"
+                metrics_text += f"\n   {stall['lag_ms']:.0f} ms in {where}"
+        if metrics.traces_saved:
+            metrics_text += f"\n🔎 Traces saved for slow or failed pages: {metrics.traces_saved}"
+        for entry in metrics.incomplete_movies:
+            metrics_text += f"\n[yellow]⚠️  {entry}[/yellow]"
+        
+        console.print(Panel(metrics_text, title="📈 Run Metrics", border_style="green"))
+    
+    @staticmethod
+    def display_profile(report):
+        """Display the hottest functions of a profiled run and where the profile was written"""
+        table = Table(
+            title=f"🔥 Hot functions ({report.samples} samples over {report.duration:.1f}s)",
+            show_header=True, header_style="bold red"
+        )
+        table.add_column("Function", style="cyan")
+        table.add_column("Self", style="magenta", justify="right")
+        table.add_column("Total", style="blue", justify="right")
+        samples = report.samples or 1
+        for label, own, total in report.hot:
+            table.add_row(label, f"{own / samples:.1%}", f"{total / samples:.1%}")
+        console.print(table)
+        for path in report.files:
+            console.print(f"📊 Profile written to {path}")
+    
+    @staticmethod
+    def display_seat_changes(movie: Movie, changes: List[Tuple[Showtime, Optional[Showtime]]]):
+        """Print seat availability changes found by the watch mode"""
+        stamp = datetime.now().strftime('%H:%M:%S')
+        for showtime, previous in changes:
+            before = previous.available_seats if previous else "new"
+            console.print(
+                f"[dim]{stamp}[/dim] 🎟️  [cyan]{movie.title}[/cyan] "
+                f"{showtime.date} {showtime.time} {showtime.cinema} {showtime.hall}: "
+                f"{before} → [bold]{showtime.available_seats}[/bold]"
+            )
+    
     @staticmethod
     def display_error(error_message: str):
         """Display error message"""
-        console = Console()
         console.print(f"[bold red]❌ Error: {error_message}[/bold red]")
     
     @staticmethod
     def display_no_data():
         """Display message when no data is available"""
-        console = Console()
         console.print("[yellow]ℹ️  No weekend movie data available.[/yellow]")
\ No newline at end of file
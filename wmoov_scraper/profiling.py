@@ -0,0 +1,145 @@
+import os
+import sys
+import time
+import logging
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 0.005
+# Stacks deeper than this are cut at the root end; the leaves are what matter
+MAX_DEPTH = 128
+
+
+def frame_label(code) -> str:
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+@dataclass
+class ProfileReport:
+    """What a profiled run leaves behind"""
+    samples: int
+    duration: float
+    # (function, self samples, total samples) for the event loop thread
+    hot: List[Tuple[str, int, int]] = field(default_factory=list)
+    files: List[str] = field(default_factory=list)
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler
+    A daemon thread reads every thread's current stack from
+    sys._current_frames() at a fixed interval. Coroutine frames sit on the
+    stack while a task runs, so async code is attributed to the coroutine that
+    was executing; samples taken while the loop waits on I/O end in the
+    selector. Stacks are kept in collapsed form (one "root;...;leaf count" line
+    each), which flamegraph.pl, speedscope and inferno read directly.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.duration = 0.0
+        self._target = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample_loop, name="wmoov-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self._started
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                labels = []
+                while frame is not None and len(labels) < MAX_DEPTH:
+                    labels.append(frame_label(frame.f_code))
+                    frame = frame.f_back
+                labels.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[(ident == self._target, tuple(reversed(labels)))] += 1
+            self.samples += 1
+
+    def write_collapsed(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for (_, stack), count in self.stacks.most_common():
+                f.write(";".join(label.replace(";", ",") for label in stack) + f" {count}\n")
+
+    def hot_functions(self, top: int = 15) -> List[Tuple[str, int, int]]:
+        """Functions of the event loop thread by self samples, with their inclusive samples"""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for (on_loop, stack), count in self.stacks.items():
+            if not on_loop:
+                continue
+            # The root is the thread name, not a function
+            frames = stack[1:]
+            if frames:
+                own[frames[-1]] += count
+            for label in set(frames):
+                total[label] += count
+        return [(label, count, total[label]) for label, count in own.most_common(top)]
+
+
+class RunProfiler:
+    """
+    Profiles everything run inside it
+    The sampler always runs and writes <prefix>.folded; with use_cprofile the
+    deterministic profiler also runs on the calling thread and writes
+    <prefix>.pstats for snakeviz or pstats.
+    """
+
+    def __init__(self, prefix: str, interval: float = DEFAULT_INTERVAL, use_cprofile: bool = False, top: int = 15):
+        self.prefix = prefix
+        self.top = top
+        self.sampler = SamplingProfiler(interval)
+        self.cprofile = None
+        if use_cprofile:
+            import cProfile
+            self.cprofile = cProfile.Profile()
+        self.report: Optional[ProfileReport] = None
+
+    def __enter__(self) -> "RunProfiler":
+        self.sampler.start()
+        if self.cprofile is not None:
+            self.cprofile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        self.sampler.stop()
+        self.report = ProfileReport(
+            samples=self.sampler.samples,
+            duration=self.sampler.duration,
+            hot=self.sampler.hot_functions(self.top),
+        )
+        try:
+            os.makedirs(os.path.dirname(self.prefix) or ".", exist_ok=True)
+            folded = f"{self.prefix}.folded"
+            self.sampler.write_collapsed(folded)
+            self.report.files.append(folded)
+            if self.cprofile is not None:
+                pstats_path = f"{self.prefix}.pstats"
+                self.cprofile.dump_stats(pstats_path)
+                self.report.files.append(pstats_path)
+        except OSError as e:
+            logger.error(f"Could not write profile: {e}")
+        return False
+
@@ -0,0 +1,39 @@
+import random
+import time
+from typing import Optional
+
+
+class RunDeadline:
+    """
+    Run-level time budget shared out between movies
+    Each movie gets an even share of the remaining time across the pending
+    movies that can run in parallel, capped by a per-movie timeout.
+    """
+
+    def __init__(self, total_seconds: Optional[float] = None, movie_timeout: float = 60.0):
+        self.started = time.monotonic()
+        self.total_seconds = total_seconds
+        self.movie_timeout = movie_timeout
+
+    def remaining(self) -> float:
+        if self.total_seconds is None:
+            return float('inf')
+        return self.total_seconds - (time.monotonic() - self.started)
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def movie_budget(self, pending: int, parallelism: int) -> float:
+        """Time allowed for the next movie attempt"""
+        remaining = self.remaining()
+        if remaining <= 0:
+            return 0.0
+        if remaining == float('inf'):
+            return self.movie_timeout
+        rounds = max(1.0, pending / max(1, parallelism))
+        return min(self.movie_timeout, max(remaining / rounds, min(remaining, 5.0)))
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 10.0) -> float:
+    """Exponential backoff with full jitter"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
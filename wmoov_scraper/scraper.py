@@ -1,29 +1,117 @@
 import asyncio
 import re
-from typing import List, Optional, Dict, Any
-from datetime import datetime, date
-from playwright.async_api import async_playwright, Page
-from bs4 import BeautifulSoup
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, List, Optional, Dict, Tuple
+from datetime import date
+from urllib.parse import urljoin, urlparse
+from playwright.async_api import async_playwright, ElementHandle, Page
 import logging
 
-from .models import Movie, Showtime
-from .date_utils import get_current_date, get_weekend_dates
+from .models import Movie, Showtime, STATUS_COMPLETE, STATUS_PARTIAL, STATUS_FAILED
+from .date_utils import find_date_option, format_date_label, get_current_date, get_weekend_dates
+from .governor import RateGovernor
+from .metrics import RunMetrics
+from .scheduling import RunDeadline, backoff_delay
+from .checkpoint import CheckpointStore
+from .tracing import TraceSampler
+from .selector_resolver import SelectorResolver
+from .parsing import ParsePool
+from .archive import PageArchive
+from .metadata import MetadataCache, DEFAULT_TTL
+from .pipeline import Pipeline, Stage
+from .assets import AssetFetcher, AssetStore
+from .loop_monitor import LoopMonitor, DEFAULT_SLOW_THRESHOLD
+from .priority import PriorityFunction, RunHistory, default_priority, prioritize
+from .identity import MovieIndex, normalize_title, site_movie_id, stable_movie_id
 
 logger = logging.getLogger(__name__)
 
+# (selected date, page HTML) captured from a detail page; a None date only carries metadata
+DetailPage = Tuple[Optional[date], str]
+# (site movie ID, title, showtime) read from a cinema schedule page
+CinemaRow = Tuple[Optional[str], str, Showtime]
+
+
+class PageLoadError(Exception):
+    """Raised when a page load is rejected or throttled by the site"""
+
+
+class PageStructureError(Exception):
+    """Raised when an expected page element is missing; not worth retrying"""
+
 
 class WMOOVScraper:
-    def __init__(self, headless: bool = True):
+    def __init__(
+        self,
+        headless: bool = True,
+        max_concurrency: int = 4,
+        rate: float = 2.0,
+        run_timeout: Optional[float] = None,
+        movie_timeout: float = 60.0,
+        retries: int = 2,
+        hedge_after: Optional[float] = None,
+        checkpoint_enabled: bool = True,
+        checkpoint_dir: Optional[str] = None,
+        resume: bool = False,
+        strategy: str = "movie",
+        trace_dir: Optional[str] = None,
+        trace_slow: float = 15.0,
+        trace_quota_mb: float = 200.0,
+        selector_cache: Optional[str] = None,
+        parse_workers: Optional[int] = None,
+        html_parser: Optional[str] = None,
+        archive_dir: Optional[str] = None,
+        metadata_cache: Optional[str] = None,
+        metadata_ttl: float = DEFAULT_TTL,
+        assets_dir: Optional[str] = None,
+        asset_concurrency: int = 8,
+        thumbnail_size: Optional[int] = None,
+        loop_monitor: bool = False,
+        slow_callback: float = DEFAULT_SLOW_THRESHOLD,
+        priority: Optional[PriorityFunction] = None,
+        history_path: Optional[str] = None,
+    ):
         self.headless = headless
+        self.max_concurrency = max_concurrency
+        self.run_timeout = run_timeout
+        self.movie_timeout = movie_timeout
+        self.retries = retries
+        self.hedge_after = hedge_after
+        self.checkpoint_enabled = checkpoint_enabled
+        self.checkpoint_dir = checkpoint_dir
+        self.resume = resume
+        self.strategy = strategy
+        self.tracer = TraceSampler(trace_dir, trace_slow, trace_quota_mb) if trace_dir else None
+        self.selectors = SelectorResolver(selector_cache)
+        self.parser = ParsePool(parse_workers, html_parser)
+        self.archive = PageArchive(archive_dir) if archive_dir else None
+        self.metadata = MetadataCache(metadata_cache, metadata_ttl)
+        self.assets_dir = assets_dir
+        self.asset_concurrency = asset_concurrency
+        self.thumbnail_size = thumbnail_size
+        self.loop_monitor = LoopMonitor(slow_threshold=slow_callback) if loop_monitor else None
+        self.priority = priority or default_priority
+        self.history = RunHistory(history_path)
         self.base_url = "https://wmoov.com"
         self.showing_url = f"{self.base_url}/movie/showing"
+        self.cinema_url = f"{self.base_url}/cinema"
         self.page: Optional[Page] = None
         self.playwright = None
         self.browser = None
         self.context = None
+        self.governor = RateGovernor(rate=rate, max_concurrency=max_concurrency)
+        self.metrics = RunMetrics()
+        self.deadline = RunDeadline(run_timeout, movie_timeout)
+        self._pending = 0
+        # Progress hooks for live displays: listing size, then each finished movie
+        self.on_listing: Optional[Callable[[int], None]] = None
+        self.on_movie: Optional[Callable[[Movie], None]] = None
         
     async def initialize(self):
         """Initialize Playwright browser"""
+        if self.loop_monitor:
+            self.loop_monitor.start()
         try:
             self.playwright = await async_playwright().start()
             self.browser = await self.playwright.chromium.launch(headless=self.headless)
@@ -40,195 +128,308 @@ class WMOOVScraper:
             await self.browser.close()
         if self.playwright:
             await self.playwright.stop()
+        await self.parser.close()
+        if self.archive:
+            self.archive.close()
+        if self.loop_monitor:
+            await self.loop_monitor.stop()
         logger.info("Browser closed")
     
-    async def scrape_weekend_movies(self) -> List[Movie]:
+    async def scrape_weekend_movies(self, dates: Optional[List[date]] = None) -> List[Movie]:
         """Scrape movies with weekend showtimes"""
         try:
             # Get current date and calculate weekend
-            current_date = get_current_date()
-            weekend_dates = get_weekend_dates(current_date)
-            logger.info(f"Scraping for weekend: {weekend_dates[0]} to {weekend_dates[1]}")
+            weekend_dates = dates or get_weekend_dates(get_current_date())
+            logger.info(f"Scraping for weekend: {weekend_dates[0]} to {weekend_dates[-1]}")
             
-            # Navigate to showing movies page
-            await self.page.goto(self.showing_url)
-            await self.page.wait_for_load_state('networkidle')
+            self.deadline = RunDeadline(self.run_timeout, self.movie_timeout)
             
-            # Extract movie elements
-            movie_elements = await self.page.query_selector_all('h3')
-            logger.info(f"Found {len(movie_elements)} movie elements using h3 selector")
+            listing: List[Movie] = []
+            completed: Dict[str, Movie] = {}
+            pending_movies: List[Movie] = []
+            checkpoint = None
+            if self.checkpoint_enabled:
+                checkpoint = CheckpointStore(weekend_dates, self.checkpoint_dir)
+                if not self.resume:
+                    checkpoint.reset()
+            self.metrics.strategy = self.strategy
+            # Posters are fetched over a pooled request context, through the same host governor
+            assets = None
+            if self.assets_dir:
+                assets = AssetFetcher(
+                    await self.playwright.request.new_context(), AssetStore(self.assets_dir),
+                    self.governor, self.thumbnail_size
+                )
             
-            movies = []
-            for i, element in enumerate(movie_elements):
-                try:
-                    # Extract title directly without navigating
-                    title_text = await element.inner_text()
-                    title = title_text.strip()
-                    
-                    # Clean up title - extract just the movie name
-                    # Format: "「鬼滅之刃」無限城篇 熱門 主打 好評"
-                    import re
-                    movie_match = re.match(r'「([^」]+)」', title)
-                    if movie_match:
-                        title = movie_match.group(1)
-                    else:
-                        # Try to extract without quotes
-                        parts = title.split()
-                        if len(parts) > 0:
-                            title = parts[0]
-                    
-                    # Skip if title is too short or not a movie
-                    if not title or len(title) < 2 or title in ['即日上映', '即將上映', '戲院', '預告']:
-                        continue
-                    
-                    logger.debug(f"Processing movie {i+1}/{len(movie_elements)}: {title}")
-                    
-                    # Find the actual movie link from the h3 element
-                    movie_link = await element.query_selector('a')
-                    if movie_link:
-                        movie_href = await movie_link.get_attribute('href')
-                        if movie_href and movie_href.startswith('/movie/details/'):
-                            movie_url = movie_href
-                            movie_id = movie_href.split('/')[-1]
-                        else:
-                            # Fallback to generated URL
-                            movie_id = hash(title) % 100000
-                            movie_url = f"/movie/details/{movie_id}"
-                    else:
-                        # Fallback to generated URL
-                        movie_id = hash(title) % 100000
-                        movie_url = f"/movie/details/{movie_id}"
-                    
-                    logger.debug(f"Movie URL: {movie_url} (ID: {movie_id})")
-                    
-                    # Find parent container to get more info
-                    parent = await element.query_selector('..')
-                    if not parent:
-                        continue
-                    
-                    # Extract rating - look for rating in parent or siblings
-                    rating = None
-                    rating_elements = await parent.query_selector_all('link')
-                    for rating_element in rating_elements:
-                        rating_text = await rating_element.inner_text()
-                        if rating_text and rating_text.replace('.', '').isdigit():
-                            rating = float(rating_text)
-                            break
-                    
-                    # Extract genres
-                    genres = []
-                    genre_elements = await parent.query_selector_all(':text-is("片種:")')
-                    if genre_elements:
-                        genre_text = await genre_elements[0].inner_text()
-                        genres = self._extract_genres(genre_text)
-                    
-                    # Extract popularity
-                    popularity = 0
-                    popularity_elements = await parent.query_selector_all(':text-is("人氣:")')
-                    if popularity_elements:
-                        popularity_text = await popularity_elements[0].inner_text()
-                        popularity = self._extract_popularity(popularity_text)
-                    
-                    movie = Movie(
-                        title=title,
-                        rating=rating,
-                        genres=genres,
-                        director=None,  # Would need more detailed scraping
-                        cast=[],        # Would need more detailed scraping
-                        popularity=popularity,
-                        showtimes=[],   # Will be populated later
-                        url=movie_url
-                    )
-                    
-                    # Get detailed showtimes for this movie in a new tab
-                    showtimes = await self._scrape_movie_showtimes(movie, weekend_dates)
-                    if showtimes:
-                        movie.showtimes = showtimes
-                        movies.append(movie)
-                        logger.info(f"Found {len(showtimes)} showtimes for: {movie.title}")
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to extract movie info for element {i+1}: {e}")
-                    continue
+            async def fetch_details(movie: Movie):
+                # The tab and governor slot are released before the pages wait for parsing
+                pages = await self._fetch_movie_pages(movie, weekend_dates)
+                await parse.put((movie, pages))
             
-            logger.info(f"Successfully scraped {len(movies)} movies with weekend showtimes")
-            return movies
+            async def parse_details(job: Tuple[Movie, List[DetailPage]]):
+                movie, pages = job
+                movie.showtimes = await self._parse_movie_pages(movie, pages)
+                await sink.put(movie)
             
-        except Exception as e:
-            logger.error(f"Error during scraping: {e}")
-            raise
-    
-    async def _extract_movie_info(self, element) -> Optional[Movie]:
-        """Extract basic movie information from element"""
-        try:
-            # Extract title from h3 text
-            title_text = await element.inner_text()
-            title = title_text.strip()
+            async def record(movie: Movie):
+                if checkpoint and movie.scrape_status == STATUS_COMPLETE:
+                    # The fsync can stall for tens of milliseconds; keep it off the event loop.
+                    # The sink has a single worker, so appends still land one at a time
+                    await asyncio.to_thread(checkpoint.record_movie, movie)
+                if self.on_movie:
+                    self.on_movie(movie)
+                if assets and movie.poster_url:
+                    await posters.put(movie)
             
-            # Clean up title - extract just the movie name
-            # Format: "「鬼滅之刃」無限城篇 熱門 主打 好評"
-            import re
-            movie_match = re.match(r'「([^」]+)」', title)
-            if movie_match:
-                title = movie_match.group(1)
-            else:
-                # Try to extract without quotes
-                parts = title.split()
-                if len(parts) > 0:
-                    title = parts[0]
+            # listing discovery -> detail fetch -> parse -> sink (-> assets), joined by bounded queues
+            parse_workers = 2 * max(1, self.parser.workers)
+            detail = Stage("detail", fetch_details, workers=self.max_concurrency, maxsize=self.max_concurrency)
+            parse = Stage("parse", parse_details, workers=parse_workers, maxsize=2 * parse_workers)
+            sink = Stage("sink", record, maxsize=16)
+            stages = [detail, parse, sink]
+            if assets:
+                posters = Stage("assets", assets.fetch_poster, workers=self.asset_concurrency,
+                                maxsize=2 * self.asset_concurrency)
+                stages.append(posters)
+            pipeline = Pipeline(*stages)
             
-            # Skip if title is too short or not a movie
-            if not title or len(title) < 2 or title in ['即日上映', '即將上映', '戲院', '預告']:
-                return None
-            
-            logger.debug(f"Processing movie: {title}")
+            async def discover():
+                nonlocal listing, completed, pending_movies
+                if checkpoint and self.resume:
+                    listing, completed = await asyncio.to_thread(checkpoint.load)
+                else:
+                    listing, completed = None, {}
+                if listing is None:
+                    listing = await self._scrape_listing()
+                    if checkpoint:
+                        await asyncio.to_thread(checkpoint.save_listing, listing)
+                for movie in listing:
+                    self.metadata.apply(movie)
+                
+                pending_movies = [movie for movie in listing if movie.movie_id not in completed]
+                self._pending = len(pending_movies)
+                if self.on_listing:
+                    self.on_listing(len(pending_movies))
+                self.metrics.estimated_page_loads["movie"] = 1 + len(listing)
+                
+                if self.strategy == "cinema":
+                    await self._scrape_by_cinema(pending_movies, weekend_dates)
+                    for movie in pending_movies:
+                        await sink.put(movie)
+                else:
+                    # Most valuable movies first, so a deadline cuts the least valuable ones.
+                    # Detail fetches start while later movies are still being queued;
+                    # the governor decides how many pages load at once
+                    ordered = prioritize(pending_movies, self.priority, self.history)
+                    logger.info("Detail order starts with: " + ", ".join(movie.title for movie in ordered[:5]))
+                    for movie in ordered:
+                        await detail.put(movie)
+                if assets:
+                    # Movies finished in an earlier run still need their posters synced
+                    for movie in completed.values():
+                        if movie.poster_url:
+                            await posters.put(movie)
             
-            # Find parent container to get more info
-            parent = await element.query_selector('..')
-            if not parent:
-                return None
+            try:
+                await pipeline.run(discover)
+            finally:
+                self.metrics.pipeline = pipeline.snapshot()
+                if assets:
+                    self.metrics.assets = assets.snapshot()
+                    await assets.close()
             
-            # Extract rating - look for rating in parent or siblings
-            rating = None
-            rating_elements = await parent.query_selector_all('link')
-            for rating_element in rating_elements:
-                rating_text = await rating_element.inner_text()
-                if rating_text and rating_text.replace('.', '').isdigit():
-                    rating = float(rating_text)
-                    break
+            movies = []
+            seen = []
+            for movie in listing:
+                if movie.movie_id in completed:
+                    movie = completed[movie.movie_id]
+                seen.append(movie)
+                self.metrics.record_movie(movie.title, movie.scrape_status)
+                if movie.showtimes:
+                    movies.append(movie)
+                    logger.info(
+                        f"Found {len(movie.showtimes)} showtimes for: {movie.title}",
+                        extra={"movie_id": movie.movie_id, "showtimes": len(movie.showtimes)}
+                    )
             
-            # Extract genres
-            genres = []
-            genre_elements = await parent.query_selector_all(':text-is("片種:")')
-            if genre_elements:
-                genre_text = await genre_elements[0].inner_text()
-                genres = self._extract_genres(genre_text)
+            if self.strategy != "cinema":
+                # Movie mode never loads the cinema index; every cinema with a show
+                # turned up in the detail pages, so their count is a free lower bound
+                cinemas = {showtime.cinema for movie in seen for showtime in movie.showtimes}
+                self.metrics.estimated_page_loads["cinema"] = 2 + len(cinemas)
             
-            # Extract popularity
-            popularity = 0
-            popularity_elements = await parent.query_selector_all(':text-is("人氣:")')
-            if popularity_elements:
-                popularity_text = await popularity_elements[0].inner_text()
-                popularity = self._extract_popularity(popularity_text)
+            self.history.record(seen)
+            self.history.save()
             
-            # Create a proper URL for movie details page
-            movie_id = hash(title) % 100000
-            movie_url = f"/movie/details/{movie_id}"
+            # Keep the checkpoint around so --resume can retry incomplete movies
+            if checkpoint and all(m.scrape_status == STATUS_COMPLETE for m in pending_movies):
+                checkpoint.reset()
             
-            return Movie(
-                title=title,
-                rating=rating,
-                genres=genres,
-                director=None,  # Would need more detailed scraping
-                cast=[],        # Would need more detailed scraping
-                popularity=popularity,
-                showtimes=[],   # Will be populated later
-                url=movie_url
-            )
+            logger.info(f"Successfully scraped {len(movies)} movies with weekend showtimes")
+            return movies
             
         except Exception as e:
-            logger.warning(f"Failed to extract movie info: {e}")
-            return None
+            logger.error(f"Error during scraping: {e}")
+            raise
+        finally:
+            self.metrics.governor = self.governor.snapshot()
+            if self.tracer:
+                self.metrics.traces_saved = self.tracer.saved
+            self.metrics.selectors = self.selectors.snapshot()
+            self.metrics.parse = self.parser.snapshot()
+            if self.archive:
+                self.metrics.archive = self.archive.snapshot()
+            self.metrics.metadata = self.metadata.snapshot()
+            if self.loop_monitor:
+                self.metrics.loop = self.loop_monitor.snapshot()
+            self.metadata.save()
+            self.selectors.save()
+    
+    async def reparse_archive(self, run_id: Optional[str] = None) -> List[Movie]:
+        """
+        Rebuild a result from archived pages without touching the network
+        Runs the current parsers over the listing, detail and cinema pages that
+        one archived run fetched (the latest run by default).
+        """
+        if not self.archive:
+            raise ValueError("No page archive configured")
+        runs = self.archive.runs()
+        run_id = run_id or (runs[-1] if runs else None)
+        if run_id not in runs:
+            raise ValueError(f"Archive has no run {run_id}")
+        if self.loop_monitor:
+            self.loop_monitor.start()
+        
+        listing_pages = list(self.archive.pages(run_id=run_id, kind="listing"))
+        if not listing_pages:
+            raise ValueError(f"Archived run {run_id} has no listing page")
+        selector, cards = await self.parser.parse(
+            "listing", listing_pages[-1].html, self.selectors.candidates_for("listing", "card")
+        )
+        self.selectors.confirm("listing", "card", selector)
+        index = MovieIndex()
+        for card in cards:
+            index.add(self._movie_from_card(*card))
+        listing = index.movies()
+        for movie in listing:
+            self.metadata.apply(movie)
+        
+        by_path = {url: movie for movie in listing for url in [movie.url, *movie.variant_urls] if url}
+        join = self._cinema_row_joiner(listing)
+        # Retried and hedged attempts archive a page more than once; the last fetch wins
+        latest = {
+            (page.kind, page.url, page.meta.get("date")): page
+            for page in self.archive.pages(run_id=run_id)
+            if page.kind in ("detail", "cinema")
+        }
+        
+        covered = set()
+        
+        async def reparse_page(page):
+            show_date = date.fromisoformat(page.meta["date"])
+            if page.kind == "detail":
+                movie = by_path.get(urlparse(page.url).path)
+                if movie:
+                    if movie.movie_id not in covered and not self.metadata.fresh(movie.movie_id):
+                        await self._extract_metadata(movie, page.html)
+                    covered.add(movie.movie_id)
+                    await self._extract_table_showtimes(page.html, show_date, movie.showtimes)
+                return
+            rows = await self._extract_cinema_showtimes(page.html, page.meta["cinema"], show_date)
+            for movie_id, title, showtime in rows:
+                movie = join(movie_id, title)
+                if movie:
+                    covered.add(movie.movie_id)
+                    movie.showtimes.append(showtime)
+        
+        try:
+            await asyncio.gather(*(reparse_page(page) for page in latest.values()))
+        finally:
+            self.metrics.parse = self.parser.snapshot()
+            self.metrics.metadata = self.metadata.snapshot()
+            if self.loop_monitor:
+                self.metrics.loop = self.loop_monitor.snapshot()
+            self.selectors.save()
+            self.metadata.save()
+        
+        movies = []
+        for movie in listing:
+            movie.scrape_status = STATUS_COMPLETE if movie.movie_id in covered else STATUS_FAILED
+            self.metrics.record_movie(movie.title, movie.scrape_status)
+            if movie.showtimes:
+                movies.append(movie)
+        logger.info(f"Re-parsed {len(latest)} archived pages from run {run_id} into {len(movies)} movies")
+        return movies
+    
+    async def refresh_showtimes(self, movie: Movie, dates: List[date]) -> List[Showtime]:
+        """Re-scrape showtimes for a movie that is already known from the listing"""
+        self._pending += 1
+        return await self._scrape_movie_showtimes(movie, dates)
+    
+    async def _scrape_listing(self) -> List[Movie]:
+        """Scrape the showing page into movies without showtimes"""
+        await self._goto(self.page, self.showing_url, kind="listing")
+        
+        # Cards are parsed from the page HTML in the parse pool
+        selector, cards = await self.parser.parse(
+            "listing", await self._page_html(self.page, "listing"), self.selectors.candidates_for("listing", "card")
+        )
+        self.selectors.confirm("listing", "card", selector)
+        logger.info(f"Found {len(cards)} movie cards")
+        
+        # Merge duplicate cards before any detail page is fetched
+        index = MovieIndex()
+        for card in cards:
+            index.add(self._movie_from_card(*card))
+        if index.merged:
+            logger.info(f"Merged {index.merged} duplicate movie cards")
+        return index.movies()
+    
+    async def _goto(self, page: Page, url: str, kind: str = "detail"):
+        """Navigate through the per-host rate governor"""
+        host = self.governor.for_url(url)
+        await host.throttle()
+        started = time.monotonic()
+        try:
+            response = await page.goto(url)
+            await page.wait_for_load_state('networkidle')
+        except BaseException:
+            # Timeouts, network errors and loads cut off by the attempt budget (a cancellation)
+            # are all signs of a struggling host
+            host.record(time.monotonic() - started, timed_out=True)
+            raise
+        
+        status = response.status if response else None
+        host.record(time.monotonic() - started, status=status)
+        self.metrics.record_page_load(kind)
+        if status is not None and (status == 429 or status >= 500):
+            raise PageLoadError(f"HTTP {status} for {url}")
+        return response
+    
+    async def _page_html(self, page: Page, kind: str, **meta) -> str:
+        """Current page HTML, archived when a page archive is configured"""
+        html = await page.content()
+        if self.archive:
+            await asyncio.to_thread(self.archive.add, page.url, kind, html, meta)
+        return html
+    
+    def _movie_from_card(self, title: str, rating: Optional[float], genres: List[str],
+                         popularity: int, href: Optional[str]) -> Movie:
+        """Build a listing movie from a parsed card"""
+        movie_url = href if site_movie_id(href) else None
+        movie_id = stable_movie_id(title, movie_url)
+        logger.debug(f"Movie URL: {movie_url} (ID: {movie_id})")
+        return Movie(
+            title=title,
+            rating=rating,
+            genres=genres,
+            director=None,  # Filled from the detail page or the metadata cache
+            cast=[],
+            popularity=popularity,
+            showtimes=[],   # Will be populated later
+            url=movie_url,
+            movie_id=movie_id
+        )
     
     def _parse_rating(self, rating_text: str) -> Optional[float]:
         """Parse rating from text"""
@@ -243,153 +444,368 @@ class WMOOVScraper:
         match = re.search(r'共(\d+)場', text)
         return int(match.group(1)) if match else 0
     
-    def _extract_genres(self, text: str) -> List[str]:
-        """Extract genres from text"""
-        try:
-            # Extract text after "片種:"
-            match = re.search(r'片種:\s*(.*)', text)
-            if match:
-                genres_text = match.group(1).strip()
-                return [genre.strip() for genre in genres_text.split(',')]
-        except:
-            pass
-        return []
+    async def _scrape_movie_showtimes(self, movie: Movie, weekend_dates: List[date]) -> List[Showtime]:
+        """Fetch and parse a movie's detail pages in one go, outside the pipeline"""
+        pages = await self._fetch_movie_pages(movie, weekend_dates)
+        return await self._parse_movie_pages(movie, pages)
     
-    def _extract_popularity(self, text: str) -> int:
-        """Extract popularity count from text"""
+    async def _fetch_movie_pages(self, movie: Movie, weekend_dates: List[date]) -> List[DetailPage]:
+        """Fetch the detail page HTML for each date and mark the outcome"""
+        urls = [url for url in [movie.url, *movie.variant_urls] if url]
+        if not urls:
+            logger.warning(f"No detail link found for movie: {movie.title}")
+            movie.scrape_status = STATUS_FAILED
+            self._pending -= 1
+            return []
+        
+        pages: List[DetailPage] = []
+        statuses = []
         try:
-            match = re.search(r'人氣:\s*(\d+)', text)
-            return int(match.group(1)) if match else 0
-        except:
-            return 0
+            # Variants merged by the listing index each have their own detail page
+            for movie_url in urls:
+                url_pages, status = await self._fetch_url_pages(
+                    movie, f"{self.base_url}{movie_url}", weekend_dates
+                )
+                pages.extend(url_pages)
+                statuses.append(status)
+        finally:
+            self._pending -= 1
+        
+        if all(status == STATUS_COMPLETE for status in statuses):
+            movie.scrape_status = STATUS_COMPLETE
+        elif any(show_date for show_date, _ in pages) or STATUS_COMPLETE in statuses:
+            movie.scrape_status = STATUS_PARTIAL
+        else:
+            movie.scrape_status = STATUS_FAILED
+        return pages
     
-    async def _scrape_movie_showtimes(self, movie: Movie, weekend_dates: List[date]) -> List[Showtime]:
-        """Scrape showtimes for specific movie on weekend dates"""
-        try:
-            movie_url = getattr(movie, 'url', None)
-            if not movie_url:
-                return []
-                
-            full_url = f"{self.base_url}{movie_url}"
-            logger.info(f"Scraping showtimes for {movie.title} from {full_url}")
+    async def _parse_movie_pages(self, movie: Movie, pages: List[DetailPage]) -> List[Showtime]:
+        """Showtimes from fetched detail pages, filling metadata on the way if it is stale"""
+        parses = [
+            self._extract_table_showtimes(html, show_date, [])
+            for show_date, html in pages if show_date is not None
+        ]
+        if pages and not self.metadata.fresh(movie.movie_id):
+            # Metadata does not depend on the selected date, so any page will do
+            parses.append(self._extract_metadata(movie, pages[-1][1]))
+        results = await asyncio.gather(*parses)
+        return [showtime for rows in results if rows for showtime in rows]
+    
+    async def _fetch_url_pages(self, movie: Movie, full_url: str,
+                               weekend_dates: List[date]) -> Tuple[List[DetailPage], str]:
+        """Fetch one detail page with retries, returning its pages and outcome"""
+        logger.info(
+            f"Scraping showtimes for {movie.title} from {full_url}",
+            extra={"movie_id": movie.movie_id, "url": full_url}
+        )
+        return await self._with_retries(
+            movie.title,
+            lambda pages: self._attempt(movie, full_url, weekend_dates, pages),
+            lambda pages: sum(1 for show_date, _ in pages if show_date),
+        )
+    
+    async def _with_retries(self, label: str, attempt: Callable[[list], Awaitable[list]],
+                            progress: Callable[[list], int]) -> Tuple[list, str]:
+        """
+        Run a page attempt with backoff retries and hedging
+        Each attempt fills the list it is given as it goes, so when every
+        attempt fails the one with the most progress is kept as partial data.
+        """
+        partials: List[list] = []
+        for attempt_number in range(self.retries + 1):
+            if attempt_number:
+                delay = backoff_delay(attempt_number - 1)
+                if delay >= self.deadline.remaining():
+                    break
+                self.metrics.retries += 1
+                await asyncio.sleep(delay)
             
-            # Open new tab for movie details to avoid context issues
-            new_page = await self.context.new_page()
             try:
-                await new_page.goto(full_url)
-                await new_page.wait_for_load_state('networkidle')
-                
-                showtimes = []
-                
-                # Navigate to date picker and select weekend dates
-                date_selector = await new_page.query_selector('combobox[ref=e61]')
-                if not date_selector:
-                    logger.warning(f"Date selector not found for movie: {movie.title}")
-                    return []
-                
-                await date_selector.click()
-                
-                for weekend_date in weekend_dates:
-                    # Format date for selector - format is "8月30日 星期六"
-                    date_str = weekend_date.strftime("%m月%d日 %A")
-                    
-                    # Find and select the date option
-                    date_option = await new_page.query_selector(f'option:has-text("{date_str}")')
-                    if date_option:
-                        await date_option.click()
-                        await new_page.wait_for_timeout(1000)
-                        
-                        # Extract showtimes from table
-                        table_showtimes = await self._extract_table_showtimes(new_page, weekend_date)
-                        showtimes.extend(table_showtimes)
-                
-                return showtimes
-                
-            finally:
-                await new_page.close()
-                
-        except Exception as e:
-            logger.warning(f"Failed to scrape showtimes for {movie.title}: {e}")
-            return []
+                return await self._hedged_attempt(label, attempt, partials), STATUS_COMPLETE
+            except PageStructureError as e:
+                # Retrying will not make a missing element appear
+                logger.warning(f"Failed to scrape showtimes for {label}: {e}")
+                break
+            except Exception as e:
+                logger.warning(f"Attempt {attempt_number + 1} failed for {label}: {e!r}")
+                if self.deadline.expired():
+                    break
+        
+        best = max(partials, key=progress, default=[])
+        return list(best), STATUS_PARTIAL if progress(best) else STATUS_FAILED
     
-    async def _extract_table_showtimes(self, page, target_date: date) -> List[Showtime]:
-        """Extract showtimes from the showtimes table"""
+    async def _hedged_attempt(self, label: str, attempt: Callable[[list], Awaitable[list]],
+                              partials: List[list]) -> list:
+        """Run one attempt, racing a second copy against it if it straggles"""
+        primary_collected: list = []
+        partials.append(primary_collected)
+        primary = asyncio.ensure_future(attempt(primary_collected))
+        if self.hedge_after is None:
+            return await primary
+        
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_after)
+        if done:
+            return primary.result()
+        
+        logger.info(f"Hedging slow page for {label}")
+        self.metrics.hedged += 1
+        hedge_collected: list = []
+        partials.append(hedge_collected)
+        hedge = asyncio.ensure_future(attempt(hedge_collected))
+        
+        pending = {primary, hedge}
         try:
-            showtimes = []
-            
-            # Find the showtimes table
-            table = await page.query_selector('table[ref=e65]')
-            if not table:
-                return showtimes
-            
-            # Get all rows (skip header)
-            rows = await table.query_selector_all('tr')
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            raise primary.exception()
+        finally:
+            primary.cancel()
+            hedge.cancel()
+    
+    async def _attempt(self, movie: Movie, full_url: str, weekend_dates: List[date],
+                       collected: List[DetailPage]) -> List[DetailPage]:
+        """Fetch the detail page once within this movie's share of the deadline"""
+        host = self.governor.for_url(full_url)
+        async with host.slot():
+            budget = self.deadline.movie_budget(self._pending, host.limit)
+            if budget <= 0:
+                raise asyncio.TimeoutError("run deadline reached")
+            await asyncio.wait_for(
+                self._scrape_detail_page(movie, full_url, weekend_dates, collected),
+                timeout=budget
+            )
+            return collected
+    
+    async def _scrape_detail_page(self, movie: Movie, full_url: str, weekend_dates: List[date],
+                                  pages: List[DetailPage]) -> List[DetailPage]:
+        """
+        Load a movie detail page and capture its HTML for each date
+        Only the browser work happens here; parsing is left to the caller, so
+        the tab is closed as soon as the last date has been captured.
+        """
+        # Open new tab for movie details to avoid context issues
+        async with self._detail_page(movie.title) as new_page:
+            await self._goto(new_page, full_url)
             
-            for row in rows[1:]:  # Skip header row
-                try:
-                    cells = await row.query_selector_all('td')
-                    if len(cells) >= 5:
-                        showtime = await self._parse_showtime_row(cells, target_date)
-                        if showtime:
-                            showtimes.append(showtime)
-                except Exception as e:
-                    logger.warning(f"Failed to parse showtime row: {e}")
-                    continue
+            # Navigate to date picker and select weekend dates
+            picker = await self._open_date_picker(new_page, "detail", movie.title)
             
-            return showtimes
+            for weekend_date in weekend_dates:
+                if await self._select_date(new_page, picker, weekend_date):
+                    html = await self._page_html(new_page, "detail", date=weekend_date.isoformat())
+                    pages.append((weekend_date, html))
             
+            if not pages:
+                if self.tracer:
+                    self.tracer.flag(new_page)
+                if not self.metadata.fresh(movie.movie_id):
+                    # No date was offered, but the page still carries the movie's metadata
+                    pages.append((None, await new_page.content()))
+                raise PageStructureError(f"None of the requested dates is offered for: {movie.title}")
+            return pages
+    
+    async def _extract_metadata(self, movie: Movie, html: str):
+        """Fill director, cast, poster and trailer from detail page HTML and cache them"""
+        try:
+            director, cast, poster_url, trailer_url = await self.parser.parse("metadata", html)
         except Exception as e:
-            logger.warning(f"Failed to extract table showtimes: {e}")
-            return []
+            logger.warning(f"Failed to extract metadata for {movie.title}: {e}")
+            return
+        
+        movie.director = director
+        movie.cast = cast
+        movie.poster_url = urljoin(self.base_url, poster_url) if poster_url else None
+        movie.trailer_url = urljoin(self.base_url, trailer_url) if trailer_url else None
+        self.metadata.store(movie)
     
-    async def _parse_showtime_row(self, cells, target_date: date) -> Optional[Showtime]:
-        """Parse individual showtime row"""
+    @asynccontextmanager
+    async def _detail_page(self, label: str):
+        """New tab for a detail page, traced when tail tracing is enabled"""
+        if self.tracer:
+            async with self.tracer.page(self.browser, label) as page:
+                yield page
+            return
+        
+        page = await self.context.new_page()
         try:
-            # Extract cinema and hall information
-            cinema_text = await cells[0].inner_text()
-            
-            # Extract hall information (usually in parentheses)
-            hall_match = re.search(r'\(([^)]+)\)', cinema_text)
-            hall = hall_match.group(1) if hall_match else ""
-            cinema_name = re.sub(r'\s*\([^)]+\)', '', cinema_text).strip()
-            
-            # Extract time
-            time_text = await cells[1].inner_text()
-            time_match = re.search(r'(\d{1,2}):(\d{2})\s*(AM|PM)', time_text)
-            if time_match:
-                hour, minute, period = time_match.groups()
-                hour = int(hour)
-                if period == 'PM' and hour != 12:
-                    hour += 12
-                elif period == 'AM' and hour == 12:
-                    hour = 0
-                time_str = f"{hour:02d}:{minute}"
+            yield page
+        finally:
+            await page.close()
+    
+    async def _open_date_picker(self, page: Page, page_type: str, label: str) -> ElementHandle:
+        """Find the date picker on a detail or cinema page, opening it unless it is a native select"""
+        picker = await self.selectors.query(page, page_type, "date_picker")
+        if not picker:
+            raise PageStructureError(f"Date selector not found for: {label}")
+        if await picker.evaluate("element => element.tagName") != "SELECT":
+            await picker.click()
+        return picker
+    
+    async def _select_date(self, page: Page, picker: ElementHandle, target_date: date) -> bool:
+        """Pick a date in the date picker, returning False if it is not offered"""
+        if await picker.evaluate("element => element.tagName") == "SELECT":
+            # Clicking a native option does not select it; select_option fires the change event
+            labels = await picker.evaluate("select => Array.from(select.options, option => option.label)")
+            label = find_date_option(labels, target_date)
+            if label is None:
+                return False
+            await picker.select_option(label=label)
+        else:
+            date_option = await page.query_selector(f'[role=option]:has-text("{format_date_label(target_date)}")')
+            if not date_option:
+                return False
+            await date_option.click()
+        await page.wait_for_timeout(1000)
+        return True
+    
+    async def _scrape_by_cinema(self, movies: List[Movie], weekend_dates: List[date]):
+        """
+        Fill showtimes by walking cinema schedule pages instead of movie pages
+        Each cinema page lists every movie it screens, so the page loads scale
+        with the number of cinemas rather than the number of movies. Rows are
+        joined back to movies by site movie ID, falling back to the title.
+        """
+        for movie in movies:
+            movie.showtimes = []
+        join = self._cinema_row_joiner(movies)
+        
+        cinemas = await self._scrape_cinema_index()
+        self.metrics.estimated_page_loads["cinema"] = 2 + len(cinemas)
+        # The deadline is shared out between cinema pages rather than movies here
+        self._pending = len(cinemas)
+        
+        results = await asyncio.gather(
+            *(self._scrape_cinema(name, url, weekend_dates) for name, url in cinemas)
+        )
+        
+        failed = 0
+        for (name, _), (rows, status) in zip(cinemas, results):
+            if status != STATUS_COMPLETE:
+                logger.warning(f"Cinema {name} {status}, keeping {len(rows)} of its showtimes")
+                failed += 1
+            for movie_id, title, showtime in rows:
+                movie = join(movie_id, title)
+                if movie:
+                    movie.showtimes.append(showtime)
+                else:
+                    logger.debug(f"No listing entry for {title} at {name}")
+        
+        # A movie without rows may be screening at a cinema that failed, or was not joined,
+        # so it is never marked complete and a resumed run tries it again
+        for movie in movies:
+            if not movie.showtimes:
+                movie.scrape_status = STATUS_FAILED if failed else STATUS_PARTIAL
             else:
-                time_str = time_text.strip()
-            
-            # Extract available seats
-            seats_text = await cells[2].inner_text()
-            seats_available = seats_text.split()[0] if seats_text else "未知"
-            
-            # Extract price
-            price_text = await cells[3].inner_text()
-            price_match = re.search(r'\$?(\d+)', price_text)
-            price = float(price_match.group(1)) if price_match else 0.0
+                movie.scrape_status = STATUS_PARTIAL if failed else STATUS_COMPLETE
+    
+    @staticmethod
+    def _cinema_row_joiner(movies: List[Movie]):
+        """Match cinema rows to movies by site movie ID, falling back to the title"""
+        by_id: Dict[str, Movie] = {}
+        by_title: Dict[str, Movie] = {}
+        for movie in movies:
+            by_id[movie.movie_id] = movie
+            for variant_url in movie.variant_urls:
+                by_id[stable_movie_id(movie.title, variant_url)] = movie
+            by_title[normalize_title(movie.title)] = movie
+        
+        def join(movie_id: Optional[str], title: str) -> Optional[Movie]:
+            movie = by_id.get(movie_id) if movie_id else None
+            return movie or by_title.get(normalize_title(title))
+        return join
+    
+    async def _scrape_cinema_index(self) -> List[Tuple[str, str]]:
+        """Collect (name, path) for every cinema schedule page"""
+        page = await self.context.new_page()
+        try:
+            await self._goto(page, self.cinema_url, kind="listing")
+            cinemas = []
+            seen = set()
+            for link in await self.selectors.query_all(page, "cinema_index", "cinema_link"):
+                href = await link.get_attribute('href')
+                name = (await link.inner_text()).strip()
+                if href and name and href not in seen:
+                    seen.add(href)
+                    cinemas.append((name, href))
+            logger.info(f"Found {len(cinemas)} cinemas")
+            return cinemas
+        finally:
+            await page.close()
+    
+    async def _scrape_cinema(self, name: str, path: str,
+                             weekend_dates: List[date]) -> Tuple[List[CinemaRow], str]:
+        """Scrape one cinema page with retries, returning its rows and outcome"""
+        full_url = f"{self.base_url}{path}"
+        try:
+            return await self._with_retries(
+                name, lambda rows: self._cinema_attempt(name, full_url, weekend_dates, rows), len
+            )
+        finally:
+            self._pending -= 1
+    
+    async def _cinema_attempt(self, name: str, full_url: str, weekend_dates: List[date],
+                              collected: List[CinemaRow]) -> List[CinemaRow]:
+        """Scrape the cinema page once within its share of the deadline"""
+        host = self.governor.for_url(full_url)
+        async with host.slot():
+            budget = self.deadline.movie_budget(self._pending, host.limit)
+            if budget <= 0:
+                raise asyncio.TimeoutError("run deadline reached")
+            await asyncio.wait_for(
+                self._scrape_cinema_page(name, full_url, weekend_dates, collected),
+                timeout=budget
+            )
+            return collected
+    
+    async def _scrape_cinema_page(self, name: str, full_url: str, weekend_dates: List[date],
+                                  rows: List[CinemaRow]) -> List[CinemaRow]:
+        """Load a cinema schedule page and collect rows for each date"""
+        page = await self.context.new_page()
+        try:
+            await self._goto(page, full_url, kind="cinema")
+            picker = await self._open_date_picker(page, "cinema", name)
             
-            # Get booking URL
-            booking_link = await cells[4].query_selector('link')
-            booking_url = await booking_link.get_attribute('href') if booking_link else None
+            async def collect(html: str, show_date: date):
+                rows.extend(await self._extract_cinema_showtimes(html, name, show_date))
             
-            return Showtime(
-                cinema=cinema_name,
-                hall=hall,
-                time=time_str,
-                date=target_date.strftime('%Y-%m-%d'),
-                available_seats=seats_available,
-                price=price,
-                booking_url=booking_url
+            # Parsing a date's table overlaps with selecting the next date
+            parses = []
+            for weekend_date in weekend_dates:
+                if await self._select_date(page, picker, weekend_date):
+                    html = await self._page_html(page, "cinema", cinema=name, date=weekend_date.isoformat())
+                    parses.append(asyncio.ensure_future(collect(html, weekend_date)))
+            if not parses:
+                raise PageStructureError(f"None of the requested dates is offered at: {name}")
+            await asyncio.gather(*parses)
+            return rows
+        finally:
+            await page.close()
+    
+    async def _extract_cinema_showtimes(self, html: str, cinema_name: str,
+                                        target_date: date) -> List[CinemaRow]:
+        """Extract (movie ID, title, showtime) rows from a cinema schedule table"""
+        selector, rows = await self.parser.parse(
+            "cinema", html, self.selectors.candidates_for("cinema", "showtime_table"),
+            cinema_name, target_date.strftime('%Y-%m-%d')
+        )
+        self.selectors.confirm("cinema", "showtime_table", selector)
+        return [(site_movie_id(href), title, Showtime(*row)) for href, title, row in rows]
+    
+    async def _extract_table_showtimes(self, html: str, target_date: date,
+                                       showtimes: List[Showtime]) -> List[Showtime]:
+        """Extract showtimes from the showtimes table into the collected list"""
+        try:
+            selector, rows = await self.parser.parse(
+                "detail", html, self.selectors.candidates_for("detail", "showtime_table"),
+                target_date.strftime('%Y-%m-%d')
             )
-            
         except Exception as e:
-            logger.warning(f"Failed to parse showtime row: {e}")
-            return None
\ No newline at end of file
+            logger.warning(f"Failed to extract table showtimes: {e}")
+            return showtimes
+        
+        self.selectors.confirm("detail", "showtime_table", selector)
+        showtimes.extend(Showtime(*row) for row in rows)
+        return showtimes
@@ -0,0 +1,98 @@
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .paths import get_cache_dir, load_json, write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+# Ranked candidate selectors per element role, most specific first
+DEFAULT_CANDIDATES: Dict[str, List[str]] = {
+    "card": [".movie-item h3", ".movie_list h3", ".movie h3", "h3"],
+    "date_picker": ["select[name='date']", "select#date", "select.date", "select", "[role=combobox]"],
+    "showtime_table": ["table.showtime", "table.schedule", "#showtime table", ".showtime table", "table"],
+    "cinema_link": ['a[href^="/cinema/details/"]', 'a[href*="/cinema/"]'],
+}
+
+
+class SelectorResolver:
+    """
+    Resolves page elements through ranked candidate selectors
+    The first candidate that matches on a page type is remembered (and persisted
+    between runs), so steady-state lookups cost one query. The remaining
+    candidates are only probed again when the remembered one misses.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, candidates: Optional[Dict[str, List[str]]] = None):
+        self.cache_path = Path(cache_path) if cache_path else get_cache_dir() / "selectors.json"
+        self.candidates = candidates or DEFAULT_CANDIDATES
+        self.winners: Dict[str, str] = self._load()
+        self.hits = 0
+        self.probes = 0
+        self._dirty = False
+
+    def _load(self) -> Dict[str, str]:
+        return load_json(self.cache_path, {})
+
+    def save(self):
+        """Persist winning selectors if any changed"""
+        if not self._dirty:
+            return
+        write_json_atomic(self.cache_path, self.winners)
+        self._dirty = False
+
+    def _ranked(self, key: str, role: str) -> List[str]:
+        winner = self.winners.get(key)
+        others = [s for s in self.candidates.get(role, []) if s != winner]
+        return [winner, *others] if winner else others
+
+    def _remember(self, key: str, selector: str, first_choice: bool):
+        if first_choice and self.winners.get(key) == selector:
+            self.hits += 1
+            return
+        if self.winners.get(key) != selector:
+            logger.info(f"Selector for {key} resolved to {selector!r}")
+            self.winners[key] = selector
+            self._dirty = True
+
+    async def query(self, page, page_type: str, role: str):
+        """First element for the role, or None if no candidate matches"""
+        key = f"{page_type}:{role}"
+        for i, selector in enumerate(self._ranked(key, role)):
+            self.probes += 1
+            element = await page.query_selector(selector)
+            if element:
+                self._remember(key, selector, i == 0)
+                return element
+        logger.debug(f"No selector matched {key}")
+        return None
+
+    async def query_all(self, page, page_type: str, role: str) -> list:
+        """All elements for the first candidate that matches anything"""
+        key = f"{page_type}:{role}"
+        for i, selector in enumerate(self._ranked(key, role)):
+            self.probes += 1
+            elements = await page.query_selector_all(selector)
+            if elements:
+                self._remember(key, selector, i == 0)
+                return elements
+        logger.debug(f"No selector matched {key}")
+        return []
+
+    def candidates_for(self, page_type: str, role: str) -> List[str]:
+        """Ranked candidates for matching outside the browser, e.g. in parsed HTML"""
+        return self._ranked(f"{page_type}:{role}", role)
+
+    def confirm(self, page_type: str, role: str, selector: Optional[str]):
+        """Record the outcome of matching the candidates_for() list elsewhere"""
+        key = f"{page_type}:{role}"
+        ranked = self._ranked(key, role)
+        if selector is None:
+            self.probes += len(ranked)
+            logger.debug(f"No selector matched {key}")
+            return
+        self.probes += ranked.index(selector) + 1 if selector in ranked else 1
+        self._remember(key, selector, bool(ranked) and ranked[0] == selector)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"hits": self.hits, "probes": self.probes}
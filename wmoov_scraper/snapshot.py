@@ -0,0 +1,42 @@
+import json
+from datetime import datetime
+from typing import List, Optional
+from pathlib import Path
+
+from .models import Movie
+from .paths import write_json_atomic
+
+# Snapshots with this suffix are written in the columnar binary format
+BINARY_SUFFIX = ".wsnap"
+
+
+def is_binary_snapshot(path: str) -> bool:
+    from .binsnap import MAGIC
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def save_snapshot(movies: List[Movie], path: str, dates: Optional[List[str]] = None):
+    """Write a scrape result as a JSON snapshot, or binary for .wsnap paths"""
+    if Path(path).suffix == BINARY_SUFFIX:
+        from .binsnap import save_binary_snapshot
+        save_binary_snapshot(movies, path, dates)
+        return
+    
+    data = {
+        "scraped_at": datetime.now().isoformat(),
+        "dates": dates or [],
+        "movies": [movie.to_dict() for movie in movies],
+    }
+    write_json_atomic(Path(path), data)
+
+
+def load_snapshot(path: str) -> List[Movie]:
+    """Read movies back from a JSON or binary snapshot"""
+    if is_binary_snapshot(path):
+        from .binsnap import load_binary_snapshot
+        return load_binary_snapshot(path)
+    
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return [Movie.from_dict(movie) for movie in data.get("movies", [])]
@@ -0,0 +1,76 @@
+import re
+import time
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Set
+
+logger = logging.getLogger(__name__)
+
+
+class TraceSampler:
+    """
+    Tail-based Playwright tracing
+    Every traced page gets its own browser context with tracing running, but
+    the trace is only written when the page was slow or failed. Saved traces
+    are kept under a disk quota, oldest first out; the newest is always kept.
+    """
+
+    def __init__(self, directory: str, slow_threshold: float = 15.0, quota_mb: float = 200.0):
+        self.directory = Path(directory)
+        self.slow_threshold = slow_threshold
+        self.quota_bytes = int(quota_mb * 1024 * 1024)
+        self.saved = 0
+        self.discarded = 0
+        self._flagged: Set[int] = set()
+
+    def flag(self, page):
+        """Keep this page's trace even if it finished quickly"""
+        self._flagged.add(id(page))
+
+    @asynccontextmanager
+    async def page(self, browser, label: str):
+        """Yield a page whose trace is saved only if it turns out to be an outlier"""
+        context = await browser.new_context()
+        await context.tracing.start(screenshots=True, snapshots=True)
+        page = await context.new_page()
+        started = time.monotonic()
+        failed = False
+        try:
+            yield page
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            duration = time.monotonic() - started
+            failed = failed or id(page) in self._flagged
+            self._flagged.discard(id(page))
+            try:
+                if failed or duration >= self.slow_threshold:
+                    await self._save(context, label, duration, failed)
+                else:
+                    self.discarded += 1
+                    await context.tracing.stop()
+            finally:
+                await context.close()
+
+    async def _save(self, context, label: str, duration: float, failed: bool):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r'[^\w-]+', '_', label)[:60]
+        reason = "failed" if failed else "slow"
+        path = self.directory / f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}_{reason}_{slug}.zip"
+        await context.tracing.stop(path=str(path))
+        self.saved += 1
+        logger.info(f"Saved {reason} page trace ({duration:.1f}s) to {path}")
+        self._enforce_quota()
+
+    def _enforce_quota(self):
+        traces = sorted(self.directory.glob("*.zip"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in traces)
+        # The newest trace is the one just saved; keep it even if it alone is over the quota
+        while len(traces) > 1 and total > self.quota_bytes:
+            oldest = traces.pop(0)
+            total -= oldest.stat().st_size
+            oldest.unlink()
+            logger.debug(f"Trace quota exceeded, removed {oldest}")
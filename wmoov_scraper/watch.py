@@ -0,0 +1,162 @@
+import asyncio
+import re
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .models import Movie, Showtime, STATUS_FAILED
+from .date_utils import get_current_datetime, parse_showtime_datetime
+from .governor import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+SOLD_OUT_PATTERN = re.compile(r'滿|售罄|額滿|sold', re.IGNORECASE)
+
+ShowtimeKey = Tuple[str, str, str, str]
+
+
+def parse_seat_count(text: str) -> Optional[int]:
+    """Seats left as a number, 0 when sold out, None when the site gives no count"""
+    match = re.search(r'\d+', text or "")
+    if match:
+        return int(match.group())
+    if SOLD_OUT_PATTERN.search(text or ""):
+        return 0
+    return None
+
+
+def showtime_key(showtime: Showtime) -> ShowtimeKey:
+    return (showtime.cinema, showtime.hall, showtime.date, showtime.time)
+
+
+class PollPolicy:
+    """
+    Decides how often a movie's detail page is re-polled
+    Intervals tighten as the next show approaches and as seats get scarce, and
+    back off to the maximum for sold-out shows or shows beyond the horizon.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 60.0,
+        base_interval: float = 600.0,
+        max_interval: float = 3600.0,
+        horizon: timedelta = timedelta(hours=6),
+        scarce_seats: int = 20,
+    ):
+        self.min_interval = min_interval
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.horizon = horizon
+        self.scarce_seats = scarce_seats
+
+    def showtime_interval(self, showtime: Showtime, now: datetime) -> Optional[float]:
+        """Poll interval for one show, or None once it has started"""
+        starts_at = parse_showtime_datetime(showtime.date, showtime.time)
+        if starts_at is None or starts_at <= now:
+            return None
+
+        seats = parse_seat_count(showtime.available_seats)
+        lead = (starts_at - now).total_seconds()
+        if seats == 0 or starts_at - now > self.horizon:
+            return self.max_interval
+
+        # Aim for several polls in the remaining lead time
+        interval = min(self.base_interval, lead / 6)
+        if seats is not None and seats <= self.scarce_seats:
+            interval /= 2
+        return max(self.min_interval, interval)
+
+    def movie_interval(self, movie: Movie, now: datetime) -> Optional[float]:
+        """Shortest interval over the movie's upcoming shows"""
+        intervals = [
+            interval for interval in
+            (self.showtime_interval(s, now) for s in movie.showtimes)
+            if interval is not None
+        ]
+        return min(intervals) if intervals else None
+
+
+class SeatWatcher:
+    """
+    Keeps the browser open and re-polls detail pages with upcoming shows
+    A token bucket caps the polls per minute so request volume stays flat;
+    the policy decides which movies get those polls.
+    """
+
+    def __init__(
+        self,
+        scraper,
+        policy: Optional[PollPolicy] = None,
+        polls_per_minute: float = 6.0,
+        on_change: Optional[Callable[[Movie, List[Tuple[Showtime, Optional[Showtime]]]], None]] = None,
+    ):
+        self.scraper = scraper
+        self.policy = policy or PollPolicy()
+        self.budget = TokenBucket(polls_per_minute / 60.0, capacity=1.0)
+        self.on_change = on_change
+        self.movies: Dict[str, Movie] = {}
+        self.next_poll: Dict[str, float] = {}
+        self.polls = 0
+
+    def _dates(self):
+        today = get_current_datetime().date()
+        return [today, today + timedelta(days=1)]
+
+    def _schedule(self, movie: Movie):
+        interval = self.policy.movie_interval(movie, get_current_datetime())
+        if interval is None:
+            # Nothing left to watch for this movie
+            self.next_poll.pop(movie.movie_id, None)
+            return
+        self.next_poll[movie.movie_id] = time.monotonic() + interval
+        logger.debug(f"Next poll for {movie.title} in {interval:.0f}s")
+
+    async def start(self):
+        """Initial scrape of today's and tomorrow's shows"""
+        movies = await self.scraper.scrape_weekend_movies(dates=self._dates())
+        for movie in movies:
+            self.movies[movie.movie_id] = movie
+            self._schedule(movie)
+        logger.info(f"Watching {len(self.next_poll)} movies with upcoming shows")
+
+    async def poll(self, movie: Movie):
+        """Re-scrape one movie and report seat changes"""
+        self.polls += 1
+        previous = {showtime_key(s): s for s in movie.showtimes}
+        showtimes = await self.scraper.refresh_showtimes(movie, self._dates())
+        if movie.scrape_status != STATUS_FAILED:
+            movie.showtimes = showtimes
+
+        changes = []
+        for showtime in movie.showtimes:
+            old = previous.get(showtime_key(showtime))
+            if old is None or old.available_seats != showtime.available_seats:
+                changes.append((showtime, old))
+        if changes and self.on_change:
+            self.on_change(movie, changes)
+        self._schedule(movie)
+
+    async def run(self, duration: Optional[float] = None):
+        """Poll until interrupted, the duration elapses or nothing is left to watch"""
+        await self.start()
+        stop_at = time.monotonic() + duration if duration else None
+
+        while self.next_poll:
+            now = time.monotonic()
+            if stop_at and now >= stop_at:
+                break
+
+            movie_id, due = min(self.next_poll.items(), key=lambda item: item[1])
+            wait = due - now
+            if stop_at:
+                wait = min(wait, stop_at - now)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            await self.budget.acquire()
+            await self.poll(self.movies[movie_id])
+
+        logger.info(f"Watch finished after {self.polls} polls")